@@ -0,0 +1,197 @@
+"""Offline latency timeline of a JSON-lines automation log.
+
+Reads log files written with ``logging.format: json`` (or ``--log-format
+json``) and turns the per-tick trace records of a ``--log-level TRACE`` run
+into a latency timeline: one row per tick with its start, duration and
+slowest request, plus latency percentiles per RPC. Rotated files can be
+passed together, e.g.
+``python analyze_log.py logs/automation.log.1 logs/automation.log --timeline timeline.csv``.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.logger import read_json_log
+from utils.metrics import LatencyHistogram
+
+TIMELINE_COLUMNS = (
+    "run_id",
+    "case_id",
+    "tick",
+    "start_s",
+    "latency_ms",
+    "requests",
+    "errors",
+    "slowest_rpc",
+    "slowest_ms",
+)
+
+
+def load_records(
+    paths: Sequence[Path], run_id: Optional[str] = None, case_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read the records of ``paths`` in time order, optionally of one run or case."""
+
+    records = [record for path in paths for record in read_json_log(path)]
+    records = [
+        record
+        for record in records
+        if (run_id is None or record.get("run_id") == run_id)
+        and (case_id is None or record.get("case_id") == case_id)
+    ]
+    records.sort(key=lambda record: record.get("ts", 0.0))
+    return records
+
+
+def tick_timeline(records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per tick trace record; ``start_s`` counts from the first tick of the run and case."""
+
+    rows = []
+    origins: Dict[tuple, float] = {}
+    for record in records:
+        trace = record.get("trace")
+        if not isinstance(trace, list) or "tick_start" not in record:
+            continue
+        key = (record.get("run_id"), record.get("case_id"))
+        origin = origins.setdefault(key, record["tick_start"])
+        spans = [span for span in trace if isinstance(span, list) and len(span) >= 3]
+        slowest = max(spans, key=lambda span: span[2] - span[1], default=None)
+        rows.append(
+            {
+                "run_id": record.get("run_id"),
+                "case_id": record.get("case_id"),
+                "tick": record.get("tick"),
+                "start_s": round(record["tick_start"] - origin, 6),
+                "latency_ms": record.get("latency_ms"),
+                "requests": len(spans),
+                "errors": sum(1 for span in spans if "error" in span[3:]),
+                "slowest_rpc": slowest[0] if slowest else None,
+                "slowest_ms": round(slowest[2] - slowest[1], 2) if slowest else None,
+                "trace": spans,
+            }
+        )
+    return rows
+
+
+def rpc_latencies(records: Sequence[Dict[str, Any]]) -> Dict[str, LatencyHistogram]:
+    """Latency histograms per RPC from the tick traces and the RPC completion records."""
+
+    histograms: Dict[str, LatencyHistogram] = {}
+
+    def observe(name: str, latency_ms: float) -> None:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram()
+        histogram.observe(latency_ms / 1000.0)
+
+    for record in records:
+        trace = record.get("trace")
+        if isinstance(trace, list):
+            for span in trace:
+                if isinstance(span, list) and len(span) >= 3 and "error" not in span[3:]:
+                    observe(str(span[0]), span[2] - span[1])
+        elif record.get("rpc") and record.get("latency_ms") is not None:
+            observe(str(record["rpc"]), float(record["latency_ms"]))
+    return histograms
+
+
+def write_timeline(rows: Sequence[Dict[str, Any]], path: Path) -> Path:
+    """Write the timeline rows as CSV."""
+
+    path = path.expanduser().resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=TIMELINE_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def summarize(rows: Sequence[Dict[str, Any]], histograms: Dict[str, LatencyHistogram], slowest: int) -> Dict[str, Any]:
+    """Tick latency percentiles, the ``slowest`` ticks and the per-RPC latencies."""
+
+    ticks = LatencyHistogram()
+    for row in rows:
+        if row["latency_ms"] is not None:
+            ticks.observe(row["latency_ms"] / 1000.0)
+    worst = sorted(
+        (row for row in rows if row["latency_ms"] is not None),
+        key=lambda row: row["latency_ms"],
+        reverse=True,
+    )[:slowest]
+    return {
+        "ticks": ticks.summary_ms(),
+        "slowest_ticks": [
+            {key: row[key] for key in ("case_id", "tick", "start_s", "latency_ms", "trace")}
+            for row in worst
+        ],
+        "rpc_ms": {name: histogram.summary_ms() for name, histogram in sorted(histograms.items())},
+    }
+
+
+def print_report(summary: Dict[str, Any]) -> None:
+    ticks = summary["ticks"]
+    if not ticks["count"]:
+        print("No tick traces found; run with --log-format json --log-level TRACE")
+    else:
+        print(
+            f"{ticks['count']} ticks: p50 {ticks['p50']} ms, p95 {ticks['p95']} ms, "
+            f"p99 {ticks['p99']} ms, max {ticks['max']} ms"
+        )
+    for row in summary["slowest_ticks"]:
+        case = f"{row['case_id']} " if row["case_id"] else ""
+        print(f"  {case}tick {row['tick']} at {row['start_s']:.3f}s: {row['latency_ms']} ms")
+        for span in row["trace"]:
+            flag = "  error" if "error" in span[3:] else ""
+            print(f"    {span[1]:9.2f} -> {span[2]:9.2f} ms  {span[0]}{flag}")
+    if summary["rpc_ms"]:
+        print("Latency per RPC (ms):")
+        width = max(len(name) for name in summary["rpc_ms"])
+        for name, latency in summary["rpc_ms"].items():
+            print(
+                f"  {name:<{width}}  n={latency['count']:<6} p50 {latency.get('p50', 0):>8}"
+                f"  p95 {latency.get('p95', 0):>8}  p99 {latency.get('p99', 0):>8}  max {latency.get('max', 0):>8}"
+            )
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(description="Build a latency timeline from JSON-lines automation logs")
+    parser.add_argument("logs", nargs="+", type=str, help="JSON-lines log files, oldest first")
+    parser.add_argument("--run-id", dest="run_id", type=str, help="Only analyse the records of this run")
+    parser.add_argument("--case-id", dest="case_id", type=str, help="Only analyse the records of this case")
+    parser.add_argument("--timeline", type=str, help="Write the per-tick timeline to this CSV file")
+    parser.add_argument("--slowest", type=int, default=5, help="Number of slowest ticks to list with their trace")
+    parser.add_argument("--json", dest="as_json", action="store_true", help="Print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the log analyzer."""
+
+    args = parse_arguments(argv)
+    paths = [Path(name) for name in args.logs]
+    missing = [str(path) for path in paths if not path.exists()]
+    if missing:
+        print(f"Log file not found: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    records = load_records(paths, args.run_id, args.case_id)
+    rows = tick_timeline(records)
+    summary = summarize(rows, rpc_latencies(records), max(args.slowest, 0))
+    if args.timeline:
+        print(f"Timeline of {len(rows)} ticks written to {write_timeline(rows, Path(args.timeline))}")
+    if args.as_json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_report(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
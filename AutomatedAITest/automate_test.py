@@ -2,30 +2,111 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import json
+import logging
 import math
 import os
+import re
 import signal
 import subprocess
 import sys
+import threading
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
-
-import grpc
-import pandas as pd
-
-from utils.logger import setup_logging, update_log_level
+from typing import Any, Callable, Dict, Iterable, List, NoReturn, Optional, Sequence, Tuple
+
+from utils.aggregation import SignalAggregator
+from utils.change_encoding import ENCODING_MODES, ChangeEncoder
+from utils.checkpoint import CHECKPOINT_FILE, SegmentedSink, load_checkpoint, monitored_seconds, segmented_sink
+from utils.channels import ChannelSettings, parse_channel_settings
+from utils.config_cache import ConfigCache
+from utils.lazy_import import lazy_import
+from utils.logger import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_QUEUE_SIZE,
+    LOG_FORMATS,
+    LOG_MODES,
+    TRACE,
+    log_context,
+    logging_statistics,
+    setup_logging,
+    shutdown_logging,
+    update_log_level,
+)
+from utils.metrics import QUANTILES, MetricsServer, RpcMetrics, payload_size
+from utils.readiness import (
+    DEFAULT_STARTUP_TIMEOUT_S,
+    ProcessExitedError,
+    ReadinessProbe,
+    StartupLatencyHistogram,
+)
+from utils.rpc_policy import (
+    CircuitBreaker,
+    CircuitBreakerSettings,
+    RpcPolicies,
+    RpcPolicy,
+    parse_circuit_breaker,
+    parse_rpc_policies,
+)
+from utils.scheduler import OVERRUN_POLICIES, SCHEDULE_MODES, TickScheduler
+from utils.signal_cache import SignalCache
+from utils.signal_codec import NO_VALUE, decode_signal_reply, decode_value_array
+from utils.stop_detection import (
+    DEFAULT_STOP_CHECK_INTERVAL_S,
+    STOP_DETECTION_MODES,
+    AsyncStopDetector,
+    EventSubscription,
+    StopDetector,
+)
+from utils.sinks import (
+    DEFAULT_BUFFER_ROWS,
+    DEFAULT_FLUSH_INTERVAL_S,
+    SIGNAL_COLUMN_TYPES,
+    SINK_DEPENDENCIES,
+    SINK_TYPES,
+    RowSink,
+    SignalSink,
+    create_sink,
+    missing_dependency,
+)
+from utils.trigger_capture import CAPTURE_COLUMN, Trigger, TriggerCapture, parse_trigger
 
 import testautomation_pb2 as ta_pb2
 import testautomation_pb2_grpc as ta_grpc
 
+# Loaded on first use so that --help, configuration errors and other early
+# exits do not pay for importing them.
+asyncio = lazy_import("asyncio")
+grpc = lazy_import("grpc")
+np = lazy_import("numpy")
+
 # Default timeout used for gRPC invocations unless overridden in the
 # configuration file or via CLI arguments.
 DEFAULT_TIMEOUT_MS = 10000
 
+# Start-up latency histogram written next to the log file unless
+# grpc.startup_stats_file is configured.
+STARTUP_STATS_FILENAME = "startup_latency.json"
+
+# Signal acquisition strategies: client-side polling via GetSignal or
+# server-side recording retrieved through the Evaluation service after stop.
+ACQUISITION_MODES = ("poll", "record")
+DEFAULT_RECORD_CHUNK_SAMPLES = 100000
+
+# Separator used by PROVEtech:TA for signal list arguments.
+SIGNAL_LIST_SEPARATOR = ";"
+
+# Name of the application object that exposes the Evaluation service.
+EVALUATION_OBJECT_NAME = "Evaluation"
+
+# grpc.Compression members for the grpc.channel.compression values.
+_COMPRESSION_NAMES = {"none": "NoCompression", "gzip": "Gzip", "deflate": "Deflate"}
+
+# Full method name of System.GetSignal, called with a raw reply decoder.
+GET_SIGNAL_METHOD = "/testautomation.System/GetSignal"
+
 
 class ConfigurationError(Exception):
     """Raised when the provided configuration is invalid."""
@@ -35,12 +116,19 @@ class ProcessLaunchError(Exception):
     """Raised when an external process such as PROVEtech:TA fails to launch."""
 
 
+class RecordingError(RuntimeError):
+    """Raised when PROVEtech:TA cannot provide a recorded measurement."""
+
+
 @dataclass
 class GrpcSettings:
     """Connection settings for the PROVEtech:TA gRPC endpoint."""
 
     host: str
     port: int
+    startup_timeout_s: float = DEFAULT_STARTUP_TIMEOUT_S
+    startup_stats_file: Optional[Path] = None
+    channel: ChannelSettings = field(default_factory=ChannelSettings)
 
     @property
     def endpoint(self) -> str:
@@ -72,6 +160,13 @@ class LoggingSettings:
 
     level: str
     file: Path
+    mode: str = "sync"
+    format: str = "text"
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    drop_level: str = "TRACE"
+    max_mb: float = 0.0
+    rotate_hours: float = 0.0
+    backup_count: int = DEFAULT_BACKUP_COUNT
 
 
 @dataclass
@@ -82,6 +177,88 @@ class TestSettings:
     ta_executable: Optional[Path]
     output_dir: Path
     log_signals: List[str] = field(default_factory=list)
+    acquisition: str = "poll"
+    recording_file: Optional[Path] = None
+    record_chunk_samples: int = DEFAULT_RECORD_CHUNK_SAMPLES
+    output_format: str = "csv"
+    buffer_rows: int = DEFAULT_BUFFER_ROWS
+    flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S
+    fsync: bool = True
+    validate_signals: bool = True
+    signal_cache: Optional[Path] = None
+
+    @property
+    def resolved_recording_file(self) -> Path:
+        """Measurement file written by PROVEtech:TA in ``record`` acquisition."""
+
+        path = self.recording_file or self.output_dir / "recording.mf4"
+        return path.expanduser().resolve()
+
+
+@dataclass
+class RpcSettings:
+    """Retry, deadline and hedging policies of the gRPC calls."""
+
+    policies: RpcPolicies = field(default_factory=RpcPolicies)
+    circuit_breaker: Optional[CircuitBreakerSettings] = None
+
+
+@dataclass
+class MetricsSettings:
+    """Export of the per-RPC metrics besides ``result_summary.json``."""
+
+    prometheus_file: Optional[Path] = None
+    listen_host: str = "127.0.0.1"
+    listen_port: Optional[int] = None
+
+
+@dataclass
+class CaptureSettings:
+    """Trigger capture of the ticks around detection events."""
+
+    triggers: List[Trigger] = field(default_factory=list)
+    pre_ticks: int = 50
+    post_ticks: int = 50
+    image: bool = False
+    image_dir: Optional[Path] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.triggers)
+
+
+@dataclass
+class AggregationSettings:
+    """Online down-sampling of the monitored signals."""
+
+    window_s: float = 0.0
+    raw: bool = True
+    quantiles: List[float] = field(default_factory=lambda: list(QUANTILES))
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_s > 0
+
+
+@dataclass
+class EncodingSettings:
+    """How the sampled rows are stored: every tick or only the changes."""
+
+    mode: str = "dense"
+    deadband: float = 0.0
+    deadbands: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class CheckpointSettings:
+    """Periodic checkpoints of the streamed signals for ``--resume``."""
+
+    interval_s: float = 0.0
+    keep_processes: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_s > 0
 
 
 @dataclass
@@ -93,12 +270,22 @@ class AutomationConfig:
     video: VideoSettings
     test: TestSettings
     logging: LoggingSettings
+    rpc: RpcSettings = field(default_factory=RpcSettings)
+    metrics: MetricsSettings = field(default_factory=MetricsSettings)
+    capture: CaptureSettings = field(default_factory=CaptureSettings)
+    aggregation: AggregationSettings = field(default_factory=AggregationSettings)
+    encoding: EncodingSettings = field(default_factory=EncodingSettings)
+    checkpoint: CheckpointSettings = field(default_factory=CheckpointSettings)
 
     @property
     def timeout_ms(self) -> int:
         return self.ai_core.timeout_ms or DEFAULT_TIMEOUT_MS
 
 
+# A list item of the form ``- key: value`` opens a mapping.
+_MAPPING_ITEM_PATTERN = re.compile(r"^[A-Za-z_][\w.-]*:(\s|$)")
+
+
 def _parse_scalar(value: str) -> Any:
     """Parse a scalar YAML value without requiring an external dependency."""
 
@@ -120,7 +307,11 @@ def _parse_scalar(value: str) -> Any:
 def _load_yaml(path: Path) -> Dict[str, Any]:
     """Minimal YAML parser supporting the subset required for config.yaml."""
 
-    lines = path.read_text(encoding="utf-8").splitlines()
+    return _parse_yaml(path.read_text(encoding="utf-8"))
+
+
+def _parse_yaml(text: str) -> Dict[str, Any]:
+    lines = text.splitlines()
     data: Dict[str, Any] = {}
     stack: List[tuple[int, Any]] = [(-1, data)]
 
@@ -141,8 +332,17 @@ def _load_yaml(path: Path) -> Dict[str, Any]:
                 raise ConfigurationError(
                     f"Invalid list placement at line {index}: {raw_line!r}"
                 )
-            container.append(_parse_scalar(stripped[2:]))
-            continue
+            item = stripped[2:].strip()
+            if not _MAPPING_ITEM_PATTERN.match(item):
+                container.append(_parse_scalar(item))
+                continue
+            # The item keys are aligned with the first key after the dash.
+            mapping: Dict[str, Any] = {}
+            container.append(mapping)
+            indent += 2
+            stack.append((indent - 1, mapping))
+            container = mapping
+            stripped = item
         if ":" not in stripped:
             raise ConfigurationError(f"Invalid configuration line: {raw_line!r}")
         key, value_part = stripped.split(":", 1)
@@ -179,12 +379,23 @@ def _load_yaml(path: Path) -> Dict[str, Any]:
     return data
 
 
-def load_configuration(config_path: Path) -> AutomationConfig:
-    """Load and validate the automation configuration from disk."""
+# Compiled configuration snapshots shared by the sessions and matrix cases of a process.
+_CONFIG_CACHE = ConfigCache(_parse_yaml)
+
+
+def load_configuration(config_path: Path, override: Optional[str] = None) -> AutomationConfig:
+    """Load and validate the automation configuration from disk.
+
+    ``override`` names an override set of the file's ``overrides`` section
+    that is merged onto the base configuration.
+    """
 
     if not config_path.exists():
         raise ConfigurationError(f"Configuration file not found: {config_path}")
-    raw = _load_yaml(config_path)
+    try:
+        raw = _CONFIG_CACHE.load(config_path).resolve(override)
+    except ValueError as exc:
+        raise ConfigurationError(f"{config_path}: {exc}") from exc
 
     try:
         grpc_cfg = raw["grpc"]
@@ -197,9 +408,18 @@ def load_configuration(config_path: Path) -> AutomationConfig:
             f"Missing configuration section: {exc.args[0]}"
         ) from exc
 
+    try:
+        channel_settings = parse_channel_settings(grpc_cfg.get("channel"))
+    except (TypeError, ValueError) as exc:
+        raise ConfigurationError(f"Invalid grpc.channel section: {exc}") from exc
     grpc_settings = GrpcSettings(
         host=str(grpc_cfg.get("host", "localhost")),
         port=int(grpc_cfg.get("port", 50051)),
+        startup_timeout_s=float(grpc_cfg.get("startup_timeout_s", DEFAULT_STARTUP_TIMEOUT_S)),
+        startup_stats_file=Path(str(grpc_cfg["startup_stats_file"]))
+        if grpc_cfg.get("startup_stats_file")
+        else None,
+        channel=channel_settings,
     )
 
     ai_core_settings = AiCoreSettings(
@@ -222,12 +442,133 @@ def load_configuration(config_path: Path) -> AutomationConfig:
         else None,
         output_dir=Path(str(test_cfg.get("output_dir", "./results"))),
         log_signals=[str(sig) for sig in test_cfg.get("log_signals", [])],
+        acquisition=str(test_cfg.get("acquisition", "poll")),
+        recording_file=Path(str(test_cfg["recording_file"]))
+        if test_cfg.get("recording_file")
+        else None,
+        record_chunk_samples=int(
+            test_cfg.get("record_chunk_samples", DEFAULT_RECORD_CHUNK_SAMPLES)
+        ),
+        output_format=str(test_cfg.get("output_format", "csv")),
+        buffer_rows=int(test_cfg.get("buffer_rows", DEFAULT_BUFFER_ROWS)),
+        flush_interval_s=float(test_cfg.get("flush_interval_s", DEFAULT_FLUSH_INTERVAL_S)),
+        fsync=bool(test_cfg.get("fsync", True)),
+        validate_signals=bool(test_cfg.get("validate_signals", True)),
+        signal_cache=Path(str(test_cfg["signal_cache"]))
+        if test_cfg.get("signal_cache")
+        else None,
     )
+    if test_settings.acquisition not in ACQUISITION_MODES:
+        raise ConfigurationError(
+            f"Invalid test.acquisition '{test_settings.acquisition}', "
+            f"expected one of {', '.join(ACQUISITION_MODES)}"
+        )
+    if test_settings.output_format not in SINK_TYPES:
+        raise ConfigurationError(
+            f"Invalid test.output_format '{test_settings.output_format}', "
+            f"expected one of {', '.join(SINK_TYPES)}"
+        )
 
     logging_settings = LoggingSettings(
         level=str(logging_cfg.get("level", "INFO")),
         file=Path(str(logging_cfg.get("file", "./logs/automation.log"))),
+        mode=str(logging_cfg.get("mode", "sync")),
+        format=str(logging_cfg.get("format", "text")),
+        queue_size=int(logging_cfg.get("queue_size", DEFAULT_QUEUE_SIZE)),
+        drop_level=str(logging_cfg.get("drop_level", "TRACE")).upper(),
+        max_mb=float(logging_cfg.get("max_mb", 0.0)),
+        rotate_hours=float(logging_cfg.get("rotate_hours", 0.0)),
+        backup_count=int(logging_cfg.get("backup_count", DEFAULT_BACKUP_COUNT)),
     )
+    if logging_settings.mode not in LOG_MODES:
+        raise ConfigurationError(
+            f"Invalid logging.mode '{logging_settings.mode}', expected one of {', '.join(LOG_MODES)}"
+        )
+    if logging_settings.format not in LOG_FORMATS:
+        raise ConfigurationError(
+            f"Invalid logging.format '{logging_settings.format}', expected one of {', '.join(LOG_FORMATS)}"
+        )
+    if logging_settings.drop_level not in ("TRACE", "DEBUG", "INFO"):
+        raise ConfigurationError(
+            f"Invalid logging.drop_level '{logging_settings.drop_level}', expected TRACE, DEBUG or INFO"
+        )
+    if logging_settings.queue_size < 1:
+        raise ConfigurationError("logging.queue_size must be at least 1")
+
+    try:
+        rpc_cfg = raw.get("rpc") or {}
+        rpc_settings = RpcSettings(
+            policies=parse_rpc_policies(rpc_cfg),
+            circuit_breaker=parse_circuit_breaker(rpc_cfg.get("circuit_breaker")),
+        )
+    except (TypeError, ValueError) as exc:
+        raise ConfigurationError(f"Invalid rpc section: {exc}") from exc
+
+    metrics_cfg = raw.get("metrics") or {}
+    metrics_settings = MetricsSettings(
+        prometheus_file=Path(str(metrics_cfg["prometheus_file"]))
+        if metrics_cfg.get("prometheus_file")
+        else None,
+        listen_host=str(metrics_cfg.get("listen_host", "127.0.0.1")),
+        listen_port=int(metrics_cfg["listen_port"]) if metrics_cfg.get("listen_port") else None,
+    )
+
+    capture_cfg = raw.get("capture") or {}
+    try:
+        capture_settings = CaptureSettings(
+            triggers=[parse_trigger(text) for text in capture_cfg.get("triggers") or []],
+            pre_ticks=int(capture_cfg.get("pre_ticks", 50)),
+            post_ticks=int(capture_cfg.get("post_ticks", 50)),
+            image=bool(capture_cfg.get("image", False)),
+            image_dir=Path(str(capture_cfg["image_dir"])) if capture_cfg.get("image_dir") else None,
+        )
+    except ValueError as exc:
+        raise ConfigurationError(f"Invalid capture section: {exc}") from exc
+    if capture_settings.pre_ticks < 0 or capture_settings.post_ticks < 0:
+        raise ConfigurationError("capture.pre_ticks and capture.post_ticks must not be negative")
+
+    aggregation_cfg = raw.get("aggregation") or {}
+    try:
+        aggregation_settings = AggregationSettings(
+            window_s=float(aggregation_cfg.get("window_s", 0.0)),
+            raw=bool(aggregation_cfg.get("raw", True)),
+            quantiles=[float(q) for q in aggregation_cfg.get("quantiles") or QUANTILES],
+        )
+    except (TypeError, ValueError) as exc:
+        raise ConfigurationError(f"Invalid aggregation section: {exc}") from exc
+    if aggregation_settings.window_s < 0:
+        raise ConfigurationError("aggregation.window_s must not be negative")
+    if not all(0.0 < q < 1.0 for q in aggregation_settings.quantiles):
+        raise ConfigurationError("aggregation.quantiles must lie between 0 and 1")
+
+    encoding_cfg = raw.get("encoding") or {}
+    try:
+        encoding_settings = EncodingSettings(
+            mode=str(encoding_cfg.get("mode", "dense")),
+            deadband=float(encoding_cfg.get("deadband", 0.0)),
+            deadbands={
+                str(name): float(value) for name, value in (encoding_cfg.get("deadbands") or {}).items()
+            },
+        )
+    except (TypeError, ValueError, AttributeError) as exc:
+        raise ConfigurationError(f"Invalid encoding section: {exc}") from exc
+    if encoding_settings.mode not in ENCODING_MODES:
+        raise ConfigurationError(
+            f"Invalid encoding.mode '{encoding_settings.mode}', expected one of {', '.join(ENCODING_MODES)}"
+        )
+    if encoding_settings.deadband < 0 or any(value < 0 for value in encoding_settings.deadbands.values()):
+        raise ConfigurationError("encoding deadbands must not be negative")
+
+    checkpoint_cfg = raw.get("checkpoint") or {}
+    try:
+        checkpoint_settings = CheckpointSettings(
+            interval_s=float(checkpoint_cfg.get("interval_s", 0.0)),
+            keep_processes=bool(checkpoint_cfg.get("keep_processes", True)),
+        )
+    except (TypeError, ValueError) as exc:
+        raise ConfigurationError(f"Invalid checkpoint section: {exc}") from exc
+    if checkpoint_settings.interval_s < 0:
+        raise ConfigurationError("checkpoint.interval_s must not be negative")
 
     return AutomationConfig(
         grpc=grpc_settings,
@@ -235,9 +576,89 @@ def load_configuration(config_path: Path) -> AutomationConfig:
         video=video_settings,
         test=test_settings,
         logging=logging_settings,
+        rpc=rpc_settings,
+        metrics=metrics_settings,
+        capture=capture_settings,
+        aggregation=aggregation_settings,
+        encoding=encoding_settings,
+        checkpoint=checkpoint_settings,
     )
 
 
+@dataclass
+class TestCase:
+    """One entry of a test case list shared by session and matrix runs."""
+
+    case_id: str
+    model: str
+    video_source: Optional[str] = None
+    video_driver: Optional[str] = None
+    resolution: Optional[str] = None
+    override: Optional[str] = None
+    args: List[str] = field(default_factory=list)
+
+    def arguments(self) -> List[str]:
+        """CLI arguments that apply this case on top of the base configuration."""
+
+        arguments = ["--model", self.model]
+        if self.video_source:
+            arguments += ["--video-source", self.video_source]
+        if self.video_driver:
+            arguments += ["--video-driver", self.video_driver]
+        if self.resolution:
+            arguments += ["--resolution", self.resolution]
+        if self.override:
+            arguments += ["--config-override", self.override]
+        return arguments + self.args
+
+
+def _string_list(value: Any, key: str) -> List[str]:
+    if value in (None, ""):
+        return []
+    if not isinstance(value, list):
+        raise ConfigurationError(f"'{key}' must be a list of CLI arguments")
+    return [str(item) for item in value]
+
+
+def parse_test_cases(entries: Any) -> List[TestCase]:
+    """Build test cases from the ``cases`` list of a session or matrix file.
+
+    Each entry needs a ``model`` and may set ``name``, ``video_source``,
+    ``video_driver``, ``resolution``, ``override`` (an override set of the
+    configuration file) and ``args`` (extra CLI arguments).
+    """
+
+    if not isinstance(entries, list) or not entries:
+        raise ConfigurationError("No test cases defined")
+    cases = []
+    for index, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict) or not entry.get("model"):
+            raise ConfigurationError(f"Test case {index} must define a model")
+        name = entry.get("name") or "_".join(
+            str(part)
+            for part in (entry["model"], entry.get("video_source"), entry.get("resolution"))
+            if part
+        )
+        cases.append(
+            TestCase(
+                case_id=f"{index:02d}_" + re.sub(r"[^\w.-]+", "-", str(name)).strip("-"),
+                model=str(entry["model"]),
+                video_source=str(entry["video_source"]) if entry.get("video_source") else None,
+                video_driver=str(entry["video_driver"]) if entry.get("video_driver") else None,
+                resolution=str(entry["resolution"]) if entry.get("resolution") else None,
+                override=str(entry["override"]) if entry.get("override") else None,
+                args=_string_list(entry.get("args"), f"cases[{index}].args"),
+            )
+        )
+    return cases
+
+
+def configuration_path(args: argparse.Namespace) -> Path:
+    """Configuration file selected by ``--config``, ``config.yaml`` by default."""
+
+    return Path(args.config) if args.config else Path(__file__).with_name("config.yaml")
+
+
 def apply_cli_overrides(config: AutomationConfig, args: argparse.Namespace) -> None:
     """Apply CLI overrides to the loaded configuration."""
 
@@ -267,13 +688,61 @@ def apply_cli_overrides(config: AutomationConfig, args: argparse.Namespace) -> N
         config.test.log_signals = list(args.log_signal)
     if args.log_level:
         config.logging.level = args.log_level
+    if args.log_file:
+        config.logging.file = Path(args.log_file)
+    if args.log_mode:
+        config.logging.mode = args.log_mode
+    if args.log_format:
+        config.logging.format = args.log_format
+    if args.acquisition:
+        config.test.acquisition = args.acquisition
+    if args.recording_file:
+        config.test.recording_file = Path(args.recording_file)
+    if args.output_format:
+        config.test.output_format = args.output_format
+    if args.signal_cache:
+        config.test.signal_cache = Path(args.signal_cache)
+    if args.skip_signal_validation:
+        config.test.validate_signals = False
+    if args.metrics_file:
+        config.metrics.prometheus_file = Path(args.metrics_file)
+    if args.metrics_port:
+        config.metrics.listen_port = args.metrics_port
+    if args.capture_trigger:
+        config.capture.triggers = list(args.capture_trigger)
+    if args.capture_image:
+        config.capture.image = True
+    if args.aggregate_window is not None:
+        config.aggregation.window_s = args.aggregate_window
+    if args.no_raw_signals:
+        config.aggregation.raw = False
+    if args.change_only:
+        config.encoding.mode = "changes"
+    if args.deadband is not None:
+        config.encoding.deadband = args.deadband
+    if args.checkpoint_interval is not None:
+        config.checkpoint.interval_s = args.checkpoint_interval
+
+
+def _trigger_argument(text: str) -> Trigger:
+    try:
+        return parse_trigger(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
 
+def parse_arguments(
+    argv: Optional[Sequence[str]] = None, namespace: Optional[argparse.Namespace] = None
+) -> argparse.Namespace:
+    """Parse CLI arguments.
 
-def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
-    """Parse CLI arguments."""
+    When ``namespace`` is given, the parsed arguments are layered on top of it
+    and its values take the place of the defaults.
+    """
 
     parser = argparse.ArgumentParser(description="Automated AI test runner")
     parser.add_argument("--config", type=str, help="Path to configuration YAML")
+    parser.add_argument("--config-override", dest="config_override", type=str, help="Apply this override set of the configuration file's overrides section")
     parser.add_argument("--grpc-host", dest="grpc_host", type=str, help="Override gRPC host")
     parser.add_argument("--grpc-port", dest="grpc_port", type=int, help="Override gRPC port")
     parser.add_argument("--model", type=str, help="Detection model name to load")
@@ -286,12 +755,39 @@ def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--output-dir", dest="output_dir", type=str, help="Directory for test results")
     parser.add_argument("--log-signal", dest="log_signal", action="append", help="Signals to monitor (can be used multiple times)")
     parser.add_argument("--log-level", dest="log_level", type=str, help="Override logging level")
+    parser.add_argument("--log-file", dest="log_file", type=str, help="Override the log file path")
+    parser.add_argument("--log-format", dest="log_format", choices=LOG_FORMATS, help="Write the log file as text or as JSON lines with run, case, tick, RPC and latency fields")
+    parser.add_argument("--run-id", dest="run_id", type=str, help="Run id stamped on the log records (random by default)")
+    parser.add_argument("--case-id", dest="case_id", type=str, help="Case id stamped on the log records")
+    parser.add_argument("--log-mode", dest="log_mode", choices=LOG_MODES, help="Write log records on the logging thread (sync) or through a bounded queue drained by a background thread (async)")
     parser.add_argument("--ta-executable", dest="ta_executable", type=str, help="Path to PROVEtech:TA executable")
     parser.add_argument("--skip-ta-launch", action="store_true", help="Do not launch PROVEtech:TA from the script")
     parser.add_argument("--monitor-seconds", dest="monitor_seconds", type=int, help="Maximum monitoring duration in seconds")
     parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=0.5, help="Signal polling interval in seconds")
+    parser.add_argument("--tick-timeout", dest="tick_timeout", type=float, help="Deadline in seconds for collecting all signal replies of one polling tick")
+    parser.add_argument("--output-format", dest="output_format", choices=tuple(SINK_TYPES), help="Format of the streamed signal data file")
+    parser.add_argument("--acquisition", choices=ACQUISITION_MODES, help="Sample signals by client polling (poll) or by server-side recording (record)")
+    parser.add_argument("--recording-file", dest="recording_file", type=str, help="Measurement file written by PROVEtech:TA in record acquisition")
+    parser.add_argument("--schedule", choices=SCHEDULE_MODES, default="interval", help="Polling schedule: sleep after each tick (interval) or drift-free absolute ticks (fixed-rate)")
+    parser.add_argument("--overrun-policy", dest="overrun_policy", choices=OVERRUN_POLICIES, default="skip", help="fixed-rate schedule: drop overrun ticks (skip) or run one catch-up tick (coalesce)")
+    parser.add_argument("--stop-detection", dest="stop_detection", choices=STOP_DETECTION_MODES, default="tick", help="Detect the end of the measurement with IsRunning in every tick (tick), on a separate schedule (poll) or on server events plus that schedule (event)")
+    parser.add_argument("--stop-check-interval", dest="stop_check_interval", type=float, default=DEFAULT_STOP_CHECK_INTERVAL_S, help="Seconds between IsRunning checks with --stop-detection poll/event")
+    parser.add_argument("--signal-cache", dest="signal_cache", type=str, help="JSON file caching validated signals per model and PROVEtech:TA version")
+    parser.add_argument("--skip-signal-validation", dest="skip_signal_validation", action="store_true", help="Do not validate the monitored signal names before the measurement")
+    parser.add_argument("--metrics-file", dest="metrics_file", type=str, help="Write the RPC metrics in the Prometheus text format to this file")
+    parser.add_argument("--metrics-port", dest="metrics_port", type=int, help="Serve the RPC metrics on http://<metrics.listen_host>:<port>/metrics")
+    parser.add_argument("--capture-trigger", dest="capture_trigger", action="append", type=_trigger_argument, help="Only keep the ticks around this trigger, e.g. 'IconDetection.Score > 0.8'; can be repeated")
+    parser.add_argument("--capture-image", dest="capture_image", action="store_true", help="Capture a video image through System.CaptureImage whenever a trigger fires")
+    parser.add_argument("--aggregate-window", dest="aggregate_window", type=float, help="Write min/max/mean/last and detection counts per window of this many seconds (0 disables)")
+    parser.add_argument("--no-raw-signals", dest="no_raw_signals", action="store_true", help="With --aggregate-window, keep only the aggregates instead of every sampled row")
+    parser.add_argument("--change-only", dest="change_only", action="store_true", help="Write a row only when a monitored signal changes (encoding.mode: changes)")
+    parser.add_argument("--deadband", type=float, help="With --change-only, ignore float changes up to this absolute amount")
+    parser.add_argument("--checkpoint-interval", dest="checkpoint_interval", type=float, help="Close a checkpointed segment of the signal data every this many seconds (0 disables)")
+    parser.add_argument("--resume", action="store_true", help="Continue the interrupted run checkpointed in the output directory, reattaching to its measurement when it still runs")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Drive the workflow with the asyncio (grpc.aio) controller")
     parser.add_argument("--no-ai-core-launch", dest="skip_ai_core", action="store_true", help="Skip launching AI-Core executable")
-    return parser.parse_args(argv)
+    parser.add_argument("--session", type=str, help="Run the test cases of this YAML file against one warm PROVEtech:TA/AI-Core session")
+    return parser.parse_args(argv, namespace=copy.copy(namespace))
 
 
 def _terminate_process(process: subprocess.Popen[bytes], logger) -> None:
@@ -316,8 +812,14 @@ def _terminate_process(process: subprocess.Popen[bytes], logger) -> None:
         process.kill()
 
 
-def start_process(executable: Path, arguments: Iterable[str], logger) -> subprocess.Popen[bytes]:
-    """Launch an external process and ensure it starts correctly."""
+def start_process(
+    executable: Path, arguments: Iterable[str], logger, new_session: bool = False
+) -> subprocess.Popen[bytes]:
+    """Launch an external process and ensure it starts correctly.
+
+    With ``new_session`` the process does not share the terminal's process
+    group, so that Ctrl+C on the runner does not reach it.
+    """
 
     if not executable.exists():
         raise ProcessLaunchError(f"Executable not found: {executable}")
@@ -327,7 +829,7 @@ def start_process(executable: Path, arguments: Iterable[str], logger) -> subproc
     if os.name == "nt":
         creationflags = subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore[attr-defined]
     try:
-        return subprocess.Popen(cmd, creationflags=creationflags)
+        return subprocess.Popen(cmd, creationflags=creationflags, start_new_session=new_session)
     except OSError as exc:
         raise ProcessLaunchError(f"Failed to launch {executable}: {exc}") from exc
 
@@ -339,33 +841,216 @@ class TestAutomationController:
         self.config = config
         self.logger = logger
         self.channel: Optional[grpc.Channel] = None
+        # Polling channels first, then the bulk channel when it is separate.
+        self.channels: List[Any] = []
         self.system_stub: Optional[ta_grpc.SystemStub] = None
         self.measure_stub: Optional[ta_grpc.MeasureStub] = None
-
-    def connect(self) -> None:
-        """Connect to the PROVEtech:TA gRPC endpoint."""
+        self.application_stub: Optional[ta_grpc.ApplicationStub] = None
+        self.evaluation_stub: Optional[ta_grpc.EvaluationStub] = None
+        self.msg_queue_stub: Optional[ta_grpc.MsgQueueStub] = None
+        # System RPCs with large or slow replies, such as CaptureImage.
+        self.bulk_system_stub: Optional[ta_grpc.SystemStub] = None
+        self.get_signal: Optional[Callable[..., Any]] = None
+        self._get_signal_pool: List[Callable[..., Any]] = []
+        self.sampling_statistics: Dict[str, Any] = {}
+        # Data file column type of each monitored signal, from its validation.
+        self.signal_column_types: Dict[str, str] = {}
+        self.rpc_policy_statistics: Dict[str, Any] = {}
+        self.metrics = RpcMetrics()
+        self.startup_statistics: Dict[str, Any] = {}
+        # Serialized requests of the configuration steps applied on the
+        # current connection, used to skip steps whose request is unchanged.
+        self._applied_steps: Dict[str, bytes] = {}
+        self.reused_steps: List[str] = []
+        self._clock_origin = (time.time_ns(), time.monotonic())
+        self._measurement_started_ns = time.time_ns()
+
+    def connect(
+        self,
+        process: Optional[subprocess.Popen[bytes]] = None,
+        started_at: Optional[float] = None,
+    ) -> None:
+        """Connect to the PROVEtech:TA gRPC endpoint.
+
+        When ``process`` is the freshly launched PROVEtech:TA (started at the
+        monotonic instant ``started_at``), the connection proceeds as soon as
+        a readiness probe succeeds instead of after a fixed start-up delay.
+        """
 
         endpoint = self.config.grpc.endpoint
         self.logger.info("Connecting to PROVEtech:TA gRPC endpoint at %s", endpoint)
-        options = [
-            ("grpc.keepalive_time_ms", 10000),
-            ("grpc.keepalive_timeout_ms", 5000),
-        ]
-        channel = grpc.insecure_channel(endpoint, options=options)
-        deadline = time.time() + max(self.config.timeout_ms / 1000.0, 5)
-        try:
-            grpc.channel_ready_future(channel).result(timeout=deadline - time.time())
-        except Exception as exc:  # pragma: no cover - network heavy
-            raise ConnectionError(f"Unable to connect to {endpoint}: {exc}") from exc
+        channels = self._open_channels(grpc.insecure_channel)
+        channel = channels[0]
+        self._create_stubs(channels)
+        if process is not None:
+            try:
+                statistics = self._readiness_probe(process, started_at).wait(self._probe_server)
+            except BaseException as exc:
+                for opened in channels:
+                    opened.close()
+                self._raise_startup_error(exc)
+            self._record_startup(statistics)
+        else:
+            deadline = time.time() + max(self.config.timeout_ms / 1000.0, 5)
+            try:
+                grpc.channel_ready_future(channel).result(timeout=deadline - time.time())
+            except Exception as exc:  # pragma: no cover - network heavy
+                for opened in channels:
+                    opened.close()
+                raise ConnectionError(f"Unable to connect to {endpoint}: {exc}") from exc
         self.channel = channel
+        self.channels = channels
+        self.logger.info("Successfully connected to %s", endpoint)
+
+    def _readiness_probe(
+        self, process: subprocess.Popen[bytes], started_at: Optional[float]
+    ) -> ReadinessProbe:
+        self.logger.info("Waiting for PROVEtech:TA to become ready")
+        return ReadinessProbe(
+            self.config.grpc.host,
+            self.config.grpc.port,
+            timeout_s=self.config.grpc.startup_timeout_s,
+            process=process,
+            started_at=started_at,
+        )
+
+    def _probe_server(self, timeout_s: float) -> None:
+        """Readiness RPC: any answer to ``System.GetVersion`` means ready."""
+
+        assert self.system_stub is not None
+        try:
+            self.system_stub.GetVersion(ta_pb2.SystemGetVersionRequest(), timeout=timeout_s)
+        except grpc.RpcError as exc:
+            self._check_probe_error(exc)
+
+    @staticmethod
+    def _check_probe_error(exc: grpc.RpcError) -> None:
+        # A server without GetVersion is up nonetheless.
+        if exc.code() != grpc.StatusCode.UNIMPLEMENTED:
+            raise ConnectionError(exc.details()) from exc
+
+    def _raise_startup_error(self, exc: BaseException) -> NoReturn:
+        if isinstance(exc, ProcessExitedError):
+            raise ProcessLaunchError(
+                f"PROVEtech:TA exited with code {exc.returncode} during start-up"
+            ) from exc
+        if isinstance(exc, TimeoutError):
+            raise ConnectionError(f"Unable to connect to {self.config.grpc.endpoint}: {exc}") from exc
+        raise exc
+
+    def _record_startup(self, statistics: Dict[str, Any]) -> None:
+        """Log the start-up latency and add it to the per-endpoint histogram."""
+
+        self.startup_statistics = statistics
+        self.logger.info(
+            "PROVEtech:TA ready after %.2fs (port open after %.2fs, %d probes)",
+            statistics["ready_s"],
+            statistics["port_open_s"],
+            statistics["attempts"],
+        )
+        stats_file = self.config.grpc.startup_stats_file or (
+            self.config.logging.file.parent / STARTUP_STATS_FILENAME
+        )
+        try:
+            StartupLatencyHistogram(stats_file).record(
+                self.config.grpc.endpoint, statistics["ready_s"]
+            )
+        except OSError as exc:
+            self.logger.warning("Unable to update start-up latency histogram %s: %s", stats_file, exc)
+
+    def _open_channels(self, factory: Callable[..., Any]) -> List[Any]:
+        """Open the polling channels and, if configured, the bulk channel.
+
+        Channels connect lazily, so unused ones cost no connection.
+        """
+
+        settings = self.config.grpc.channel
+        compression = getattr(grpc.Compression, _COMPRESSION_NAMES[settings.compression])
+        options = settings.channel_options()
+        return [
+            factory(self.config.grpc.endpoint, options=options, compression=compression)
+            for _ in range(settings.channel_count)
+        ]
+
+    def _create_stubs(self, channels: Sequence[Any]) -> None:
+        poll_channels = channels[: self.config.grpc.channel.poll_channels]
+        channel = poll_channels[0]
+        bulk_channel = channels[-1] if self.config.grpc.channel.bulk_channel else channel
         self.system_stub = ta_grpc.SystemStub(channel)
         self.measure_stub = ta_grpc.MeasureStub(channel)
-        self.logger.info("Successfully connected to %s", endpoint)
+        self.application_stub = ta_grpc.ApplicationStub(channel)
+        # Evaluation transfers whole recordings; keep them off the polling connection.
+        self.evaluation_stub = ta_grpc.EvaluationStub(bulk_channel)
+        self.bulk_system_stub = ta_grpc.SystemStub(bulk_channel)
+        self.msg_queue_stub = ta_grpc.MsgQueueStub(channel)
+        # GetSignal replies bypass the generated message class so that array
+        # values are decoded straight from the wire into NumPy arrays.
+        self._get_signal_pool = [
+            poll_channel.unary_unary(
+                GET_SIGNAL_METHOD,
+                request_serializer=ta_pb2.SystemGetSignalRequest.SerializeToString,
+                response_deserializer=self._deserialize_signal_reply,
+            )
+            for poll_channel in poll_channels
+        ]
+        self.get_signal = self._get_signal_pool[0]
+
+    def _deserialize_signal_reply(self, data: bytes) -> Any:
+        self.metrics.add_response_bytes("GetSignal", len(data))
+        return decode_signal_reply(data)
 
     def configure_video(self) -> None:
         """Configure the video device and link it to AI-Core."""
 
         assert self.system_stub is not None and self.measure_stub is not None
+        video_request = self._video_config_request()
+        set_video_request = self._set_video_audio_request()
+        if self._is_applied("video", video_request, set_video_request):
+            return
+        self._log_video_configuration()
+        self._call_rpc(
+            self.system_stub.ModifyVideoAudioConfig,
+            video_request,
+            "ModifyVideoAudioConfig",
+        )
+        self._call_rpc(
+            self.measure_stub.SetVideoAudio,
+            set_video_request,
+            "SetVideoAudio",
+        )
+        self._mark_applied("video", video_request, set_video_request)
+
+    def configure_ai_core(self) -> None:
+        """Configure the AI-Core executable and project file."""
+
+        assert self.system_stub is not None
+        request = self._model_node_config_request()
+        if self._is_applied("ai_core", request):
+            return
+        self._call_rpc(
+            self.system_stub.ModifyModelNodeConfig,
+            request,
+            "ModifyModelNodeConfig",
+        )
+        self._mark_applied("ai_core", request)
+
+    @staticmethod
+    def _step_key(requests) -> bytes:
+        return b"\0".join(request.SerializeToString(deterministic=True) for request in requests)
+
+    def _is_applied(self, step: str, *requests) -> bool:
+        """Return whether ``step`` already ran with identical requests."""
+
+        if self._applied_steps.get(step) != self._step_key(requests):
+            return False
+        self.logger.info("Configuration step '%s' unchanged, reusing current state", step)
+        self.reused_steps.append(step)
+        return True
+
+    def _mark_applied(self, step: str, *requests) -> None:
+        self._applied_steps[step] = self._step_key(requests)
+
+    def _log_video_configuration(self) -> None:
         video = self.config.video
         self.logger.info(
             "Configuring video source %s (%s) at resolution %s",
@@ -373,39 +1058,30 @@ class TestAutomationController:
             video.driver_id,
             video.resolution,
         )
+
+    def _video_config_request(self):
+        video = self.config.video
         config_payload = {
             "device_name": video.device_name,
             "driver_id": video.driver_id,
             "resolution": video.resolution,
             "share_with_model": self.config.test.model_name,
         }
-        request = ta_pb2.SystemModifyVideoAudioConfigRequest(
+        return ta_pb2.SystemModifyVideoAudioConfigRequest(
             strSourceName=video.device_name,
             strConfig=json.dumps(config_payload),
             strShareWithModelNode=self.config.test.model_name,
         )
-        self._call_rpc(
-            self.system_stub.ModifyVideoAudioConfig,
-            request,
-            "ModifyVideoAudioConfig",
-        )
 
-        measure_request = ta_pb2.MeasureSetVideoAudioRequest(
-            strName=video.device_name,
+    def _set_video_audio_request(self):
+        return ta_pb2.MeasureSetVideoAudioRequest(
+            strName=self.config.video.device_name,
             bActivate=True,
             bPauseVideoInitially=False,
             bPauseAudioInitially=False,
         )
-        self._call_rpc(
-            self.measure_stub.SetVideoAudio,
-            measure_request,
-            "SetVideoAudio",
-        )
-
-    def configure_ai_core(self) -> None:
-        """Configure the AI-Core executable and project file."""
 
-        assert self.system_stub is not None
+    def _model_node_config_request(self):
         ai_core = self.config.ai_core
         timeout_seconds = math.ceil(ai_core.timeout_ms / 1000.0)
         config_payload = {
@@ -413,60 +1089,309 @@ class TestAutomationController:
             "config_file": str(ai_core.config_file),
             "parallel_instances": ai_core.parallel_instances,
         }
-        request = ta_pb2.SystemModifyModelNodeConfigRequest(
+        return ta_pb2.SystemModifyModelNodeConfigRequest(
             strModelNodeName=self.config.test.model_name,
             strConfig=json.dumps(config_payload),
             lTimeoutInSeconds=timeout_seconds,
         )
-        self._call_rpc(
-            self.system_stub.ModifyModelNodeConfig,
-            request,
-            "ModifyModelNodeConfig",
-        )
 
     def load_model(self) -> None:
         """Load the requested detection model within PROVEtech:TA."""
 
         assert self.system_stub is not None
         model_name = self.config.test.model_name
-        self.logger.info("Loading detection model '%s'", model_name)
         request = ta_pb2.SystemLoadModelRequest(strModelName=model_name)
+        if self._is_applied("model", request):
+            return
+        self.logger.info("Loading detection model '%s'", model_name)
         self._call_rpc(self.system_stub.LoadModel, request, "LoadModel")
+        self._mark_applied("model", request)
 
-    def start_measurement(self) -> None:
-        """Start the measurement run to stream video and AI signals."""
+    def resolve_signals(self) -> None:
+        """Validate the monitored signals before the measurement starts.
+
+        All names of ``test.log_signals`` are checked with a single
+        ``System.GetValidSignalList`` call and replaced by the spelling
+        reported by PROVEtech:TA; unknown names raise ``ConfigurationError``.
+        With ``test.signal_cache`` the result is stored per model and TA
+        version together with the ``GetSignalInfo`` handle and value type of
+        each signal, and later runs with the same key skip the validation.
+        The value types fix the column types of a columnar data file; without
+        the cache they are read with one ``GetSignal`` per signal.
+        """
+
+        assert self.system_stub is not None
+        signals = self.config.test.log_signals
+        self.signal_column_types = {}
+        if not signals or not self.config.test.validate_signals:
+            return
+        cache = cache_key = None
+        if self.config.test.signal_cache is not None:
+            cache = SignalCache(self.config.test.signal_cache, self.logger)
+            version = self._call_rpc(
+                self.system_stub.GetVersion, ta_pb2.SystemGetVersionRequest(), "GetVersion"
+            )
+            cache_key = SignalCache.key(self.config.test.model_name, self._ta_version(version))
+            cached = cache.lookup(cache_key, signals)
+            if cached is not None:
+                self.logger.info("Using cached validation of %d signals for %s", len(signals), cache_key)
+                self._apply_resolved_signals({name: entry["name"] for name, entry in cached.items()})
+                self._apply_signal_types({entry["name"]: entry["type"] for entry in cached.values()})
+                return
+
+        reply = self._call_rpc(
+            self.system_stub.GetValidSignalList,
+            self._valid_signal_list_request(signals),
+            "GetValidSignalList",
+        )
+        resolved = self._match_valid_signals(signals, reply.RetVal)
+        types: Dict[str, Optional[str]] = {}
+        if cache is not None:
+            entries = {configured: self._signal_metadata(name) for configured, name in resolved.items()}
+            cache.store(cache_key, entries)
+            types = {entry["name"]: entry["type"] for entry in entries.values()}
+        elif self._typed_output():
+            types = {name: self._signal_type(name) for name in resolved.values()}
+        self._apply_resolved_signals(resolved)
+        self._apply_signal_types(types)
+
+    def _signal_metadata(self, signal_name: str) -> Dict[str, Any]:
+        assert self.system_stub is not None
+        info = self._call_rpc(
+            self.system_stub.GetSignalInfo,
+            ta_pb2.SystemGetSignalInfoRequest(strSignalName=signal_name),
+            f"GetSignalInfo[{signal_name}]",
+        )
+        value = self._call_rpc(
+            self.system_stub.GetSignal,
+            ta_pb2.SystemGetSignalRequest(strSignalName=signal_name, bInterpreted=True),
+            f"GetSignal[{signal_name}]",
+        )
+        return self._signal_cache_entry(signal_name, info, value)
+
+    def _signal_type(self, signal_name: str) -> Optional[str]:
+        assert self.system_stub is not None
+        value = self._call_rpc(
+            self.system_stub.GetSignal,
+            ta_pb2.SystemGetSignalRequest(strSignalName=signal_name, bInterpreted=True),
+            f"GetSignal[{signal_name}]",
+        )
+        return self._value_type(value)
+
+    def _typed_output(self) -> bool:
+        """Whether the data file has typed columns, which need the signal value types."""
+
+        return bool(SINK_TYPES[self.config.test.output_format].typed_columns)
+
+    @staticmethod
+    def _ta_version(reply) -> str:
+        return reply.RetVal or f"{reply.plMajor}.{reply.plMinor}"
+
+    @staticmethod
+    def _valid_signal_list_request(signals: Sequence[str]):
+        return ta_pb2.SystemGetValidSignalListRequest(
+            strSignalList=SIGNAL_LIST_SEPARATOR.join(signals)
+        )
+
+    @staticmethod
+    def _match_valid_signals(signals: Sequence[str], valid_list: str) -> Dict[str, str]:
+        """Map configured names to the valid names returned by PROVEtech:TA."""
+
+        valid = {
+            name.strip().casefold(): name.strip()
+            for name in valid_list.split(SIGNAL_LIST_SEPARATOR)
+            if name.strip()
+        }
+        unknown = [name for name in signals if name.casefold() not in valid]
+        if unknown:
+            raise ConfigurationError(f"Unknown signals in test.log_signals: {', '.join(unknown)}")
+        return {name: valid[name.casefold()] for name in signals}
+
+    @staticmethod
+    def _value_type(value) -> Optional[str]:
+        """Populated ``SystemGetSignalReply.RetVal`` member, e.g. ``double``."""
+
+        which = value.WhichOneof("RetVal")
+        return which.replace("RetVal_", "", 1) if which else None
+
+    @classmethod
+    def _signal_cache_entry(cls, signal_name: str, info, value) -> Dict[str, Any]:
+        return {"name": signal_name, "handle": info.RetVal, "type": cls._value_type(value)}
+
+    def _apply_resolved_signals(self, resolved: Dict[str, str]) -> None:
+        for configured, name in resolved.items():
+            if configured != name:
+                self.logger.info("Signal '%s' resolved to '%s'", configured, name)
+        self.config.test.log_signals = [resolved[name] for name in self.config.test.log_signals]
+        self.logger.info("Validated %d monitored signals", len(resolved))
+
+    def _apply_signal_types(self, types: Dict[str, Optional[str]]) -> None:
+        # A signal without a value yet has no type; its column is typed by its first sample.
+        self.signal_column_types = {
+            name: SIGNAL_COLUMN_TYPES[kind] for name, kind in types.items() if kind in SIGNAL_COLUMN_TYPES
+        }
+
+    def start_measurement(self, record: bool = False) -> None:
+        """Start the measurement run to stream video and AI signals.
+
+        With ``record`` the monitored signals are registered through
+        ``Measure.SetSignals`` and PROVEtech:TA records them to disk at its
+        native sample rate instead of being polled by the client.
+        """
 
         assert self.measure_stub is not None
+        if record:
+            signals = self.config.test.log_signals
+            self.logger.info("Registering %d signals for server-side recording", len(signals))
+            self._call_rpc(
+                self.measure_stub.SetSignals,
+                ta_pb2.MeasureSetSignalsRequest(
+                    strSignalList=SIGNAL_LIST_SEPARATOR.join(signals)
+                ),
+                "MeasureSetSignals",
+            )
         self.logger.info("Starting measurement run")
-        request = ta_pb2.MeasureStartRequest(bSaveToDisk=False)
+        request = ta_pb2.MeasureStartRequest(bSaveToDisk=record)
+        self._measurement_started_ns = time.time_ns()
         self._call_rpc(self.measure_stub.Start, request, "MeasureStart")
 
-    def wait_for_completion(self, max_duration: Optional[int], poll_interval: float) -> List[Dict[str, Any]]:
-        """Monitor configured signals until the measurement stops."""
+    def wait_for_completion(
+        self,
+        sink: RowSink,
+        max_duration: Optional[int],
+        poll_interval: float,
+        tick_timeout: Optional[float] = None,
+        schedule: str = "interval",
+        overrun_policy: str = "skip",
+        stop_detection: str = "tick",
+        stop_check_interval: float = DEFAULT_STOP_CHECK_INTERVAL_S,
+    ) -> None:
+        """Monitor configured signals until the measurement stops.
+
+        Each sampled row is handed to ``sink`` as soon as it is taken, so
+        memory use does not grow with the run length. Every poll tick sends the
+        ``GetSignal`` requests for all monitored signals together with the
+        ``IsRunning`` probe as concurrent futures on the shared channel, so a
+        tick costs a single round-trip instead of one per signal.
+        ``tick_timeout`` bounds how long a tick may wait for its replies and
+        defaults to the regular RPC timeout. ``schedule`` and
+        ``overrun_policy`` configure the :class:`TickScheduler`, whose
+        statistics are left in :attr:`sampling_statistics`.
+
+        With ``stop_detection`` other than ``tick``, the ticks only read the
+        signals and a :class:`StopDetector` checks ``IsRunning`` every
+        ``stop_check_interval`` seconds (and on server events in ``event``
+        mode); a detected stop interrupts the sleep for one final tick.
+        """
 
         assert self.measure_stub is not None and self.system_stub is not None
-        signals = self.config.test.log_signals
-        self.logger.info("Monitoring %d signals from AI-Core", len(signals))
-        collected: List[Dict[str, Any]] = []
-        start_time = time.time()
+        monitoring = _Monitoring(
+            self,
+            sink,
+            max_duration,
+            poll_interval,
+            tick_timeout,
+            schedule,
+            overrun_policy,
+            self._stop_detector(stop_detection, stop_check_interval),
+        )
+        detector = monitoring.detector
+        try:
+            while True:
+                monitoring.start_tick()
+                try:
+                    monitoring.raise_detector_error()
+                    row, running = self._sample_tick(
+                        monitoring.requests, monitoring.timeout_s, probe_running=detector is None
+                    )
+                except (ConnectionError, TimeoutError) as exc:
+                    monitoring.tick_failed(exc)
+                else:
+                    if monitoring.tick_sampled(row, running):
+                        break
+                delay = monitoring.next_delay()
+                if delay is None:
+                    break
+                if detector is None:
+                    time.sleep(delay)
+                else:
+                    detector.wait(delay)
+        finally:
+            if detector is not None:
+                detector.close()
+            monitoring.finish()
+
+    def wait_for_recording(
+        self,
+        max_duration: Optional[int],
+        poll_interval: float,
+        schedule: str = "interval",
+        overrun_policy: str = "skip",
+    ) -> None:
+        """Wait for a recorded measurement to finish.
+
+        Only ``IsRunning`` is polled while PROVEtech:TA records the signals;
+        the samples are retrieved afterwards by :meth:`fetch_recording`.
+        """
 
-        while True:
-            timestamp = datetime.now(timezone.utc).isoformat()
-            row: Dict[str, Any] = {"timestamp": timestamp}
-            for signal_name in signals:
-                value = self._read_signal(signal_name)
-                row[signal_name] = value
-            collected.append(row)
-
-            running = self._is_measurement_running()
-            if not running:
-                self.logger.info("Measurement reported as finished")
-                break
-            if max_duration and (time.time() - start_time) >= max_duration:
-                self.logger.warning("Maximum monitoring duration reached (%ss)", max_duration)
-                break
-            time.sleep(poll_interval)
-        return collected
+        assert self.measure_stub is not None
+        self.logger.info("Waiting for server-side recording to finish")
+        scheduler = self._start_scheduler(poll_interval, schedule, overrun_policy)
+        breaker = self._circuit_breaker()
+        try:
+            while True:
+                scheduler.tick_started()
+                pause_s = 0.0
+                try:
+                    running = self._is_measurement_running()
+                except (ConnectionError, TimeoutError) as exc:
+                    if breaker is None or not breaker.record_failure():
+                        raise
+                    pause_s = self._tick_failed(breaker, exc)
+                else:
+                    self._tick_succeeded(breaker)
+                    if not running:
+                        self.logger.info("Measurement reported as finished")
+                        break
+                if max_duration and scheduler.elapsed() >= max_duration:
+                    self.logger.warning("Maximum monitoring duration reached (%ss)", max_duration)
+                    break
+                time.sleep(max(scheduler.next_delay(), pause_s))
+        finally:
+            self.sampling_statistics = scheduler.statistics()
+            self._store_breaker_statistics(breaker)
+
+    def capture_image(self, event: Dict[str, Any]) -> str:
+        """Capture the video source with ``System.CaptureImage`` for a trigger event.
+
+        The request is sent on the bulk channel without waiting for the reply,
+        so the tick is not delayed; failures are logged. Returns the image
+        path passed to PROVEtech:TA.
+        """
+
+        assert self.bulk_system_stub is not None
+        request = self._capture_image_request(event)
+        call = self.bulk_system_stub.CaptureImage.future(request, timeout=self._rpc_timeout_s())
+        call.add_done_callback(lambda done: self._image_captured(done, request.strDestinationPath))
+        return request.strDestinationPath
+
+    def _capture_image_request(self, event: Dict[str, Any]):
+        directory = self.config.capture.image_dir or self.config.test.output_dir / "captures"
+        directory = directory.expanduser().resolve()
+        directory.mkdir(parents=True, exist_ok=True)
+        return ta_pb2.SystemCaptureImageRequest(
+            strSourceName=self.config.video.device_name,
+            strDestinationPath=str(directory / f"capture_{event['window']:04d}_tick{event['tick']}.png"),
+        )
+
+    def _image_captured(self, call, path: str) -> None:
+        try:
+            captured = call.result().RetVal
+        except grpc.RpcError as exc:
+            self.logger.warning("CaptureImage failed for %s: %s", path, exc.details())
+            return
+        if not captured:
+            self.logger.warning("PROVEtech:TA did not capture image %s", path)
 
     def stop_measurement(self) -> None:
         """Stop the measurement if it is still running."""
@@ -476,6 +1401,178 @@ class TestAutomationController:
         request = ta_pb2.MeasureStopRequest()
         self._call_rpc(self.measure_stub.Stop, request, "MeasureStop")
 
+    def measurement_running(self) -> bool:
+        """Whether a measurement is running, e.g. one left behind by an interrupted run."""
+
+        return self._is_measurement_running()
+
+    def fetch_recording(self, open_sink: Callable[[], RowSink]) -> None:
+        """Save the recorded measurement and read it back in bulk.
+
+        The measurement is written to :attr:`TestSettings.resolved_recording_file`
+        and opened through the Evaluation service. Every signal keeps its own
+        start time and sampling rate: its samples are placed on the integer
+        sample grid of the fastest signal, which starts at the earliest start
+        time. The grid is read in windows of ``record_chunk_samples`` samples;
+        each window is fetched for all signals with ``GetSignalArray`` and
+        written to the sink before the next one, so memory use does not grow
+        with the recording length. ``open_sink`` is only called once the
+        recording has been opened and every signal was found in it, so an
+        unusable recording leaves no empty result file behind.
+        """
+
+        assert self.measure_stub is not None
+        assert self.application_stub is not None and self.evaluation_stub is not None
+        test = self.config.test
+        recording_file = str(test.resolved_recording_file)
+        self.logger.info("Saving recorded measurement to %s", recording_file)
+        self._call_rpc(
+            self.measure_stub.SaveFile,
+            ta_pb2.MeasureSaveFileRequest(strFileName=recording_file),
+            "MeasureSaveFile",
+        )
+
+        object_id = self._call_rpc(
+            self.application_stub.GetObject,
+            ta_pb2.ApplicationGetObjectRequest(strName=EVALUATION_OBJECT_NAME),
+            "ApplicationGetObject",
+        ).RetVal
+        try:
+            opened = self._call_rpc(
+                self.evaluation_stub.Open,
+                ta_pb2.EvaluationOpenRequest(ObjectId=object_id, strFileName=recording_file),
+                "EvaluationOpen",
+            )
+            if not opened.RetVal:
+                raise RecordingError(f"PROVEtech:TA could not open recording {recording_file}")
+            layouts = [self._recorded_signal(object_id, name) for name in test.log_signals]
+            rows = self._stream_recording(object_id, layouts, open_sink())
+            self._call_rpc(
+                self.evaluation_stub.Close,
+                ta_pb2.EvaluationCloseRequest(ObjectId=object_id),
+                "EvaluationClose",
+            )
+        finally:
+            self._call_rpc(
+                self.application_stub.ReleaseObject,
+                ta_pb2.ApplicationReleaseObjectRequest(ObjectId=object_id),
+                "ApplicationReleaseObject",
+            )
+        self.logger.info("Retrieved %d recorded samples", rows)
+
+    def _recorded_signal(self, object_id: int, signal_name: str) -> Tuple[str, int, float, float]:
+        """Name, sample count, sampling rate and start time of a recorded signal."""
+
+        assert self.evaluation_stub is not None
+        evaluation = self.evaluation_stub
+        sample_count = self._call_rpc(
+            evaluation.GetSampleCount,
+            ta_pb2.EvaluationGetSampleCountRequest(
+                ObjectId=object_id, vSignalOrGroup_string=signal_name
+            ),
+            f"EvaluationGetSampleCount[{signal_name}]",
+        ).RetVal
+        sampling_rate = self._call_rpc(
+            evaluation.GetSamplingRate,
+            ta_pb2.EvaluationGetSamplingRateRequest(
+                ObjectId=object_id, vSignalOrGroup_string=signal_name
+            ),
+            f"EvaluationGetSamplingRate[{signal_name}]",
+        ).RetVal
+        start_time = self._call_rpc(
+            evaluation.GetStartTime,
+            ta_pb2.EvaluationGetStartTimeRequest(
+                ObjectId=object_id, vSignalOrGroup_string=signal_name
+            ),
+            f"EvaluationGetStartTime[{signal_name}]",
+        ).RetVal
+        if sampling_rate <= 0:
+            raise RecordingError(f"Recorded signal {signal_name} reports no sampling rate")
+        self.logger.debug(
+            "Recorded %d samples of %s at %.3f Hz from %.6fs", sample_count, signal_name, sampling_rate, start_time
+        )
+        return signal_name, int(sample_count), float(sampling_rate), float(start_time)
+
+    def _stream_recording(
+        self, object_id: int, layouts: Sequence[Tuple[str, int, float, float]], sink: RowSink
+    ) -> int:
+        """Write the recorded samples to ``sink`` window by window; return the number of rows."""
+
+        layouts = [layout for layout in layouts if layout[1] > 0]
+        if not layouts:
+            return 0
+        grid_rate = max(rate for _, _, rate, _ in layouts)
+        origin = min(start for _, _, _, start in layouts)
+        # Grid index of sample k: round(offset + k * step), step >= 1 keeps the indices distinct.
+        grids = [
+            (name, count, (start - origin) * grid_rate, grid_rate / rate) for name, count, rate, start in layouts
+        ]
+
+        def first_sample(count: int, offset: float, step: float, grid_index: int) -> int:
+            """Smallest sample placed at or after ``grid_index``."""
+
+            sample = min(max(math.ceil((grid_index - 0.5 - offset) / step), 0), count)
+            while sample > 0 and round(offset + (sample - 1) * step) >= grid_index:
+                sample -= 1
+            while sample < count and round(offset + sample * step) < grid_index:
+                sample += 1
+            return sample
+
+        grid_end = max(round(offset + (count - 1) * step) for _, count, offset, step in grids) + 1
+        window = max(int(self.config.test.record_chunk_samples), 1)
+        written = 0
+        for window_start in range(0, grid_end, window):
+            columns = []
+            for name, count, offset, step in grids:
+                first = first_sample(count, offset, step, window_start)
+                last = first_sample(count, offset, step, window_start + window)
+                if last <= first:
+                    continue
+                values = self._fetch_recorded_samples(object_id, name, first, last)
+                indices = np.rint(offset + np.arange(first, first + len(values)) * step).astype(np.int64)
+                columns.append((name, indices, values))
+            if not columns:
+                continue
+            grid = np.unique(np.concatenate([indices for _, indices, _ in columns]))
+            timestamps = self._measurement_started_ns + np.rint((origin + grid / grid_rate) * 1e9).astype(np.int64)
+            rows: List[Dict[str, Any]] = [{"timestamp": timestamp} for timestamp in timestamps.tolist()]
+            for name, indices, values in columns:
+                for position, value in zip(np.searchsorted(grid, indices).tolist(), values.tolist()):
+                    rows[position][name] = value
+            for row in rows:
+                sink.write(row)
+            written += len(rows)
+        return written
+
+    def _fetch_recorded_samples(self, object_id: int, signal_name: str, first: int, last: int) -> np.ndarray:
+        """Samples ``first`` to ``last`` (exclusive) of a recorded signal as one array."""
+
+        assert self.evaluation_stub is not None
+        chunks = []
+        start_sample = first
+        while start_sample < last:
+            reply = self._call_rpc(
+                self.evaluation_stub.GetSignalArray,
+                ta_pb2.EvaluationGetSignalArrayRequest(
+                    ObjectId=object_id,
+                    strSignalList=signal_name,
+                    lStartSample=start_sample,
+                    lSampleCount=last - start_sample,
+                ),
+                f"EvaluationGetSignalArray[{signal_name}]",
+            )
+            values = decode_value_array(reply.paValues[0].SerializeToString()) if reply.paValues else None
+            if values is None or not len(values):
+                self.logger.warning(
+                    "Recorded signal %s ended at sample %d instead of %d", signal_name, start_sample, last
+                )
+                break
+            chunks.append(values)
+            start_sample += len(values)
+        if not chunks:
+            return np.empty(0)
+        return chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+
     def fetch_test_result(self) -> Dict[str, Any]:
         """Retrieve the overall test result from PROVEtech:TA."""
 
@@ -486,6 +1583,10 @@ class TestAutomationController:
             request,
             "GetResult",
         )
+        return self._test_result_from_reply(response)
+
+    @staticmethod
+    def _test_result_from_reply(response) -> Dict[str, Any]:
         result_value = getattr(response, "RetVal", None)
         additional = getattr(response, "piAdditionalResultValue", None)
         add_to_protocol = getattr(response, "pbAddResultToProtocol", None)
@@ -505,59 +1606,1387 @@ class TestAutomationController:
         )
         return bool(getattr(response, "RetVal", False))
 
+    def _stop_detector(self, mode: str, interval_s: float) -> Optional[StopDetector]:
+        """Start the stop detector of ``mode``; ``None`` keeps ``IsRunning`` in every tick."""
+
+        if mode == "tick":
+            return None
+        self.logger.info("Checking the measurement state every %.1fs (%s)", interval_s, mode)
+        return StopDetector(
+            self._is_measurement_running,
+            interval_s,
+            self._measurement_events if mode == "event" else None,
+            self.logger,
+        ).start()
+
+    def _measurement_events(self) -> EventSubscription:
+        """Subscribe to ``MsgQueue.EventMessage``, acknowledging every event."""
+
+        assert self.msg_queue_stub is not None
+        return EventSubscription(
+            self.msg_queue_stub.EventMessage, ta_pb2.MsgQueueEventMessageResult()
+        )
+
+    def _start_scheduler(
+        self, poll_interval: float, schedule: str, overrun_policy: str
+    ) -> TickScheduler:
+        scheduler = TickScheduler(poll_interval, mode=schedule, overrun_policy=overrun_policy)
+        self._clock_origin = (time.time_ns(), scheduler.start())
+        return scheduler
+
+    def _timestamp(self, monotonic_time: float) -> int:
+        """Convert a monotonic instant into UTC epoch nanoseconds.
+
+        The wall clock is read once per run so that timestamp spacing follows
+        the monotonic clock and is immune to system clock adjustments.
+        """
+
+        wall_origin_ns, monotonic_origin = self._clock_origin
+        return wall_origin_ns + round((monotonic_time - monotonic_origin) * 1e9)
+
+    @staticmethod
+    def _signal_requests(signals: Sequence[str]) -> List[tuple[str, Any]]:
+        return [
+            (
+                signal_name,
+                ta_pb2.SystemGetSignalRequest(strSignalName=signal_name, bInterpreted=True),
+            )
+            for signal_name in signals
+        ]
+
+    def _sample_tick(
+        self,
+        requests: Sequence[tuple[str, Any]],
+        timeout_s: float,
+        probe_running: bool = True,
+    ) -> tuple[Dict[str, Any], bool]:
+        """Sample all signals and the run state of one tick concurrently.
+
+        The row timestamp is the midpoint between dispatch and the last reply,
+        which is the best estimate of when PROVEtech:TA served the values.
+        Without ``probe_running`` no ``IsRunning`` request is sent and the
+        run is reported as still running.
+        """
+
+        assert self.measure_stub is not None and self.get_signal is not None
+        sent_at = time.monotonic()
+        get_signal_policy = self._rpc_policy("GetSignal")
+        pool = self._get_signal_pool
+        spans: Optional[List[tuple]] = [] if self.logger.isEnabledFor(TRACE) else None
+        pending = [
+            (
+                signal_name,
+                self._sender(
+                    pool[index % len(pool)],
+                    request,
+                    timeout_s,
+                    "GetSignal",
+                    spans,
+                    f"GetSignal[{signal_name}]",
+                ),
+            )
+            for index, (signal_name, request) in enumerate(requests)
+        ]
+        if probe_running:
+            pending.append(
+                (
+                    "MeasureIsRunning",
+                    self._sender(
+                        self.measure_stub.IsRunning,
+                        ta_pb2.MeasureIsRunningRequest(),
+                        timeout_s,
+                        "MeasureIsRunning",
+                        spans,
+                    ),
+                )
+            )
+        futures = [send() for _, send in pending]
+        dispatched_at = time.monotonic()
+        self.metrics.phase("dispatch", dispatched_at - sent_at)
+        tick_deadline = dispatched_at + timeout_s
+        try:
+            values = [
+                (
+                    signal_name,
+                    self._decode_signal_reply(
+                        signal_name,
+                        self._resolve_call(
+                            send,
+                            f"GetSignal[{signal_name}]",
+                            get_signal_policy,
+                            timeout_s,
+                            tick_deadline,
+                            future,
+                        ),
+                    ),
+                )
+                for (signal_name, send), future in zip(pending[: len(requests)], futures)
+            ]
+            running = True
+            if probe_running:
+                running_reply = self._resolve_call(
+                    pending[-1][1],
+                    "MeasureIsRunning",
+                    self._rpc_policy("MeasureIsRunning"),
+                    timeout_s,
+                    tick_deadline,
+                    futures[-1],
+                )
+                running = bool(getattr(running_reply, "RetVal", False))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        received_at = time.monotonic()
+        self.metrics.phase("wait", received_at - dispatched_at)
+        if spans is not None:
+            self._log_tick_trace(sent_at, received_at, spans)
+
+        row: Dict[str, Any] = {"timestamp": self._timestamp((sent_at + received_at) / 2.0)}
+        row.update(values)
+        return row, running
+
+    def _log_tick_trace(self, started: float, finished: float, spans: Sequence[tuple]) -> None:
+        """Log, at TRACE level, when each request of a tick started and finished.
+
+        ``spans`` holds ``(rpc, started, finished, ok)`` tuples of monotonic
+        times; the record lists them in milliseconds after ``started`` as
+        ``[rpc, start_ms, end_ms]``, with a trailing ``"error"`` for failed
+        attempts.
+        """
+
+        trace = [
+            [name, round((begin - started) * 1000.0, 2), round((end - started) * 1000.0, 2)]
+            + ([] if ok else ["error"])
+            for name, begin, end, ok in sorted(spans, key=lambda span: span[1])
+        ]
+        latency_ms = round((finished - started) * 1000.0, 2)
+        self.logger.log(
+            TRACE,
+            "Tick trace: %d requests in %.2fms",
+            len(trace),
+            latency_ms,
+            extra={
+                "latency_ms": latency_ms,
+                "tick_start": round(time.time() - (time.monotonic() - started), 6),
+                "trace": trace,
+            },
+        )
+
     def _read_signal(self, signal_name: str) -> Any:
-        assert self.system_stub is not None
+        assert self.get_signal is not None
         request = ta_pb2.SystemGetSignalRequest(
             strSignalName=signal_name,
             bInterpreted=True,
         )
-        response = self._call_rpc(
+        value = self._call_rpc(self.get_signal, request, f"GetSignal[{signal_name}]")
+        return self._decode_signal_reply(signal_name, value)
+
+    @staticmethod
+    def _decode_signal_reply(signal_name: str, value: Any) -> Any:
+        """Return a decoded ``GetSignal`` value.
+
+        Scalars are plain Python values; ``DoubleArray``/``Int64Array``/
+        ``UInt64Array`` replies are read-only NumPy arrays.
+        """
+
+        if value is NO_VALUE:
+            raise RuntimeError(f"Signal {signal_name} returned no value")
+        return value
+
+    def _rpc_timeout_s(self) -> float:
+        return max(self.config.timeout_ms / 1000.0, 5)
+
+    def _tick_timeout_s(self, tick_timeout: Optional[float]) -> float:
+        """Deadline of one poll tick: ``--tick-timeout``, the GetSignal policy or the RPC timeout."""
+
+        return tick_timeout or self._rpc_policy("GetSignal").timeout_s or self._rpc_timeout_s()
+
+    def _rpc_policy(self, name: str) -> RpcPolicy:
+        return self.config.rpc.policies.for_rpc(name)
+
+    def _sender(
+        self,
+        method,
+        request,
+        timeout_s: float,
+        name: str,
+        spans: Optional[List[tuple]] = None,
+        label: Optional[str] = None,
+    ) -> Callable[[], Any]:
+        """Return a callable that starts ``method(request)`` as a future.
+
+        The latency and payload size of every successful attempt are added to
+        :attr:`metrics` under ``name`` when its reply arrives. With ``spans``,
+        every finished attempt also appends ``(label, started, finished, ok)``
+        for the tick trace.
+        """
+
+        request_bytes = request.ByteSize()
+
+        def send():
+            started = time.monotonic()
+            future = method.future(request, timeout=timeout_s)
+
+            def observe(done) -> None:
+                if done.cancelled():
+                    return
+                finished = time.monotonic()
+                ok = done.exception() is None
+                if spans is not None:
+                    spans.append((label or name, started, finished, ok))
+                if ok:
+                    self.metrics.observe(
+                        name, finished - started, request_bytes, payload_size(done.result())
+                    )
+
+            future.add_done_callback(observe)
+            return future
+
+        return send
+
+    def _call_rpc(self, method, request, name: str):
+        policy = self._rpc_policy(name)
+        timeout_s = policy.timeout_s or self._rpc_timeout_s()
+        if policy.is_plain:
+            started = time.monotonic()
+            try:
+                reply = method(request, timeout=timeout_s)
+            except grpc.RpcError as exc:
+                self._raise_rpc_error(exc, name, timeout_s)
+            latency_s = time.monotonic() - started
+            self.metrics.observe(name, latency_s, request.ByteSize(), payload_size(reply))
+            self._log_rpc_latency(name, latency_s)
+            return reply
+        return self._resolve_call(self._sender(method, request, timeout_s, name), name, policy, timeout_s)
+
+    def _resolve_call(
+        self,
+        send: Callable[[], Any],
+        name: str,
+        policy: RpcPolicy,
+        timeout_s: float,
+        deadline: Optional[float] = None,
+        future=None,
+    ):
+        """Wait for the reply of an RPC started by ``send`` under ``policy``.
+
+        ``future`` is an attempt that was already started. Retries and hedged
+        requests stop at ``deadline`` (monotonic seconds) when it is given;
+        otherwise each attempt is bounded by its own ``timeout_s`` only.
+        """
+
+        attempt = 1
+        delays = policy.backoff_delays()
+        future = future if future is not None else send()
+        while True:
+            try:
+                return self._await_reply(future, send, policy, deadline)
+            except grpc.FutureTimeoutError as exc:
+                self.metrics.error(name, "DEADLINE_EXCEEDED")
+                self.logger.error("RPC %s timed out after %.0fms", name, timeout_s * 1000.0)
+                raise TimeoutError(f"RPC {name} timed out") from exc
+            except grpc.RpcError as exc:
+                remaining = math.inf if deadline is None else deadline - time.monotonic()
+                if remaining <= 0 or not policy.should_retry(exc.code().name, attempt):
+                    self._raise_rpc_error(exc, name, timeout_s)
+                delay = min(next(delays), remaining)
+                self._log_retry(name, exc, delay, attempt + 1, policy)
+                time.sleep(delay)
+                attempt += 1
+                future = send()
+
+    def _await_reply(self, future, send: Callable[[], Any], policy: RpcPolicy, deadline: Optional[float]):
+        """Return the reply of ``future``, hedging it when ``policy`` asks for it."""
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+        if not policy.hedging:
+            return future.result(timeout=remaining())
+        wait_s = remaining()
+        try:
+            return future.result(
+                timeout=policy.hedge_after_s if wait_s is None else min(policy.hedge_after_s, wait_s)
+            )
+        except grpc.FutureTimeoutError:
+            if remaining() == 0.0:
+                raise
+
+        futures = [future, send()]
+        self.rpc_policy_statistics["hedged"] = self.rpc_policy_statistics.get("hedged", 0) + 1
+        settled = threading.Event()
+        for candidate in futures:
+            candidate.add_done_callback(lambda _: settled.set())
+        try:
+            while True:
+                settled.clear()
+                done = [candidate for candidate in futures if candidate.done()]
+                for candidate in done:
+                    if not candidate.cancelled() and candidate.exception() is None:
+                        if candidate is not future:
+                            self.rpc_policy_statistics["hedge_wins"] = (
+                                self.rpc_policy_statistics.get("hedge_wins", 0) + 1
+                            )
+                        return candidate.result()
+                if len(done) == len(futures):
+                    # Every request failed: report the first failure.
+                    return future.result()
+                if not settled.wait(remaining()):
+                    raise grpc.FutureTimeoutError()
+        finally:
+            for candidate in futures:
+                candidate.cancel()
+
+    def _log_retry(self, name: str, exc: grpc.RpcError, delay: float, attempt: int, policy: RpcPolicy) -> None:
+        self.rpc_policy_statistics["retries"] = self.rpc_policy_statistics.get("retries", 0) + 1
+        self.metrics.error(name, exc.code().name)
+        self.metrics.retry(name)
+        self.logger.warning(
+            "RPC %s failed with %s, retrying in %.0fms (attempt %d of %d)",
+            name,
+            exc.code().name,
+            delay * 1000.0,
+            attempt,
+            policy.attempts,
+            extra={"rpc": name},
+        )
+
+    def _log_rpc_latency(self, name: str, latency_s: float) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            latency_ms = round(latency_s * 1000.0, 2)
+            self.logger.debug(
+                "RPC %s completed in %.2fms",
+                name,
+                latency_ms,
+                extra={"rpc": name, "latency_ms": latency_ms},
+            )
+
+    def _circuit_breaker(self) -> Optional[CircuitBreaker]:
+        settings = self.config.rpc.circuit_breaker
+        return settings.create() if settings is not None else None
+
+    def _tick_failed(self, breaker: CircuitBreaker, exc: Exception) -> float:
+        """Log a tick skipped by ``breaker`` and return the pause before the next one."""
+
+        pause_s = breaker.pause_s()
+        if pause_s:
+            self.logger.warning(
+                "Polling paused for %.1fs after %d consecutive failed ticks (%s)",
+                pause_s,
+                breaker.consecutive_failures,
+                exc,
+            )
+        else:
+            self.logger.warning("Skipping failed tick: %s", exc)
+        return pause_s
+
+    def _tick_succeeded(self, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None and breaker.record_success():
+            self.logger.info("Polling resumed, PROVEtech:TA answers again")
+
+    def _store_breaker_statistics(self, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None:
+            self.rpc_policy_statistics["circuit_breaker"] = breaker.statistics()
+
+    def _raise_rpc_error(self, exc: grpc.RpcError, name: str, timeout_s: float) -> NoReturn:
+        """Translate a gRPC error into the exceptions handled by ``main``."""
+
+        status = exc.code()
+        self.metrics.error(name, status.name)
+        if status == grpc.StatusCode.DEADLINE_EXCEEDED:
+            self.logger.error("RPC %s timed out after %.0fms", name, timeout_s * 1000.0)
+            raise TimeoutError(f"RPC {name} timed out") from exc
+        # Retryable statuses (an overloaded tool answers RESOURCE_EXHAUSTED) are
+        # transient: the circuit breaker pauses polling on them.
+        if status in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.UNIMPLEMENTED) or (
+            status.name in self._rpc_policy(name).retry_codes
+        ):
+            self.logger.error("RPC %s failed: %s", name, exc.details())
+            raise ConnectionError(f"RPC {name} failed: {exc.details()}") from exc
+        self.logger.exception("Unexpected RPC error for %s", name)
+        raise exc
+
+
+class _Monitoring:
+    """Tick bookkeeping of ``wait_for_completion``, shared by both controllers.
+
+    Holds the scheduler, circuit breaker, stop detector and log context of a
+    monitoring run. The controllers only differ in how a tick is sampled and
+    how the delay before the next one is waited for.
+    """
+
+    def __init__(
+        self,
+        controller: TestAutomationController,
+        sink: RowSink,
+        max_duration: Optional[int],
+        poll_interval: float,
+        tick_timeout: Optional[float],
+        schedule: str,
+        overrun_policy: str,
+        detector: Any,
+    ) -> None:
+        signals = controller.config.test.log_signals
+        controller.logger.info("Monitoring %d signals from AI-Core", len(signals))
+        self.controller = controller
+        self.sink = sink
+        self.max_duration = max_duration
+        self.timeout_s = controller._tick_timeout_s(tick_timeout)
+        self.requests = controller._signal_requests(signals)
+        self.scheduler = controller._start_scheduler(poll_interval, schedule, overrun_policy)
+        self.breaker = controller._circuit_breaker()
+        self.detector = detector
+        self.context = log_context(controller.logger)
+        self._tick_started = 0.0
+        self._pause_s = 0.0
+        self._stopping = False
+
+    def start_tick(self) -> None:
+        self._tick_started = self.scheduler.tick_started()
+        self.context.tick = self.scheduler.ticks
+        self._pause_s = 0.0
+        # The first tick after a detected stop is the last one.
+        self._stopping = self.detector is not None and self.detector.stopped
+
+    def raise_detector_error(self) -> None:
+        if self.detector is not None:
+            self.detector.raise_error()
+
+    def tick_failed(self, exc: Exception) -> None:
+        """Count a failed tick against the circuit breaker; re-raise without one or once it gives up."""
+
+        if self.breaker is None or not self.breaker.record_failure():
+            raise exc
+        self._pause_s = self.controller._tick_failed(self.breaker, exc)
+
+    def tick_sampled(self, row: Dict[str, Any], running: bool) -> bool:
+        """Write the row of a sampled tick; return True when it was the last one."""
+
+        controller = self.controller
+        controller._tick_succeeded(self.breaker)
+        written_at = time.monotonic()
+        self.sink.write(row)
+        controller.metrics.phase("sink", time.monotonic() - written_at)
+        if not running or self._stopping:
+            controller.logger.info("Measurement reported as finished")
+            return True
+        return False
+
+    def next_delay(self) -> Optional[float]:
+        """Seconds to wait before the next tick, or ``None`` once the duration is reached."""
+
+        if self.max_duration and self.scheduler.elapsed() >= self.max_duration:
+            self.controller.logger.warning("Maximum monitoring duration reached (%ss)", self.max_duration)
+            return None
+        self.controller.metrics.phase("tick", time.monotonic() - self._tick_started)
+        return max(self.scheduler.next_delay(), self._pause_s)
+
+    def finish(self) -> None:
+        """Store the statistics of the run; call after closing the stop detector."""
+
+        controller = self.controller
+        self.context.tick = None
+        controller.sampling_statistics = self.scheduler.statistics()
+        if self.detector is not None:
+            controller.sampling_statistics["stop_detection"] = self.detector.statistics()
+        controller._store_breaker_statistics(self.breaker)
+
+
+def _bounded(timeout_s: float, deadline: Optional[float]) -> float:
+    """``timeout_s``, shortened to the time left until ``deadline`` (monotonic seconds)."""
+
+    if deadline is None:
+        return timeout_s
+    return max(min(timeout_s, deadline - time.monotonic()), 0.0)
+
+
+class AsyncTestAutomationController(TestAutomationController):
+    """asyncio counterpart of :class:`TestAutomationController` on ``grpc.aio``.
+
+    Requests are built and replies decoded by the synchronous controller and
+    RPC failures are translated by the same ``_raise_rpc_error`` mapping, so
+    ``main`` handles both variants identically. Steps without an ordering
+    dependency are overlapped and the fixed start-up sleep is replaced by a
+    readiness wait on the channel.
+    """
+
+    def __init__(self, config: AutomationConfig, logger) -> None:
+        super().__init__(config, logger)
+        self.channel: Optional[grpc.aio.Channel] = None
+        self._capture_tasks: set = set()
+
+    async def connect(  # type: ignore[override]
+        self,
+        process: Optional[subprocess.Popen[bytes]] = None,
+        started_at: Optional[float] = None,
+    ) -> None:
+        """Connect as soon as the endpoint accepts connections.
+
+        When ``process`` is the freshly launched PROVEtech:TA, the readiness
+        probe decides when the server is ready and an early exit of the
+        process aborts the wait immediately.
+        """
+
+        endpoint = self.config.grpc.endpoint
+        self.logger.info("Connecting to PROVEtech:TA gRPC endpoint at %s", endpoint)
+        channels = self._open_channels(grpc.aio.insecure_channel)
+        channel = channels[0]
+        self._create_stubs(channels)
+        try:
+            if process is not None:
+                statistics = await self._readiness_probe(process, started_at).wait_async(
+                    self._probe_server
+                )
+                self._record_startup(statistics)
+            else:
+                await asyncio.wait_for(channel.channel_ready(), timeout=self._rpc_timeout_s())
+        except BaseException as exc:
+            for opened in channels:
+                await opened.close()
+            if isinstance(exc, asyncio.TimeoutError) and process is None:
+                raise ConnectionError(f"Unable to connect to {endpoint}: timed out") from exc
+            self._raise_startup_error(exc)
+        self.channel = channel
+        self.channels = channels
+        self.logger.info("Successfully connected to %s", endpoint)
+
+    async def _probe_server(self, timeout_s: float) -> None:  # type: ignore[override]
+        assert self.system_stub is not None
+        try:
+            await self.system_stub.GetVersion(ta_pb2.SystemGetVersionRequest(), timeout=timeout_s)
+        except grpc.RpcError as exc:
+            self._check_probe_error(exc)
+
+    async def close(self) -> None:
+        """Close the asynchronous channels if they are open."""
+
+        if self._capture_tasks:
+            await asyncio.gather(*self._capture_tasks, return_exceptions=True)
+        for channel in self.channels:
+            await channel.close()
+        self.channels = []
+        self.channel = None
+
+    async def configure(self) -> None:
+        """Configure video routing and the AI-Core model node concurrently."""
+
+        await self._gather(self.configure_video(), self.configure_ai_core())
+
+    async def configure_video(self) -> None:  # type: ignore[override]
+        """Configure the video device and link it to AI-Core."""
+
+        assert self.system_stub is not None and self.measure_stub is not None
+        self._log_video_configuration()
+        await self._call_rpc(
+            self.system_stub.ModifyVideoAudioConfig,
+            self._video_config_request(),
+            "ModifyVideoAudioConfig",
+        )
+        await self._call_rpc(
+            self.measure_stub.SetVideoAudio,
+            self._set_video_audio_request(),
+            "SetVideoAudio",
+        )
+
+    async def configure_ai_core(self) -> None:  # type: ignore[override]
+        """Configure the AI-Core executable and project file."""
+
+        assert self.system_stub is not None
+        await self._call_rpc(
+            self.system_stub.ModifyModelNodeConfig,
+            self._model_node_config_request(),
+            "ModifyModelNodeConfig",
+        )
+
+    async def load_model(self) -> None:  # type: ignore[override]
+        """Load the requested detection model within PROVEtech:TA."""
+
+        assert self.system_stub is not None
+        model_name = self.config.test.model_name
+        self.logger.info("Loading detection model '%s'", model_name)
+        request = ta_pb2.SystemLoadModelRequest(strModelName=model_name)
+        await self._call_rpc(self.system_stub.LoadModel, request, "LoadModel")
+
+    async def resolve_signals(self) -> None:  # type: ignore[override]
+        """Validate the monitored signals before the measurement starts."""
+
+        assert self.system_stub is not None
+        signals = self.config.test.log_signals
+        self.signal_column_types = {}
+        if not signals or not self.config.test.validate_signals:
+            return
+        cache = cache_key = None
+        if self.config.test.signal_cache is not None:
+            cache = SignalCache(self.config.test.signal_cache, self.logger)
+            version = await self._call_rpc(
+                self.system_stub.GetVersion, ta_pb2.SystemGetVersionRequest(), "GetVersion"
+            )
+            cache_key = SignalCache.key(self.config.test.model_name, self._ta_version(version))
+            cached = cache.lookup(cache_key, signals)
+            if cached is not None:
+                self.logger.info("Using cached validation of %d signals for %s", len(signals), cache_key)
+                self._apply_resolved_signals({name: entry["name"] for name, entry in cached.items()})
+                self._apply_signal_types({entry["name"]: entry["type"] for entry in cached.values()})
+                return
+
+        reply = await self._call_rpc(
+            self.system_stub.GetValidSignalList,
+            self._valid_signal_list_request(signals),
+            "GetValidSignalList",
+        )
+        resolved = self._match_valid_signals(signals, reply.RetVal)
+        types: Dict[str, Optional[str]] = {}
+        if cache is not None:
+            entries = await self._gather(
+                *(self._signal_metadata(name) for name in resolved.values())
+            )
+            cache.store(cache_key, dict(zip(resolved, entries)))
+            types = {entry["name"]: entry["type"] for entry in entries}
+        elif self._typed_output():
+            kinds = await self._gather(*(self._signal_type(name) for name in resolved.values()))
+            types = dict(zip(resolved.values(), kinds))
+        self._apply_resolved_signals(resolved)
+        self._apply_signal_types(types)
+
+    async def _signal_metadata(self, signal_name: str) -> Dict[str, Any]:  # type: ignore[override]
+        assert self.system_stub is not None
+        info, value = await self._gather(
+            self._call_rpc(
+                self.system_stub.GetSignalInfo,
+                ta_pb2.SystemGetSignalInfoRequest(strSignalName=signal_name),
+                f"GetSignalInfo[{signal_name}]",
+            ),
+            self._call_rpc(
+                self.system_stub.GetSignal,
+                ta_pb2.SystemGetSignalRequest(strSignalName=signal_name, bInterpreted=True),
+                f"GetSignal[{signal_name}]",
+            ),
+        )
+        return self._signal_cache_entry(signal_name, info, value)
+
+    async def _signal_type(self, signal_name: str) -> Optional[str]:  # type: ignore[override]
+        assert self.system_stub is not None
+        value = await self._call_rpc(
             self.system_stub.GetSignal,
-            request,
+            ta_pb2.SystemGetSignalRequest(strSignalName=signal_name, bInterpreted=True),
             f"GetSignal[{signal_name}]",
         )
-        which = response.WhichOneof("RetVal")
-        if not which:
-            raise RuntimeError(f"Signal {signal_name} returned no value")
-        return getattr(response, which)
+        return self._value_type(value)
 
-    def _call_rpc(self, method, request, name: str):
-        timeout_s = max(self.config.timeout_ms / 1000.0, 5)
+    async def start_measurement(self) -> None:  # type: ignore[override]
+        """Start the measurement run to stream video and AI signals."""
+
+        assert self.measure_stub is not None
+        self.logger.info("Starting measurement run")
+        request = ta_pb2.MeasureStartRequest(bSaveToDisk=False)
+        await self._call_rpc(self.measure_stub.Start, request, "MeasureStart")
+
+    async def wait_for_completion(  # type: ignore[override]
+        self,
+        sink: RowSink,
+        max_duration: Optional[int],
+        poll_interval: float,
+        tick_timeout: Optional[float] = None,
+        schedule: str = "interval",
+        overrun_policy: str = "skip",
+        stop_detection: str = "tick",
+        stop_check_interval: float = DEFAULT_STOP_CHECK_INTERVAL_S,
+    ) -> None:
+        """Monitor configured signals until the measurement stops.
+
+        The tick bookkeeping is shared with the synchronous controller through
+        :class:`_Monitoring`; only sampling and waiting are awaited here.
+        """
+
+        assert self.measure_stub is not None and self.system_stub is not None
+        monitoring = _Monitoring(
+            self,
+            sink,
+            max_duration,
+            poll_interval,
+            tick_timeout,
+            schedule,
+            overrun_policy,
+            self._stop_detector(stop_detection, stop_check_interval),
+        )
+        detector = monitoring.detector
+        try:
+            while True:
+                monitoring.start_tick()
+                try:
+                    monitoring.raise_detector_error()
+                    row, running = await self._sample_tick(
+                        monitoring.requests, monitoring.timeout_s, probe_running=detector is None
+                    )
+                except (ConnectionError, TimeoutError) as exc:
+                    monitoring.tick_failed(exc)
+                else:
+                    if monitoring.tick_sampled(row, running):
+                        break
+                delay = monitoring.next_delay()
+                if delay is None:
+                    break
+                if detector is None:
+                    await asyncio.sleep(delay)
+                else:
+                    await detector.wait(delay)
+        finally:
+            if detector is not None:
+                await detector.close()
+            monitoring.finish()
+
+    def capture_image(self, event: Dict[str, Any]) -> str:
+        """Capture the video source in a background task; see the base class."""
+
+        request = self._capture_image_request(event)
+        task = asyncio.ensure_future(self._capture_image(request))
+        self._capture_tasks.add(task)
+        task.add_done_callback(self._capture_tasks.discard)
+        return request.strDestinationPath
+
+    async def _capture_image(self, request) -> None:
+        assert self.bulk_system_stub is not None
         try:
-            return method(request, timeout=timeout_s)
+            reply = await self.bulk_system_stub.CaptureImage(request, timeout=self._rpc_timeout_s())
         except grpc.RpcError as exc:
-            status = exc.code()
-            if status == grpc.StatusCode.DEADLINE_EXCEEDED:
-                self.logger.error("RPC %s timed out after %sms", name, self.config.timeout_ms)
-                raise TimeoutError(f"RPC {name} timed out") from exc
-            if status in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.UNIMPLEMENTED):
-                self.logger.error("RPC %s failed: %s", name, exc.details())
-                raise ConnectionError(f"RPC {name} failed: {exc.details()}") from exc
-            self.logger.exception("Unexpected RPC error for %s", name)
+            self.logger.warning("CaptureImage failed for %s: %s", request.strDestinationPath, exc.details())
+            return
+        if not reply.RetVal:
+            self.logger.warning("PROVEtech:TA did not capture image %s", request.strDestinationPath)
+
+    async def stop_measurement(self) -> None:  # type: ignore[override]
+        """Stop the measurement if it is still running."""
+
+        assert self.measure_stub is not None
+        self.logger.info("Stopping measurement")
+        request = ta_pb2.MeasureStopRequest()
+        await self._call_rpc(self.measure_stub.Stop, request, "MeasureStop")
+
+    async def measurement_running(self) -> bool:  # type: ignore[override]
+        """Whether a measurement is running, e.g. one left behind by an interrupted run."""
+
+        return await self._is_measurement_running()
+
+    async def fetch_test_result(self) -> Dict[str, Any]:  # type: ignore[override]
+        """Retrieve the overall test result from PROVEtech:TA."""
+
+        assert self.system_stub is not None
+        request = ta_pb2.SystemGetResultRequest()
+        response = await self._call_rpc(
+            self.system_stub.GetResult,
+            request,
+            "GetResult",
+        )
+        return self._test_result_from_reply(response)
+
+    async def _sample_tick(  # type: ignore[override]
+        self,
+        requests: Sequence[tuple[str, Any]],
+        timeout_s: float,
+        probe_running: bool = True,
+    ) -> tuple[Dict[str, Any], bool]:
+        assert self.measure_stub is not None and self.get_signal is not None
+        sent_at = time.monotonic()
+        tick_deadline = sent_at + timeout_s
+        pool = self._get_signal_pool
+        spans: Optional[List[tuple]] = [] if self.logger.isEnabledFor(TRACE) else None
+        calls = [
+            self._call_rpc(
+                pool[index % len(pool)],
+                request,
+                f"GetSignal[{signal_name}]",
+                timeout_s,
+                spans,
+                tick_deadline,
+            )
+            for index, (signal_name, request) in enumerate(requests)
+        ]
+        if probe_running:
+            calls.append(
+                self._call_rpc(
+                    self.measure_stub.IsRunning,
+                    ta_pb2.MeasureIsRunningRequest(),
+                    "MeasureIsRunning",
+                    timeout_s,
+                    spans,
+                    tick_deadline,
+                )
+            )
+        replies = await self._gather(*calls)
+        received_at = time.monotonic()
+        self.metrics.phase("wait", received_at - sent_at)
+        if spans is not None:
+            self._log_tick_trace(sent_at, received_at, spans)
+
+        row: Dict[str, Any] = {"timestamp": self._timestamp((sent_at + received_at) / 2.0)}
+        for (signal_name, _), response in zip(requests, replies):
+            row[signal_name] = self._decode_signal_reply(signal_name, response)
+        running = bool(getattr(replies[-1], "RetVal", False)) if probe_running else True
+        return row, running
+
+    def _stop_detector(  # type: ignore[override]
+        self, mode: str, interval_s: float
+    ) -> Optional[AsyncStopDetector]:
+        if mode == "tick":
+            return None
+        self.logger.info("Checking the measurement state every %.1fs (%s)", interval_s, mode)
+        return AsyncStopDetector(
+            self._is_measurement_running,
+            interval_s,
+            self._measurement_events if mode == "event" else None,
+            self.logger,
+        ).start()
+
+    async def _is_measurement_running(self) -> bool:  # type: ignore[override]
+        assert self.measure_stub is not None
+        response = await self._call_rpc(
+            self.measure_stub.IsRunning, ta_pb2.MeasureIsRunningRequest(), "MeasureIsRunning"
+        )
+        return bool(getattr(response, "RetVal", False))
+
+    async def _measurement_events(self):  # type: ignore[override]
+        assert self.msg_queue_stub is not None
+        call = self.msg_queue_stub.EventMessage()
+        try:
+            async for event in call:
+                await call.write(ta_pb2.MsgQueueEventMessageResult())
+                yield event
+        finally:
+            call.cancel()
+
+    async def _call_rpc(  # type: ignore[override]
+        self,
+        method,
+        request,
+        name: str,
+        timeout_s: Optional[float] = None,
+        spans: Optional[List[tuple]] = None,
+        deadline: Optional[float] = None,
+    ):
+        """Call ``method`` under the policy of ``name``.
+
+        As in :meth:`TestAutomationController._resolve_call`, attempts,
+        hedged requests and retry back-off stop at ``deadline`` (monotonic
+        seconds) when it is given.
+        """
+
+        policy = self._rpc_policy(name)
+        timeout_s = timeout_s or policy.timeout_s or self._rpc_timeout_s()
+        attempt = 1
+        delays = policy.backoff_delays()
+        while True:
+            started = time.monotonic()
+            try:
+                if policy.hedging:
+                    reply = await self._hedged_call(method, request, timeout_s, policy.hedge_after_s, deadline)
+                else:
+                    reply = await method(request, timeout=_bounded(timeout_s, deadline))
+            except grpc.RpcError as exc:
+                if spans is not None:
+                    spans.append((name, started, time.monotonic(), False))
+                remaining = math.inf if deadline is None else deadline - time.monotonic()
+                if remaining <= 0 or not policy.should_retry(exc.code().name, attempt):
+                    self._raise_rpc_error(exc, name, timeout_s)
+                delay = min(next(delays), remaining)
+                self._log_retry(name, exc, delay, attempt + 1, policy)
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                finished = time.monotonic()
+                self.metrics.observe(
+                    name, finished - started, request.ByteSize(), payload_size(reply)
+                )
+                if spans is not None:
+                    spans.append((name, started, finished, True))
+                else:
+                    self._log_rpc_latency(name, finished - started)
+                return reply
+
+    async def _hedged_call(
+        self, method, request, timeout_s: float, hedge_after_s: float, deadline: Optional[float] = None
+    ):
+        """Send a second request after ``hedge_after_s`` and return the first reply.
+
+        Neither request outlives ``deadline``; no second request is sent once it passed.
+        """
+
+        first = asyncio.ensure_future(method(request, timeout=_bounded(timeout_s, deadline)))
+        done, _ = await asyncio.wait({first}, timeout=_bounded(hedge_after_s, deadline))
+        if done or (deadline is not None and deadline <= time.monotonic()):
+            # Past the deadline the first request fails with DEADLINE_EXCEEDED by itself.
+            return await first
+        second = asyncio.ensure_future(method(request, timeout=_bounded(timeout_s, deadline)))
+        self.rpc_policy_statistics["hedged"] = self.rpc_policy_statistics.get("hedged", 0) + 1
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is second:
+                            self.rpc_policy_statistics["hedge_wins"] = (
+                                self.rpc_policy_statistics.get("hedge_wins", 0) + 1
+                            )
+                        return task.result()
+            # Every request failed: report the first failure.
+            return first.result()
+        finally:
+            for task in (first, second):
+                task.cancel()
+
+    @staticmethod
+    async def _gather(*coroutines) -> List[Any]:
+        """Run ``coroutines`` concurrently and cancel the rest on failure."""
+
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
             raise
 
 
-def export_results(data: List[Dict[str, Any]], metadata: Dict[str, Any], output_dir: Path, logger) -> None:
-    """Persist collected signal data to CSV and JSON outputs."""
+async def run_async_workflow(
+    controller: AsyncTestAutomationController,
+    args: argparse.Namespace,
+    ta_process: Optional[subprocess.Popen[bytes]],
+    launch_ai_core_callback: Callable[[], None],
+    open_sink_callback: Callable[[str], RowSink],
+    ta_started_at: Optional[float] = None,
+    resume: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Drive the automation workflow with the asynchronous controller.
 
-    if not data:
-        logger.warning("No signal data collected; skipping export")
-        return
+    ``open_sink_callback`` receives the monitoring attempt of a resumed run.
+    """
+
+    try:
+        await controller.connect(ta_process, ta_started_at)
+        launch_ai_core_callback()
+        reattached = resume is not None and await controller.measurement_running()
+        if reattached:
+            controller.logger.info("Reattaching to the running measurement of the checkpointed run")
+        else:
+            await controller.configure()
+            await controller.load_model()
+        await controller.resolve_signals()
+        sink = open_sink_callback(_attempt(resume, reattached))
+        if not reattached:
+            await controller.start_measurement()
+        await controller.wait_for_completion(
+            sink=sink,
+            max_duration=_monitoring_budget(args, resume),
+            poll_interval=args.poll_interval,
+            tick_timeout=args.tick_timeout,
+            schedule=args.schedule,
+            overrun_policy=args.overrun_policy,
+            stop_detection=args.stop_detection,
+            stop_check_interval=args.stop_check_interval,
+        )
+        await controller.stop_measurement()
+        return await controller.fetch_test_result()
+    finally:
+        await controller.close()
+
+
+def create_signal_sink(
+    config: AutomationConfig,
+    on_trigger: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    logger=None,
+    resume: Optional[Dict[str, Any]] = None,
+    attempt: str = "start",
+    column_types: Optional[Dict[str, str]] = None,
+) -> RowSink:
+    """Open the streaming sink for the monitored signals of a run.
+
+    With ``capture.triggers`` the sink is wrapped in a :class:`TriggerCapture`
+    that only writes the ticks around trigger events and calls ``on_trigger``
+    for each of them. With ``encoding.mode: changes`` a :class:`ChangeEncoder`
+    only writes the changed signals. With ``aggregation.window_s`` a :class:`SignalAggregator`
+    sees every row first and writes the window aggregates to their own file;
+    ``aggregation.raw: false`` drops the raw rows.
+
+    With ``checkpoint.interval_s`` or a ``resume`` checkpoint the raw rows go
+    to a :class:`SegmentedSink`; ``attempt`` tells how the measurement of
+    this attempt was obtained (``start``, ``reattach`` or ``continue``).
+
+    ``column_types`` maps monitored signals to the column types of a columnar
+    data file, see :attr:`TestAutomationController.signal_column_types`.
+    """
+
+    test = config.test
+    capture = config.capture
+    aggregation = config.aggregation
+    encoding = config.encoding
+    checkpointed = config.checkpoint.enabled or resume is not None
+    if checkpointed and aggregation.enabled and not aggregation.raw:
+        raise ConfigurationError("checkpoints need the raw rows, which aggregation.raw: false drops")
+    if capture.enabled and aggregation.enabled and not aggregation.raw:
+        raise ConfigurationError("capture.triggers needs the raw rows, which aggregation.raw: false drops")
+    if capture.enabled and encoding.mode == "changes":
+        raise ConfigurationError("capture.triggers cannot be combined with encoding.mode: changes")
+
+    def open_sink(
+        columns: List[str], basename: str = "signals", types: Optional[Dict[str, str]] = None
+    ) -> SignalSink:
+        try:
+            return create_sink(
+                test.output_format,
+                test.output_dir,
+                columns,
+                basename=basename,
+                buffer_rows=test.buffer_rows,
+                flush_interval_s=test.flush_interval_s,
+                fsync=test.fsync,
+                column_types=types,
+            )
+        except ImportError as exc:
+            raise ConfigurationError(
+                f"Output format '{test.output_format}' requires the optional "
+                f"package {SINK_DEPENDENCIES[test.output_format]}: {exc}"
+            ) from exc
+
+    sink: Optional[RowSink] = None
+    if not aggregation.enabled or aggregation.raw:
+        columns = ["timestamp", *test.log_signals]
+        types = dict(column_types or {})
+        if capture.enabled:
+            columns.append(CAPTURE_COLUMN)
+            types[CAPTURE_COLUMN] = "int"
+        if checkpointed:
+            try:
+                sink = SegmentedSink(
+                    lambda basename, segment_types: open_sink(columns, basename, segment_types),
+                    test.output_dir,
+                    columns,
+                    test.output_format,
+                    config.checkpoint.interval_s or (resume or {}).get("interval_s", 0.0),
+                    resume,
+                    attempt,
+                    logger,
+                    types,
+                )
+            except ValueError as exc:
+                raise ConfigurationError(f"Unable to resume the checkpointed run: {exc}") from exc
+        else:
+            sink = open_sink(columns, types=types)
+    if sink is not None and encoding.mode == "changes":
+        try:
+            sink = ChangeEncoder(sink, encoding.deadband, encoding.deadbands)
+        except ValueError as exc:
+            sink.close()
+            raise ConfigurationError(f"Invalid encoding section: {exc}") from exc
+    if sink is not None and capture.enabled:
+        try:
+            sink = TriggerCapture(
+                sink, capture.triggers, capture.pre_ticks, capture.post_ticks, on_trigger, logger
+            )
+        except ValueError as exc:
+            sink.close()
+            raise ConfigurationError(f"Invalid capture section: {exc}") from exc
+    if not aggregation.enabled:
+        assert sink is not None
+        return sink
+    return SignalAggregator(
+        test.log_signals,
+        aggregation.window_s,
+        lambda columns, types: open_sink(columns, "aggregates", types),
+        sink,
+        aggregation.quantiles,
+        column_types,
+    )
+
+
+def _image_capture(
+    controller: TestAutomationController, config: AutomationConfig, live: bool = True
+) -> Optional[Callable[[Dict[str, Any]], Optional[str]]]:
+    """Return the trigger action capturing video images, if configured.
+
+    Recorded measurements are only read after the run, so images would not
+    match the trigger instant there.
+    """
+
+    if not (config.capture.enabled and config.capture.image and live):
+        return None
+    return controller.capture_image
+
+
+def export_results(sink: RowSink, metadata: Dict[str, Any], output_dir: Path, logger) -> None:
+    """Finalise the signal data file and write the JSON result summary.
+
+    The samples were already streamed to disk by ``sink``; the summary only
+    references the data file so it stays small regardless of the run length.
+    Checkpointed segments are stitched into the data file first.
+    """
+
+    if (segments := segmented_sink(sink)) is not None:
+        segments.complete()
+    sink.close()
+    if not sink.row_count:
+        logger.warning("No signal data collected")
     output_dir = output_dir.expanduser().resolve()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    df = pd.DataFrame(data)
-    csv_path = output_dir / "signals.csv"
     json_path = output_dir / "result_summary.json"
-
-    df.to_csv(csv_path, index=False)
     payload = {
         "metadata": metadata,
-        "signals": data,
+        "signals": sink.describe(),
     }
     json_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
-    logger.info("Results exported to %s and %s", csv_path, json_path)
+    logger.info("Results exported to %s and %s", sink.path, json_path)
+
+
+def _metrics_labels(config: AutomationConfig) -> Dict[str, str]:
+    return {"endpoint": config.grpc.endpoint, "model": config.test.model_name}
+
+
+def export_metrics(controller: TestAutomationController, config: AutomationConfig, logger) -> None:
+    """Write the RPC metrics of the run to ``metrics.prometheus_file`` if configured."""
+
+    path = config.metrics.prometheus_file
+    if path is None:
+        return
+    try:
+        path = controller.metrics.write_prometheus(path, _metrics_labels(config))
+    except OSError as exc:
+        logger.warning("Unable to write RPC metrics to %s: %s", path, exc)
+        return
+    logger.info("RPC metrics written to %s", path)
+
+
+def start_metrics_server(
+    controller: TestAutomationController, config: AutomationConfig, logger
+) -> Optional[MetricsServer]:
+    """Serve the live RPC metrics of ``controller`` when ``metrics.listen_port`` is set."""
+
+    settings = config.metrics
+    if not settings.listen_port:
+        return None
+    try:
+        server = MetricsServer(
+            settings.listen_host,
+            settings.listen_port,
+            lambda openmetrics: controller.metrics.render(
+                _metrics_labels(controller.config), openmetrics
+            ),
+        ).start()
+    except OSError as exc:
+        raise ConfigurationError(
+            f"Unable to serve metrics on {settings.listen_host}:{settings.listen_port}: {exc}"
+        ) from exc
+    host, port = server.address
+    logger.info("Serving RPC metrics on http://%s:%s/metrics", host, port)
+    return server
+
+
+def resume_checkpoint(config: AutomationConfig, args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """Checkpoint of the interrupted run in ``test.output_dir`` to continue with ``--resume``."""
+
+    if not getattr(args, "resume", False):
+        return None
+    if config.test.acquisition == "record":
+        raise ConfigurationError("--resume is not supported with record acquisition")
+    try:
+        return load_checkpoint(config.test.output_dir)
+    except ValueError as exc:
+        raise ConfigurationError(str(exc)) from exc
+
+
+def _monitoring_budget(args: argparse.Namespace, resume: Optional[Dict[str, Any]]) -> Optional[float]:
+    """``--monitor-seconds`` left after the attempts of a resumed run, at least one tick."""
+
+    if resume is None or not args.monitor_seconds:
+        return args.monitor_seconds
+    return max(args.monitor_seconds - monitored_seconds(resume), args.poll_interval)
+
+
+def _attempt(resume: Optional[Dict[str, Any]], reattached: bool) -> str:
+    if resume is None:
+        return "start"
+    return "reattach" if reattached else "continue"
+
+
+def _result_metadata(controller: TestAutomationController, logger) -> Dict[str, Any]:
+    """Run statistics added to the test result of either controller."""
+
+    metadata: Dict[str, Any] = {"sampling": controller.sampling_statistics}
+    if controller.startup_statistics:
+        metadata["startup"] = controller.startup_statistics
+    if controller.rpc_policy_statistics:
+        metadata["rpc_policy"] = controller.rpc_policy_statistics
+    metadata["run_id"] = log_context(logger).run_id
+    metadata["metrics"] = controller.metrics.summary()
+    if (log_statistics := logging_statistics(logger)) is not None:
+        metadata["logging"] = log_statistics
+    return metadata
+
+
+def run_test_case(
+    controller: TestAutomationController,
+    config: AutomationConfig,
+    args: argparse.Namespace,
+    logger,
+) -> Dict[str, Any]:
+    """Configure, measure and export one test case on a connected controller.
+
+    Configuration steps whose request did not change since the previous case
+    on the same connection are skipped by the controller. With ``--resume``
+    a measurement that is still running is monitored again without being
+    configured and restarted; otherwise a continuation measurement starts.
+    The RPC metrics keep the calls made while connecting.
+    """
+
+    controller.config = config
+    controller.sampling_statistics = {}
+    controller.reused_steps = []
+    record = config.test.acquisition == "record"
+    resume = resume_checkpoint(config, args)
+
+    reattached = resume is not None and controller.measurement_running()
+    if reattached:
+        logger.info("Reattaching to the running measurement of the checkpointed run")
+    else:
+        controller.configure_video()
+        controller.configure_ai_core()
+        controller.load_model()
+    controller.resolve_signals()
+    sink: Optional[RowSink] = None
+
+    def _open_sink() -> RowSink:
+        nonlocal sink
+        # Recorded samples carry the recorded value types, not the live ones.
+        sink = create_signal_sink(
+            config,
+            _image_capture(controller, config, live=not record),
+            logger,
+            resume,
+            _attempt(resume, reattached),
+            None if record else controller.signal_column_types,
+        )
+        return sink
+
+    # A recording is only known to be usable once it has been opened.
+    if not record:
+        _open_sink()
+    try:
+        if not reattached:
+            controller.start_measurement(record=record)
+        if record:
+            controller.wait_for_recording(
+                max_duration=args.monitor_seconds,
+                poll_interval=args.poll_interval,
+                schedule=args.schedule,
+                overrun_policy=args.overrun_policy,
+            )
+            controller.stop_measurement()
+            controller.fetch_recording(_open_sink)
+        else:
+            controller.wait_for_completion(
+                sink=sink,
+                max_duration=_monitoring_budget(args, resume),
+                poll_interval=args.poll_interval,
+                tick_timeout=args.tick_timeout,
+                schedule=args.schedule,
+                overrun_policy=args.overrun_policy,
+                stop_detection=args.stop_detection,
+                stop_check_interval=args.stop_check_interval,
+            )
+            controller.stop_measurement()
+        assert sink is not None
+        test_result = controller.fetch_test_result()
+        test_result.update(_result_metadata(controller, logger))
+        export_results(sink, test_result, config.test.output_dir, logger)
+        export_metrics(controller, config, logger)
+    finally:
+        if sink is not None:
+            sink.close()
+    return test_result
+
+
+def run_session(
+    controller: TestAutomationController,
+    config: AutomationConfig,
+    args: argparse.Namespace,
+    logger,
+) -> int:
+    """Run the cases of ``args.session`` against one warm connection.
+
+    PROVEtech:TA, AI-Core, the gRPC channel and the loaded model stay alive
+    between cases. Every case layers its arguments on top of the session
+    arguments and writes its artefacts to ``<output_dir>/<case id>/``; a
+    ``session_summary.json`` lists the outcome of all cases. A case that fails
+    with a configuration error or a timeout is recorded and the session moves
+    on, while a lost connection ends the session.
+    """
+
+    session_path = Path(args.session)
+    if not session_path.exists():
+        raise ConfigurationError(f"Session file not found: {session_path}")
+    cases = parse_test_cases(_load_yaml(session_path).get("cases"))
+    session_args = copy.copy(args)
+    session_args.session = None
+    output_dir = config.test.output_dir
+    logger.info("Running %d test cases in one session", len(cases))
+
+    results = []
+    started = time.monotonic()
+    context = log_context(logger)
+    session_case_id = context.case_id
+    for case in cases:
+        context.case_id = case.case_id
+        case_args = parse_arguments(
+            case.arguments() + ["--output-dir", str(output_dir / case.case_id)],
+            namespace=session_args,
+        )
+        logger.info("Test case %s started", case.case_id)
+        if results:
+            # The first case also reports the RPCs of the connection set-up.
+            controller.metrics = RpcMetrics()
+            controller.rpc_policy_statistics = {}
+        case_started = time.monotonic()
+        entry: Dict[str, Any] = {"case": case.case_id, "model": case.model}
+        try:
+            if case_args.config_override == args.config_override:
+                case_config = copy.deepcopy(config)
+            else:
+                # Served from the compiled snapshot, the file is not parsed again.
+                case_config = load_configuration(configuration_path(args), case_args.config_override)
+            apply_cli_overrides(case_config, case_args)
+            test_result = run_test_case(controller, case_config, case_args, logger)
+        except (ConfigurationError, TimeoutError, RuntimeError) as exc:
+            logger.error("Test case %s failed: %s", case.case_id, exc)
+            entry.update(status="failed", error=str(exc))
+            if not isinstance(exc, ConfigurationError):
+                try:
+                    controller.stop_measurement()
+                except Exception:  # pragma: no cover - best effort cleanup
+                    logger.debug("Measurement stop after failed case %s failed", case.case_id)
+        else:
+            entry.update(status="completed", result=test_result.get("result"))
+        entry["duration_s"] = round(time.monotonic() - case_started, 3)
+        entry["reused_steps"] = list(controller.reused_steps)
+        results.append(entry)
+    context.case_id = session_case_id
+
+    summary = {
+        "duration_s": round(time.monotonic() - started, 3),
+        "cases": results,
+    }
+    summary_path = output_dir.expanduser().resolve() / "session_summary.json"
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    failed = sum(1 for entry in results if entry["status"] != "completed")
+    logger.info(
+        "Session finished: %d of %d test cases completed", len(results) - failed, len(results)
+    )
+    return 1 if failed else 0
+
+
+def _keeps_processes(config: AutomationConfig) -> bool:
+    return config.checkpoint.enabled and config.checkpoint.keep_processes
 
 
 def launch_ai_core(config: AutomationConfig, logger, skip_launch: bool) -> Optional[subprocess.Popen[bytes]]:
@@ -575,7 +3004,7 @@ def launch_ai_core(config: AutomationConfig, logger, skip_launch: bool) -> Optio
         logger.warning("AI-Core configuration file not found at %s", config_file)
     arguments = [str(config_file)] if config_file.exists() else []
     try:
-        return start_process(executable, arguments, logger)
+        return start_process(executable, arguments, logger, _keeps_processes(config))
     except ProcessLaunchError as exc:
         logger.error("Failed to launch AI-Core: %s", exc)
         return None
@@ -593,65 +3022,134 @@ def launch_provetech(config: AutomationConfig, logger, skip_launch: bool) -> Opt
         return None
     arguments = [f"--grpc-port={config.grpc.port}", "--automation"]
     try:
-        return start_process(executable, arguments, logger)
+        return start_process(executable, arguments, logger, _keeps_processes(config))
     except ProcessLaunchError as exc:
         logger.error("Failed to launch PROVEtech:TA: %s", exc)
         raise
 
 
+def validate_arguments(config: AutomationConfig, args: argparse.Namespace) -> None:
+    """Reject option combinations before anything is launched."""
+
+    if package := missing_dependency(config.test.output_format):
+        raise ConfigurationError(
+            f"Output format '{config.test.output_format}' requires the optional package {package}"
+        )
+    if args.use_async and config.test.acquisition == "record":
+        raise ConfigurationError("Record acquisition is not supported with --async")
+    if args.use_async and args.session:
+        raise ConfigurationError("--session is not supported with --async")
+    if args.resume and args.session:
+        raise ConfigurationError("--resume is not supported with --session")
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_arguments(argv)
-    config_path = Path(args.config) if args.config else Path(__file__).with_name("config.yaml")
-    config = load_configuration(config_path)
+    try:
+        config = load_configuration(configuration_path(args), args.config_override)
+    except ConfigurationError as exc:
+        print(f"Configuration error: {exc}", file=sys.stderr)
+        return 1
     apply_cli_overrides(config, args)
+    try:
+        validate_arguments(config, args)
+    except ConfigurationError as exc:
+        print(f"Configuration error: {exc}", file=sys.stderr)
+        return 1
 
-    logger = setup_logging(config.logging.level, config.logging.file)
+    logger = setup_logging(
+        config.logging.level,
+        config.logging.file,
+        mode=config.logging.mode,
+        queue_size=config.logging.queue_size,
+        drop_level=config.logging.drop_level,
+        max_bytes=int(config.logging.max_mb * 1024 * 1024),
+        rotate_interval_s=config.logging.rotate_hours * 3600.0,
+        backup_count=config.logging.backup_count,
+        log_format=config.logging.format,
+        run_id=args.run_id,
+    )
     update_log_level(logger, args.log_level)
+    if args.case_id:
+        log_context(logger).case_id = args.case_id
 
     ai_core_process = None
     ta_process = None
+    resume: Optional[Dict[str, Any]] = None
+    sink: Optional[RowSink] = None
+    metrics_server: Optional[MetricsServer] = None
 
     try:
+        ta_started_at = time.monotonic()
         ta_process = launch_provetech(config, logger, args.skip_ta_launch)
-        if ta_process is not None:
-            # Allow server to initialise before attempting to connect.
-            logger.info("Waiting for PROVEtech:TA to initialise")
-            time.sleep(5)
 
-        controller = TestAutomationController(config, logger)
-        controller.connect()
+        if args.use_async:
 
-        ai_core_process = launch_ai_core(config, logger, args.skip_ai_core)
+            def _launch_ai_core() -> None:
+                nonlocal ai_core_process
+                ai_core_process = launch_ai_core(config, logger, args.skip_ai_core)
 
-        controller.configure_video()
-        controller.configure_ai_core()
-        controller.load_model()
-        controller.start_measurement()
-        signal_data = controller.wait_for_completion(
-            max_duration=args.monitor_seconds,
-            poll_interval=args.poll_interval,
-        )
-        controller.stop_measurement()
-        test_result = controller.fetch_test_result()
+            def _open_sink(attempt: str) -> RowSink:
+                nonlocal sink
+                sink = create_signal_sink(
+                    config, _image_capture(controller, config), logger, resume, attempt, controller.signal_column_types
+                )
+                return sink
+
+            resume = resume_checkpoint(config, args)
+
+            controller = AsyncTestAutomationController(config, logger)
+            metrics_server = start_metrics_server(controller, config, logger)
+            test_result = asyncio.run(
+                run_async_workflow(
+                    controller, args, ta_process, _launch_ai_core, _open_sink, ta_started_at, resume
+                )
+            )
+            test_result.update(_result_metadata(controller, logger))
+            export_results(sink, test_result, config.test.output_dir, logger)
+            export_metrics(controller, config, logger)
+        else:
+            controller = TestAutomationController(config, logger)
+            metrics_server = start_metrics_server(controller, config, logger)
+            controller.connect(ta_process, ta_started_at)
+
+            ai_core_process = launch_ai_core(config, logger, args.skip_ai_core)
+
+            if args.session:
+                return run_session(controller, config, args, logger)
+            run_test_case(controller, config, args, logger)
 
-        export_results(signal_data, test_result, config.test.output_dir, logger)
         logger.info("Automation workflow completed successfully")
         return 0
-    except (ConfigurationError, ConnectionError, TimeoutError, ProcessLaunchError) as exc:
+    except (ConfigurationError, ConnectionError, TimeoutError, ProcessLaunchError, RecordingError) as exc:
         logger.error("Automation failed: %s", exc)
         return 1
     except KeyboardInterrupt:
         logger.warning("Automation interrupted by user")
         return 2
     finally:
-        if ai_core_process is not None:
-            _terminate_process(ai_core_process, logger)
-        if ta_process is not None:
-            _terminate_process(ta_process, logger)
+        if sink is not None:
+            sink.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        # An interrupted checkpointed run leaves its measurement running for --resume.
+        keep_processes = (
+            (config.checkpoint.enabled or args.resume)
+            and config.checkpoint.keep_processes
+            and (config.test.output_dir.expanduser().resolve() / CHECKPOINT_FILE).exists()
+        )
+        for name, process in (("AI-Core", ai_core_process), ("PROVEtech:TA", ta_process)):
+            if process is None:
+                continue
+            if keep_processes:
+                logger.warning("Leaving %s (PID %s) running for --resume", name, process.pid)
+            else:
+                _terminate_process(process, logger)
         if controller := locals().get("controller"):
-            channel = getattr(controller, "channel", None)
-            if channel is not None:
+            # The asynchronous controller closed its channels in the workflow.
+            for channel in controller.channels:
                 channel.close()
+        shutdown_logging(logger)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+"""Polling throughput benchmark against the fake PROVEtech:TA server.
+
+Starts ``fake_ta_server.py`` in a subprocess, so that its CPU time does not
+count against the client, and drives :class:`TestAutomationController` (or
+the asynchronous controller with ``--async``) through connect, signal
+validation and one monitored measurement per signal count. For each count it
+reports the achieved samples/s, tick rate and jitter, and the CPU share and
+resident memory of the client process, e.g.
+``python benchmark.py --signals 1,10,100,500 --seconds 5 --latency-ms 1 --output bench.json``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from automate_test import (
+    AsyncTestAutomationController,
+    AutomationConfig,
+    ConfigurationError,
+    TestAutomationController,
+    create_signal_sink,
+    load_configuration,
+)
+from utils.scheduler import OVERRUN_POLICIES, SCHEDULE_MODES
+
+DEFAULT_SIGNAL_COUNTS = (1, 10, 50, 100, 250, 500)
+
+SERVER_SCRIPT = Path(__file__).with_name("fake_ta_server.py")
+
+RESULT_COLUMNS = (
+    ("signals", "signals", "{}"),
+    ("samples/s", "samples_per_s", "{:.0f}"),
+    ("ticks/s", "achieved_rate_hz", "{:.1f}"),
+    ("jitter mean ms", "jitter_mean_ms", "{:.2f}"),
+    ("jitter max ms", "jitter_max_ms", "{:.2f}"),
+    ("overruns", "overruns", "{}"),
+    ("CPU %", "cpu_percent", "{:.0f}"),
+    ("RSS MiB", "rss_mb", "{:.1f}"),
+)
+
+
+def signal_names(count: int) -> List[str]:
+    return [f"Benchmark.Signal{index:03d}" for index in range(count)]
+
+
+def resident_memory_mb() -> float:
+    """Current resident set size of this process; the peak where /proc is missing."""
+
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def start_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, int]:
+    """Launch the fake server on a free port and return it with the port."""
+
+    command = [sys.executable, str(SERVER_SCRIPT), "--port", "0", "--default-signal", args.signal_kind]
+    if args.latency_ms or args.jitter_ms:
+        command += ["--latency", f"*={args.latency_ms}:{args.jitter_ms}"]
+    if args.failure_rate:
+        command += ["--fail", f"GetSignal={args.failure_rate}"]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    assert process.stdout is not None
+    line = process.stdout.readline().strip()
+    if not line.startswith("Listening on "):
+        process.kill()
+        raise RuntimeError(f"Fake PROVEtech:TA server did not start (exit code {process.wait()})")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def run_case(
+    config: AutomationConfig, args: argparse.Namespace, logger: logging.Logger
+) -> Dict[str, Any]:
+    """Monitor ``config.test.log_signals`` for ``args.seconds`` and measure the client."""
+
+    controller_class = AsyncTestAutomationController if args.use_async else TestAutomationController
+    controller = controller_class(config, logger)
+    monitor = dict(
+        max_duration=args.seconds,
+        poll_interval=args.poll_interval,
+        schedule=args.schedule,
+        overrun_policy=args.overrun_policy,
+        stop_detection=args.stop_detection,
+    )
+    sink = create_signal_sink(config)
+    try:
+        if args.use_async:
+            import asyncio
+
+            elapsed_s, cpu_s = asyncio.run(_run_async(controller, sink, monitor))
+        else:
+            elapsed_s, cpu_s = _run_sync(controller, sink, monitor)
+    finally:
+        sink.close()
+    sampling = controller.sampling_statistics
+    jitter = sampling.get("jitter_ms", {})
+    ticks = sampling.get("ticks", 0)
+    return {
+        "signals": len(config.test.log_signals),
+        "ticks": ticks,
+        "elapsed_s": round(elapsed_s, 3),
+        "samples_per_s": round(ticks * len(config.test.log_signals) / elapsed_s, 1) if elapsed_s else 0.0,
+        "achieved_rate_hz": sampling.get("achieved_rate_hz", 0.0),
+        "jitter_mean_ms": jitter.get("mean", 0.0),
+        "jitter_max_ms": jitter.get("max", 0.0),
+        "jitter_stdev_ms": jitter.get("stdev", 0.0),
+        "overruns": sampling.get("overruns", 0),
+        "cpu_percent": round(100.0 * cpu_s / elapsed_s, 1) if elapsed_s else 0.0,
+        "rss_mb": round(resident_memory_mb(), 1),
+    }
+
+
+def _run_sync(controller: TestAutomationController, sink, monitor: Dict[str, Any]) -> Tuple[float, float]:
+    try:
+        controller.connect()
+        controller.resolve_signals()
+        controller.start_measurement()
+        wall, cpu = time.perf_counter(), time.process_time()
+        controller.wait_for_completion(sink=sink, **monitor)
+        elapsed = (time.perf_counter() - wall, time.process_time() - cpu)
+        controller.stop_measurement()
+        return elapsed
+    finally:
+        for channel in controller.channels:
+            channel.close()
+
+
+async def _run_async(controller: AsyncTestAutomationController, sink, monitor: Dict[str, Any]) -> Tuple[float, float]:
+    try:
+        await controller.connect()
+        await controller.resolve_signals()
+        await controller.start_measurement()
+        wall, cpu = time.perf_counter(), time.process_time()
+        await controller.wait_for_completion(sink=sink, **monitor)
+        elapsed = (time.perf_counter() - wall, time.process_time() - cpu)
+        await controller.stop_measurement()
+        return elapsed
+    finally:
+        await controller.close()
+
+
+def print_table(results: Sequence[Dict[str, Any]]) -> None:
+    widths = [max(len(title), 8) for title, _, _ in RESULT_COLUMNS]
+    print("  ".join(title.rjust(width) for (title, _, _), width in zip(RESULT_COLUMNS, widths)))
+    for result in results:
+        print(
+            "  ".join(
+                template.format(result[key]).rjust(width)
+                for (_, key, template), width in zip(RESULT_COLUMNS, widths)
+            )
+        )
+
+
+def _signal_counts(text: str) -> List[int]:
+    try:
+        counts = [int(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated signal counts, got '{text}'") from None
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError("signal counts must be positive")
+    return counts
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(description="Benchmark signal polling against a fake PROVEtech:TA server")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Base configuration (grpc, rpc and test sections)")
+    parser.add_argument(
+        "--signals",
+        type=_signal_counts,
+        default=list(DEFAULT_SIGNAL_COUNTS),
+        help="Comma separated numbers of monitored signals, one run each",
+    )
+    parser.add_argument("--seconds", type=float, default=5.0, help="Monitoring time per run")
+    parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=0.01, help="Seconds between ticks")
+    parser.add_argument("--schedule", choices=SCHEDULE_MODES, default="fixed-rate", help="Tick schedule")
+    parser.add_argument("--overrun-policy", dest="overrun_policy", choices=OVERRUN_POLICIES, default="skip")
+    parser.add_argument(
+        "--stop-detection", dest="stop_detection", choices=("tick", "poll"), default="tick", help="How the end of the run is checked"
+    )
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use the asyncio controller")
+    parser.add_argument("--latency-ms", dest="latency_ms", type=float, default=0.0, help="Server latency of every RPC")
+    parser.add_argument("--jitter-ms", dest="jitter_ms", type=float, default=0.0, help="Standard deviation of the server latency")
+    parser.add_argument("--failure-rate", dest="failure_rate", type=float, default=0.0, help="Fraction of failing GetSignal calls")
+    parser.add_argument(
+        "--signal-kind", dest="signal_kind", type=str, default="sine", help="Generator of the signals, e.g. sine or array:64"
+    )
+    parser.add_argument("--seed", type=int, help="Seed of the server's random draws")
+    parser.add_argument("--output", type=str, help="Write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the polling benchmark."""
+
+    args = parse_arguments(argv)
+    # Every run ends on the duration limit, which the controller logs as a warning.
+    logging.basicConfig(level=logging.ERROR, format="%(levelname)s %(message)s")
+    logger = logging.getLogger("automation.benchmark")
+    try:
+        load_configuration(Path(args.config))
+    except ConfigurationError as exc:
+        print(f"Configuration error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        server, port = start_server(args)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="benchmark-") as directory:
+            for count in args.signals:
+                config = load_configuration(Path(args.config))
+                config.grpc.host = "127.0.0.1"
+                config.grpc.port = port
+                config.test.log_signals = signal_names(count)
+                config.test.signal_cache = None
+                config.test.output_dir = Path(directory) / f"signals-{count}"
+                config.test.output_dir.mkdir()
+                results.append(run_case(config, args, logger))
+    except Exception as exc:
+        print(f"Benchmark failed: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        server.terminate()
+        server.wait()
+    print_table(results)
+    if args.output:
+        report = {
+            "controller": "async" if args.use_async else "sync",
+            "seconds": args.seconds,
+            "poll_interval_s": args.poll_interval,
+            "schedule": args.schedule,
+            "server": {
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "failure_rate": args.failure_rate,
+                "signal_kind": args.signal_kind,
+            },
+            "config": args.config,
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
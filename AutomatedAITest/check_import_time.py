@@ -0,0 +1,133 @@
+"""Import-time regression check for automate_test.py.
+
+Runs ``python -X importtime -c "import automate_test"`` several times and
+fails when the fastest run exceeds the budget or when a dependency that must
+load lazily (see ``utils.lazy_import``) was imported eagerly. Run it after
+changing imports, e.g. ``python check_import_time.py --budget-ms 80``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+DEFAULT_MODULE = "automate_test"
+DEFAULT_BUDGET_MS = 100.0
+DEFAULT_RUNS = 5
+
+# Heavy dependencies that only load on first use.
+DEFERRED_MODULES = (
+    "asyncio",
+    "grpc",
+    "numpy",
+    "pandas",
+    "pyarrow",
+    "google.protobuf.descriptor_pool",
+)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int, int]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns ``(name, depth, self_us, cumulative_us)`` for every module the
+    interpreter imported, in the order of ``-X importtime``.
+    """
+
+    env = dict(os.environ)
+    # Bytecode must be cached, otherwise compilation dominates the timings.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr.strip()}")
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return imports
+
+
+def eager_imports(imports: Sequence[Tuple[str, int, int, int]]) -> List[str]:
+    """Return the deferred modules that appear in ``imports``."""
+
+    names = {name for name, _, _, _ in imports}
+    return [
+        deferred
+        for deferred in DEFERRED_MODULES
+        if any(name == deferred or name.startswith(deferred + ".") for name in names)
+    ]
+
+
+def check(module: str, budget_ms: float, runs: int, top: int) -> int:
+    measure_imports(module)  # warm-up run that writes the bytecode caches
+    totals: Dict[int, List[Tuple[str, int, int, int]]] = {}
+    for _ in range(runs):
+        imports = measure_imports(module)
+        total_us = next(cumulative for name, _, _, cumulative in imports if name == module)
+        totals[total_us] = imports
+
+    fastest = min(totals)
+    imports = totals[fastest]
+    print(
+        f"import {module}: best {fastest / 1000:.1f} ms, "
+        f"median {statistics.median(totals) / 1000:.1f} ms over {runs} runs "
+        f"(budget {budget_ms:.0f} ms)"
+    )
+    print("Slowest modules (self time):")
+    for name, _, self_us, _ in sorted(imports, key=lambda item: item[2], reverse=True)[:top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    failed = False
+    eager = eager_imports(imports)
+    if eager:
+        print(f"FAIL: imported eagerly, load them with lazy_import(): {', '.join(eager)}")
+        failed = True
+    if fastest / 1000 > budget_ms:
+        print(f"FAIL: import time {fastest / 1000:.1f} ms exceeds the {budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(description="Check the import time of automate_test.py")
+    parser.add_argument("--module", type=str, default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument("--budget-ms", dest="budget_ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum import time of the fastest run")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Number of measured runs")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest modules to list")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the import-time check."""
+
+    args = parse_arguments(argv)
+    try:
+        return check(args.module, args.budget_ms, max(args.runs, 1), args.top)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Reconstruct dense signal series from a change-only recording.
+
+Runs with ``encoding.mode: changes`` (or ``--change-only``) write a row only
+when a signal changed. This script reads such a result folder, holds every
+value until its next change and writes one row per sampling interval, by
+default the poll interval of the run, e.g.
+``python densify_signals.py results --interval 0.05 --output-format parquet``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from utils.change_encoding import read_signal_rows, reconstruct_dense
+from utils.sinks import SINK_TYPES, create_sink
+
+
+def load_summary(result_dir: Path) -> Dict[str, Any]:
+    """Read ``result_summary.json``; raises ``ValueError`` unless it describes a change-only file."""
+
+    summary_path = result_dir / "result_summary.json"
+    try:
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Unable to read {summary_path}: {exc}") from None
+    signals = summary.get("signals") or {}
+    if (signals.get("encoding") or {}).get("mode") != "changes" or not signals.get("file"):
+        raise ValueError(f"{summary_path} does not describe a change-only signal file")
+    return summary
+
+
+def densify(
+    result_dir: Path,
+    interval_s: Optional[float] = None,
+    output_format: Optional[str] = None,
+    basename: str = "signals_dense",
+) -> Dict[str, Any]:
+    """Write the dense series of ``result_dir`` next to the change file; return its description."""
+
+    summary = load_summary(result_dir)
+    signals = summary["signals"]
+    interval_s = interval_s or (summary.get("metadata", {}).get("sampling") or {}).get("interval_s")
+    if not interval_s:
+        raise ValueError("The run recorded no sampling interval; pass --interval")
+    names = [name for name in signals["columns"] if name != "timestamp"]
+    rows = read_signal_rows(result_dir / signals["file"], signals["format"])
+    sink = create_sink(output_format or signals["format"], result_dir, ["timestamp", *names], basename=basename, fsync=False)
+    try:
+        for row in reconstruct_dense(rows, names, float(interval_s)):
+            sink.write(row)
+    finally:
+        sink.close()
+    description = sink.describe()
+    description["interval_s"] = float(interval_s)
+    return description
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(description="Reconstruct dense signal series from a change-only recording")
+    parser.add_argument("result_dir", type=str, help="Result folder holding result_summary.json")
+    parser.add_argument("--interval", type=float, help="Seconds between reconstructed rows (default: the poll interval of the run)")
+    parser.add_argument("--output-format", dest="output_format", choices=sorted(SINK_TYPES), help="Format of the dense file (default: that of the change file)")
+    parser.add_argument("--basename", type=str, default="signals_dense", help="File name of the dense series without suffix")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the dense reconstruction."""
+
+    args = parse_arguments(argv)
+    if args.interval is not None and args.interval <= 0:
+        print("--interval must be positive", file=sys.stderr)
+        return 1
+    try:
+        description = densify(Path(args.result_dir), args.interval, args.output_format, args.basename)
+    except ImportError as exc:
+        print(f"Output format requires an optional package: {exc}", file=sys.stderr)
+        return 1
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    print(
+        f"{description['sample_count']} rows every {description['interval_s']}s written to "
+        f"{Path(args.result_dir) / description['file']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
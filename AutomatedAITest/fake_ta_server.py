@@ -0,0 +1,540 @@
+"""Local stand-in for the PROVEtech:TA gRPC server.
+
+The controller can only be exercised against a real PROVEtech:TA, which makes
+changes to the polling loop hard to measure. :class:`FakeTaServer` serves every
+unary RPC of the ``System``, ``Measure``, ``Application`` and ``Evaluation``
+services declared in ``testautomation.proto`` from the same descriptors the
+client uses, with a configurable latency, jitter and failure rate per RPC.
+``System.GetSignal`` answers with synthetic signals (see
+:data:`SIGNAL_KINDS`), ``GetValidSignalList`` accepts every name, and a
+measurement runs from ``Measure.Start`` until ``Measure.Stop`` or for
+``duration_s`` seconds. A measurement started with ``bSaveToDisk`` records the
+signals registered through ``Measure.SetSignals`` at ``record_rate_hz``;
+``Measure.SaveFile`` stores it under the given file name, which the
+``Evaluation`` object of ``Application.GetObject`` opens and reads back from
+the same generators. Other RPCs return an empty reply, with ``RetVal`` set
+when it is a success flag.
+
+It runs in-process (``with FakeTaServer(...) as server``) or standalone::
+
+    python fake_ta_server.py --port 50051 --latency GetSignal=2:0.5 \\
+        --fail GetSignal=0.01:UNAVAILABLE --signal IconDetection.Boxes=array:16
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import threading
+import time
+import zlib
+from concurrent import futures
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import grpc
+
+from testautomation_pb2 import loader
+
+SERVED_SERVICES = ("System", "Measure", "Application", "Evaluation")
+
+# sine, ramp: double with period ``period_s``; toggle: 0/1 flipping every half
+# period; counter: number of reads of the signal; random: uniform double;
+# label: string cycling through LABELS every period; array, int_array:
+# ``length`` values per reply.
+SIGNAL_KINDS = ("sine", "ramp", "toggle", "counter", "random", "label", "array", "int_array")
+
+LABELS = ("none", "car", "person", "true", "1")
+
+# Reply field of each kind; recordings store the first array element and the label index.
+_SIGNAL_FIELDS = {
+    "sine": "RetVal_double",
+    "ramp": "RetVal_double",
+    "toggle": "RetVal_int64",
+    "counter": "RetVal_int64",
+    "random": "RetVal_double",
+    "label": "RetVal_string",
+    "array": "RetVal_doublearray",
+    "int_array": "RetVal_int64array",
+}
+
+# Samples per second of recorded signals.
+DEFAULT_RECORD_RATE_HZ = 100.0
+
+# Separator of signal names in Measure.SetSignals, as used by the controller.
+SIGNAL_LIST_SEPARATOR = ";"
+
+# Enough handler threads for a tick of 500 concurrent GetSignal requests.
+DEFAULT_WORKERS = 128
+
+# Key of the behaviour applied to RPCs without one of their own.
+ANY_RPC = "*"
+
+
+@dataclass(frozen=True)
+class RpcBehaviour:
+    """Simulated cost and reliability of an RPC.
+
+    Each call waits ``latency_ms`` plus normally distributed noise with the
+    standard deviation ``jitter_ms``, then fails with ``failure_code`` (a
+    ``grpc.StatusCode`` name) with probability ``failure_rate``.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    failure_code: str = "UNAVAILABLE"
+
+    def __post_init__(self) -> None:
+        if self.latency_ms < 0 or self.jitter_ms < 0:
+            raise ValueError("Latency and jitter must not be negative")
+        if not 0.0 <= self.failure_rate <= 1.0:
+            raise ValueError(f"Failure rate must be between 0 and 1, got {self.failure_rate}")
+        if not hasattr(grpc.StatusCode, self.failure_code) or self.failure_code == "OK":
+            raise ValueError(f"Unknown gRPC failure status: {self.failure_code}")
+
+
+@dataclass(frozen=True)
+class SignalGenerator:
+    """Synthetic values of one signal; see :data:`SIGNAL_KINDS`."""
+
+    kind: str = "sine"
+    period_s: float = 1.0
+    length: int = 8
+
+    def __post_init__(self) -> None:
+        if self.kind not in SIGNAL_KINDS:
+            raise ValueError(f"Unknown signal kind '{self.kind}' (expected one of {', '.join(SIGNAL_KINDS)})")
+        if self.period_s <= 0 or self.length < 0:
+            raise ValueError("Signal period must be positive and array length not negative")
+
+    def value(self, elapsed_s: float, reads: int, rng: random.Random) -> Any:
+        """Value of a read ``elapsed_s`` into the measurement; a list for array kinds."""
+
+        phase = elapsed_s / self.period_s
+        if self.kind == "sine":
+            return math.sin(2.0 * math.pi * phase)
+        if self.kind == "ramp":
+            return phase % 1.0
+        if self.kind == "toggle":
+            return int(2.0 * phase) % 2
+        if self.kind == "counter":
+            return reads
+        if self.kind == "random":
+            return rng.random()
+        if self.kind == "label":
+            return LABELS[int(phase) % len(LABELS)]
+        if self.kind == "array":
+            step = 2.0 * math.pi / max(self.length, 1)
+            return [math.sin(2.0 * math.pi * phase + index * step) for index in range(self.length)]
+        return [reads + index for index in range(self.length)]
+
+    def fill(self, reply: Any, elapsed_s: float, reads: int, rng: random.Random) -> None:
+        """Set the value of ``reply`` for a read ``elapsed_s`` into the measurement."""
+
+        value = self.value(elapsed_s, reads, rng)
+        field = _SIGNAL_FIELDS[self.kind]
+        if isinstance(value, list):
+            getattr(reply, field).arr.extend(value)
+        else:
+            setattr(reply, field, value)
+
+    def recorded(self, sample: int, rate_hz: float, rng: random.Random) -> Tuple[str, float]:
+        """Value array field and value of recorded sample ``sample``."""
+
+        value = self.value(sample / rate_hz, sample + 1, rng)
+        if self.kind == "label":
+            return "int64array", LABELS.index(value)
+        if isinstance(value, list):
+            value = value[0] if value else 0
+        return ("int64array" if isinstance(value, int) else "doublearray"), value
+
+
+def parse_signal_generator(text: str) -> SignalGenerator:
+    """Parse ``KIND[:PARAM]``; ``PARAM`` is the period in seconds or the array length."""
+
+    kind, _, parameter = text.partition(":")
+    kind = kind.strip().lower()
+    if not parameter:
+        return SignalGenerator(kind)
+    try:
+        if kind in ("array", "int_array"):
+            return SignalGenerator(kind, length=int(parameter))
+        return SignalGenerator(kind, period_s=float(parameter))
+    except ValueError as exc:
+        raise ValueError(f"Invalid signal generator '{text}': {exc}") from None
+
+
+class FakeTaServer:
+    """gRPC server imitating the PROVEtech:TA services used by the controller.
+
+    ``behaviours`` maps RPC names (``GetSignal``, ``Measure.Start`` or
+    :data:`ANY_RPC`) to :class:`RpcBehaviour`; the most specific entry
+    applies. ``signals`` maps signal names to generators and
+    ``default_signal`` serves every other name. ``port=0`` picks a free port,
+    returned by :meth:`start`. :meth:`statistics` counts the calls and
+    injected failures per RPC. Recordings only hold the signals registered
+    before the measurement started; any other signal reports a sampling rate
+    of 0 when a recording is read back.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        behaviours: Optional[Mapping[str, RpcBehaviour]] = None,
+        signals: Optional[Mapping[str, SignalGenerator]] = None,
+        default_signal: SignalGenerator = SignalGenerator(),
+        duration_s: float = 0.0,
+        workers: int = DEFAULT_WORKERS,
+        seed: Optional[int] = None,
+        record_rate_hz: float = DEFAULT_RECORD_RATE_HZ,
+    ) -> None:
+        if record_rate_hz <= 0:
+            raise ValueError("Recording rate must be positive")
+        self.host = host
+        self.port = port
+        self.behaviours = dict(behaviours or {})
+        self.signals = dict(signals or {})
+        self.default_signal = default_signal
+        self.duration_s = duration_s
+        self.workers = workers
+        self.record_rate_hz = record_rate_hz
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict[str, int]] = {}
+        self._reads: Dict[str, int] = {}
+        self._started_at: Optional[float] = None
+        self._stopped = True
+        self._server: Optional[grpc.Server] = None
+        # Signals registered for recording, the running recording and the saved ones by file name.
+        self._record_signals: Tuple[str, ...] = ()
+        self._recording: Optional[Tuple[str, ...]] = None
+        self._recorded_s = 0.0
+        self._recordings: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+        self._objects: Dict[int, Optional[str]] = {}
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self) -> int:
+        """Start serving and return the bound port."""
+
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=self.workers))
+        server.add_generic_rpc_handlers(
+            [self._service_handler(name) for name in SERVED_SERVICES]
+        )
+        port = server.add_insecure_port(f"{self.host}:{self.port}")
+        if port == 0:
+            raise OSError(f"Unable to bind the fake PROVEtech:TA server to {self.endpoint}")
+        server.start()
+        self.port = port
+        self._server = server
+        return port
+
+    def stop(self, grace_s: Optional[float] = None) -> None:
+        if self._server is not None:
+            self._server.stop(grace_s).wait()
+            self._server = None
+
+    def wait(self) -> None:
+        if self._server is not None:
+            self._server.wait_for_termination()
+
+    def __enter__(self) -> "FakeTaServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def statistics(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counts) for name, counts in sorted(self._calls.items())}
+
+    def behaviour(self, service: str, method: str) -> RpcBehaviour:
+        for key in (f"{service}.{method}", method, ANY_RPC):
+            behaviour = self.behaviours.get(key)
+            if behaviour is not None:
+                return behaviour
+        return RpcBehaviour()
+
+    def _service_handler(self, service_name: str) -> Any:
+        service = loader.service_descriptor(service_name)
+        handlers = {}
+        for method in service.methods:
+            if method.client_streaming or method.server_streaming:
+                continue
+            request = loader.message_class(method.input_type.name)
+            reply = loader.message_class(method.output_type.name)
+            handler = getattr(self, f"_{service_name}_{method.name}", None) or _default_reply(reply)
+            handlers[method.name] = grpc.unary_unary_rpc_method_handler(
+                self._simulated(service_name, method.name, handler, reply),
+                request_deserializer=request.FromString,
+                response_serializer=reply.SerializeToString,
+            )
+        return grpc.method_handlers_generic_handler(service.full_name, handlers)
+
+    def _simulated(
+        self, service: str, method: str, handler: Callable[[Any, type], Any], reply: type
+    ) -> Callable[[Any, grpc.ServicerContext], Any]:
+        behaviour = self.behaviour(service, method)
+        name = f"{service}.{method}"
+
+        def serve(request: Any, context: grpc.ServicerContext) -> Any:
+            with self._lock:
+                counts = self._calls.setdefault(name, {"calls": 0, "failures": 0})
+                counts["calls"] += 1
+                delay_ms = behaviour.latency_ms
+                if behaviour.jitter_ms:
+                    delay_ms += self._rng.gauss(0.0, behaviour.jitter_ms)
+                failed = behaviour.failure_rate > 0 and self._rng.random() < behaviour.failure_rate
+                if failed:
+                    counts["failures"] += 1
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000.0)
+            if failed:
+                context.abort(getattr(grpc.StatusCode, behaviour.failure_code), f"injected failure of {name}")
+            return handler(request, reply)
+
+        return serve
+
+    def _elapsed_s(self) -> float:
+        return 0.0 if self._started_at is None else time.monotonic() - self._started_at
+
+    def _is_running(self) -> bool:
+        if self._stopped:
+            return False
+        if self.duration_s and self._elapsed_s() >= self.duration_s:
+            self._stop_measurement()
+        return not self._stopped
+
+    def _stop_measurement(self) -> None:
+        if not self._stopped:
+            elapsed_s = self._elapsed_s()
+            self._recorded_s = min(elapsed_s, self.duration_s) if self.duration_s else elapsed_s
+        self._stopped = True
+
+    def _Measure_SetSignals(self, request: Any, reply: type) -> Any:
+        names = (name.strip() for name in request.strSignalList.split(SIGNAL_LIST_SEPARATOR))
+        self._record_signals = tuple(name for name in names if name)
+        return reply(RetVal=True)
+
+    def _Measure_Start(self, request: Any, reply: type) -> Any:
+        with self._lock:
+            self._started_at = time.monotonic()
+            self._stopped = False
+            self._reads.clear()
+            self._recording = self._record_signals if request.bSaveToDisk else None
+            self._recorded_s = 0.0
+        return reply(RetVal=True)
+
+    def _Measure_Stop(self, request: Any, reply: type) -> Any:
+        self._stop_measurement()
+        return reply(RetVal=True)
+
+    def _Measure_SaveFile(self, request: Any, reply: type) -> Any:
+        saved = self._recording is not None and self._stopped
+        if saved:
+            self._recordings[request.strFileName] = (self._recording, self._recorded_s)
+        return reply(RetVal=saved)
+
+    def _Application_GetObject(self, request: Any, reply: type) -> Any:
+        with self._lock:
+            object_id = len(self._objects) + 1
+            self._objects[object_id] = None
+        return reply(RetVal=object_id)
+
+    def _Application_ReleaseObject(self, request: Any, reply: type) -> Any:
+        self._objects.pop(request.ObjectId, None)
+        return reply()
+
+    def _Evaluation_Open(self, request: Any, reply: type) -> Any:
+        opened = request.ObjectId in self._objects and request.strFileName in self._recordings
+        if opened:
+            self._objects[request.ObjectId] = request.strFileName
+        return reply(RetVal=opened)
+
+    def _Evaluation_Close(self, request: Any, reply: type) -> Any:
+        opened = self._objects.get(request.ObjectId) is not None
+        if opened:
+            self._objects[request.ObjectId] = None
+        return reply(RetVal=opened)
+
+    def _recorded(self, object_id: int, name: str) -> Tuple[bool, int]:
+        """Whether ``name`` is part of the recording opened by ``object_id``, and its sample count."""
+
+        file_name = self._objects.get(object_id)
+        if file_name is None:
+            return False, 0
+        names, duration_s = self._recordings[file_name]
+        if name not in names:
+            return False, 0
+        return True, int(duration_s * self.record_rate_hz)
+
+    def _Evaluation_GetSampleCount(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=self._recorded(request.ObjectId, request.vSignalOrGroup_string)[1])
+
+    def _Evaluation_GetSamplingRate(self, request: Any, reply: type) -> Any:
+        recorded, _ = self._recorded(request.ObjectId, request.vSignalOrGroup_string)
+        return reply(RetVal=self.record_rate_hz if recorded else 0.0)
+
+    def _Evaluation_GetStartTime(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=0.0)
+
+    def _Evaluation_GetSignalArray(self, request: Any, reply: type) -> Any:
+        message = reply()
+        for name in request.strSignalList.split(SIGNAL_LIST_SEPARATOR):
+            recorded, count = self._recorded(request.ObjectId, name)
+            if not recorded:
+                return message
+            generator = self.signals.get(name, self.default_signal)
+            first = max(request.lStartSample, 0)
+            last = min(first + max(request.lSampleCount, 0), count)
+            with self._lock:
+                samples = [generator.recorded(sample, self.record_rate_hz, self._rng) for sample in range(first, last)]
+            values = message.paValues.add()
+            field = samples[0][0] if samples else "doublearray"
+            getattr(values, field).arr.extend(value for _, value in samples)
+        message.RetVal = True
+        return message
+
+    def _Measure_IsRunning(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=self._is_running())
+
+    def _System_GetSignal(self, request: Any, reply: type) -> Any:
+        name = request.strSignalName
+        with self._lock:
+            reads = self._reads[name] = self._reads.get(name, 0) + 1
+        message = reply()
+        self.signals.get(name, self.default_signal).fill(message, self._elapsed_s(), reads, self._rng)
+        return message
+
+    def _System_GetValidSignalList(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=request.strSignalList)
+
+    def _System_GetSignalInfo(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=zlib.crc32(request.strSignalName.encode("utf-8")))
+
+    def _System_GetVersion(self, request: Any, reply: type) -> Any:
+        return reply(RetVal="fake", plMajor=0, plMinor=0)
+
+    def _System_GetResult(self, request: Any, reply: type) -> Any:
+        return reply(RetVal=1)
+
+
+def _default_reply(reply: type) -> Callable[[Any, type], Any]:
+    field = reply.DESCRIPTOR.fields_by_name.get("RetVal")
+    if field is not None and field.type == field.TYPE_BOOL:
+        return lambda request, reply: reply(RetVal=True)
+    return lambda request, reply: reply()
+
+
+def _assignment(text: str, option: str) -> Tuple[str, str]:
+    name, separator, value = text.partition("=")
+    if not separator or not name.strip() or not value.strip():
+        raise ValueError(f"{option} expects NAME=VALUE, got '{text}'")
+    return name.strip(), value.strip()
+
+
+def parse_behaviours(latencies: Sequence[str], failures: Sequence[str]) -> Dict[str, RpcBehaviour]:
+    """Combine ``RPC=MEAN_MS[:JITTER_MS]`` and ``RPC=RATE[:STATUS]`` options per RPC."""
+
+    settings: Dict[str, Dict[str, Any]] = {}
+    try:
+        for text in latencies:
+            name, value = _assignment(text, "--latency")
+            mean, _, jitter = value.partition(":")
+            settings.setdefault(name, {}).update(
+                latency_ms=float(mean), jitter_ms=float(jitter or 0.0)
+            )
+        for text in failures:
+            name, value = _assignment(text, "--fail")
+            rate, _, code = value.partition(":")
+            entry = settings.setdefault(name, {})
+            entry["failure_rate"] = float(rate)
+            if code:
+                entry["failure_code"] = code.upper()
+        return {name: RpcBehaviour(**entry) for name, entry in settings.items()}
+    except ValueError as exc:
+        raise ValueError(f"Invalid RPC behaviour: {exc}") from None
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(description="Serve a fake PROVEtech:TA gRPC API for local runs")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=50051, help="Port to listen on (0 picks a free one)")
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="RPC=MS[:JITTER]",
+        help=f"Delay of an RPC such as GetSignal or Measure.IsRunning ('{ANY_RPC}' for all); repeatable",
+    )
+    parser.add_argument(
+        "--fail",
+        action="append",
+        default=[],
+        metavar="RPC=RATE[:STATUS]",
+        help="Fraction of calls of an RPC failing with a gRPC status (default UNAVAILABLE); repeatable",
+    )
+    parser.add_argument(
+        "--signal",
+        action="append",
+        default=[],
+        metavar="NAME=KIND[:PARAM]",
+        help=f"Generator of a signal, KIND one of {', '.join(SIGNAL_KINDS)}; repeatable",
+    )
+    parser.add_argument(
+        "--default-signal", type=str, default="sine", metavar="KIND[:PARAM]", help="Generator of all other signals"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=0.0, help="Seconds a measurement runs before stopping by itself (0: until Stop)"
+    )
+    parser.add_argument(
+        "--record-rate", type=float, default=DEFAULT_RECORD_RATE_HZ, help="Samples per second of recorded signals"
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Server handler threads")
+    parser.add_argument("--seed", type=int, help="Seed of the jitter, failure and random signal draws")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the fake PROVEtech:TA server."""
+
+    args = parse_arguments(argv)
+    try:
+        signals = {}
+        for text in args.signal:
+            name, value = _assignment(text, "--signal")
+            signals[name] = parse_signal_generator(value)
+        server = FakeTaServer(
+            host=args.host,
+            port=args.port,
+            behaviours=parse_behaviours(args.latency, args.fail),
+            signals=signals,
+            default_signal=parse_signal_generator(args.default_signal),
+            duration_s=args.duration,
+            workers=args.workers,
+            seed=args.seed,
+            record_rate_hz=args.record_rate,
+        )
+        server.start()
+    except (ValueError, OSError) as exc:
+        print(f"Fake PROVEtech:TA server error: {exc}", file=sys.stderr)
+        return 1
+    # The first output line is read by benchmark.py to find the port.
+    print(f"Listening on {server.endpoint}", flush=True)
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
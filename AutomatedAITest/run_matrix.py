@@ -0,0 +1,289 @@
+"""Run a matrix of AutomatedAITest cases in parallel across several PROVEtech:TA rigs."""
+from __future__ import annotations
+
+import argparse
+import json
+import queue
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from automate_test import (
+    ConfigurationError,
+    TestCase,
+    _load_yaml,
+    _string_list,
+    load_configuration,
+    parse_test_cases,
+)
+from utils.logger import log_context, setup_logging
+
+AUTOMATE_SCRIPT = Path(__file__).with_name("automate_test.py")
+
+# Exit codes returned by ``automate_test.main``.
+CASE_STATUSES = {0: "completed", 1: "failed", 2: "interrupted"}
+
+
+@dataclass
+class Rig:
+    """A PROVEtech:TA gRPC endpoint that runs one case at a time."""
+
+    host: str
+    port: int
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+@dataclass
+class TestMatrix:
+    """Rigs, cases and shared options of a matrix run."""
+
+    rigs: List[Rig]
+    cases: List[TestCase]
+    output_dir: Path
+    config: Optional[Path] = None
+    args: List[str] = field(default_factory=list)
+
+
+def _parse_rig(entry: Any) -> Rig:
+    if isinstance(entry, dict):
+        return Rig(host=str(entry.get("host", "localhost")), port=int(entry.get("port", 50051)))
+    host, separator, port = str(entry).rpartition(":")
+    if not separator or not port.isdigit():
+        raise ConfigurationError(f"Invalid endpoint '{entry}', expected host:port")
+    return Rig(host=host, port=int(port))
+
+
+def load_matrix(matrix_path: Path) -> TestMatrix:
+    """Load and validate a matrix definition file."""
+
+    if not matrix_path.exists():
+        raise ConfigurationError(f"Matrix file not found: {matrix_path}")
+    raw = _load_yaml(matrix_path)
+    endpoints = raw.get("endpoints") or []
+    if not isinstance(endpoints, list) or not endpoints:
+        raise ConfigurationError("The matrix defines no endpoints")
+
+    matrix = TestMatrix(
+        rigs=[_parse_rig(entry) for entry in endpoints],
+        cases=parse_test_cases(raw.get("cases")),
+        output_dir=Path(str(raw.get("output_dir", "./results/matrix"))),
+        config=Path(str(raw["config"])) if raw.get("config") else None,
+        args=_string_list(raw.get("args"), "args"),
+    )
+    # Validate the configuration and every override set once, before the
+    # cases start; this also leaves the compiled snapshot for the case processes.
+    config_path = matrix.config or AUTOMATE_SCRIPT.with_name("config.yaml")
+    for override in sorted({case.override for case in matrix.cases}, key=str):
+        load_configuration(config_path, override)
+    return matrix
+
+
+def case_command(
+    matrix: TestMatrix,
+    case: TestCase,
+    rig: Rig,
+    case_dir: Path,
+    extra_args: Sequence[str],
+    run_id: Optional[str] = None,
+) -> List[str]:
+    """Build the ``automate_test.py`` command line of one case on one rig.
+
+    ``run_id`` is stamped, with the case id, on the log records of the case.
+    """
+
+    command = [
+        sys.executable,
+        str(AUTOMATE_SCRIPT),
+        "--grpc-host",
+        rig.host,
+        "--grpc-port",
+        str(rig.port),
+        "--output-dir",
+        str(case_dir),
+        "--log-file",
+        str(case_dir / "automation.log"),
+    ]
+    if matrix.config is not None:
+        command += ["--config", str(matrix.config)]
+    if run_id:
+        command += ["--run-id", run_id, "--case-id", case.case_id]
+    return command + matrix.args + case.arguments() + list(extra_args)
+
+
+class MatrixRunner:
+    """Distribute matrix cases over the rigs, one running case per rig.
+
+    Each case runs ``automate_test.py`` in its own process so that logging,
+    gRPC channels and launched executables stay isolated. Free rigs are
+    handed out through a queue, so a rig picks up the next pending case as
+    soon as its previous case finished.
+    """
+
+    def __init__(self, matrix: TestMatrix, extra_args: Sequence[str], logger) -> None:
+        self.matrix = matrix
+        self.extra_args = list(extra_args)
+        self.logger = logger
+        # Shared by the log records of the matrix and of all its cases.
+        self.run_id = log_context(logger).run_id
+        self.output_dir = matrix.output_dir.expanduser().resolve()
+        self._free_rigs: "queue.Queue[Rig]" = queue.Queue()
+        for rig in matrix.rigs:
+            self._free_rigs.put(rig)
+
+    def run(self) -> Dict[str, Any]:
+        """Run every case and return the aggregated summary."""
+
+        started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+        self.logger.info(
+            "Running %d cases on %d rigs", len(self.matrix.cases), len(self.matrix.rigs)
+        )
+        with ThreadPoolExecutor(
+            max_workers=len(self.matrix.rigs), thread_name_prefix="rig"
+        ) as executor:
+            results = list(executor.map(self._run_case, self.matrix.cases))
+        return self._summary(results, started_at, time.monotonic() - started)
+
+    def _run_case(self, case: TestCase) -> Dict[str, Any]:
+        rig = self._free_rigs.get()
+        try:
+            return self._execute(case, rig)
+        finally:
+            self._free_rigs.put(rig)
+
+    def _execute(self, case: TestCase, rig: Rig) -> Dict[str, Any]:
+        case_dir = self.output_dir / case.case_id
+        case_dir.mkdir(parents=True, exist_ok=True)
+        command = case_command(self.matrix, case, rig, case_dir, self.extra_args, self.run_id)
+        self.logger.info("Case %s started on %s", case.case_id, rig.endpoint)
+        started = time.monotonic()
+        with (case_dir / "console.log").open("wb") as console:
+            try:
+                exit_code = subprocess.run(
+                    command, stdout=console, stderr=subprocess.STDOUT, check=False
+                ).returncode
+            except OSError as exc:
+                self.logger.error("Case %s could not be started: %s", case.case_id, exc)
+                exit_code = -1
+        duration = time.monotonic() - started
+        status = CASE_STATUSES.get(exit_code, "error")
+        log = self.logger.info if exit_code == 0 else self.logger.error
+        log(
+            "Case %s %s on %s after %.1fs (exit code %d)",
+            case.case_id,
+            status,
+            rig.endpoint,
+            duration,
+            exit_code,
+        )
+        return {
+            "case": case.case_id,
+            "endpoint": rig.endpoint,
+            "model": case.model,
+            "video_source": case.video_source,
+            "resolution": case.resolution,
+            "status": status,
+            "exit_code": exit_code,
+            "duration_s": round(duration, 3),
+            "output_dir": case.case_id,
+            "result": self._case_result(case_dir),
+        }
+
+    @staticmethod
+    def _case_result(case_dir: Path) -> Optional[Dict[str, Any]]:
+        try:
+            summary = json.loads((case_dir / "result_summary.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        metadata = summary.get("metadata", {})
+        return {
+            "result": metadata.get("result"),
+            "sample_count": summary.get("signals", {}).get("sample_count"),
+        }
+
+    def _summary(
+        self, results: List[Dict[str, Any]], started_at: datetime, duration: float
+    ) -> Dict[str, Any]:
+        rigs = []
+        for rig in self.matrix.rigs:
+            rig_results = [result for result in results if result["endpoint"] == rig.endpoint]
+            busy = sum(result["duration_s"] for result in rig_results)
+            rigs.append(
+                {
+                    "endpoint": rig.endpoint,
+                    "cases": len(rig_results),
+                    "busy_s": round(busy, 3),
+                    "utilization": round(busy / duration, 3) if duration > 0 else None,
+                }
+            )
+        statuses = [result["status"] for result in results]
+        return {
+            "run_id": self.run_id,
+            "started_at": started_at.isoformat(),
+            "duration_s": round(duration, 3),
+            "totals": {
+                "cases": len(results),
+                **{status: statuses.count(status) for status in sorted(set(statuses))},
+            },
+            "rigs": rigs,
+            "cases": results,
+        }
+
+
+def parse_arguments(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse CLI arguments."""
+
+    parser = argparse.ArgumentParser(
+        description="Run a test matrix across several PROVEtech:TA rigs",
+        epilog="Arguments after '--' are passed to every automate_test.py invocation.",
+    )
+    parser.add_argument("matrix", type=str, help="Path to the matrix YAML file")
+    parser.add_argument("--output-dir", dest="output_dir", type=str, help="Directory for the per-case results and the summary")
+    parser.add_argument("--log-level", dest="log_level", type=str, default="INFO", help="Logging level of the matrix runner")
+    parser.add_argument("automate_args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.automate_args[:1] == ["--"]:
+        args.automate_args = args.automate_args[1:]
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point for the matrix runner."""
+
+    args = parse_arguments(argv)
+    try:
+        matrix = load_matrix(Path(args.matrix))
+    except ConfigurationError as exc:
+        print(f"Invalid matrix: {exc}", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        matrix.output_dir = Path(args.output_dir)
+
+    logger = setup_logging(
+        args.log_level,
+        matrix.output_dir.expanduser().resolve() / "matrix.log",
+        logger_name="AutomatedAITest.Matrix",
+    )
+    runner = MatrixRunner(matrix, args.automate_args, logger)
+    try:
+        summary = runner.run()
+    except KeyboardInterrupt:
+        runner.logger.warning("Matrix run interrupted by user")
+        return 2
+
+    summary_path = runner.output_dir / "matrix_summary.json"
+    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    runner.logger.info("Matrix summary written to %s", summary_path)
+    return 0 if summary["totals"].get("completed") == len(matrix.cases) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Make the runner modules importable as they are from the script directory."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
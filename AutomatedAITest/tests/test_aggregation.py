@@ -0,0 +1,32 @@
+"""Streaming quantile estimates."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from utils.aggregation import P2Quantile
+
+
+def test_first_observations_are_exact():
+    estimator = P2Quantile(0.5)
+    assert estimator.value() is None
+    for value in (5.0, 1.0, 3.0):
+        estimator.observe(value)
+    assert estimator.value() == 3.0
+
+
+@pytest.mark.parametrize("q", [0.1, 0.5, 0.9, 0.99])
+def test_estimate_tracks_the_quantile(q):
+    rng = random.Random(7)
+    values = [rng.gauss(10.0, 2.0) for _ in range(20000)]
+    estimator = P2Quantile(q)
+    for value in values:
+        estimator.observe(value)
+    exact = sorted(values)[int(q * len(values))]
+    assert estimator.value() == pytest.approx(exact, abs=0.1)
+
+
+def test_quantile_must_be_inside_the_unit_interval():
+    with pytest.raises(ValueError):
+        P2Quantile(1.0)
@@ -0,0 +1,51 @@
+"""Change-only encoding and trigger capture windows."""
+from __future__ import annotations
+
+from utils.change_encoding import ChangeEncoder, read_signal_rows, reconstruct_dense
+from utils.sinks import create_sink
+from utils.trigger_capture import CAPTURE_COLUMN, TriggerCapture, parse_trigger
+
+SECOND = 1_000_000_000
+START = 1_700_000_000 * SECOND
+
+
+def test_change_rows_reconstruct_the_dense_signal(tmp_path):
+    sink = create_sink("ndjson", tmp_path, ["timestamp", "Speed", "Label"])
+    encoder = ChangeEncoder(sink, deadband=0.5)
+    dense = [
+        {"timestamp": START + tick * SECOND, "Speed": speed, "Label": label}
+        for tick, (speed, label) in enumerate(
+            [(1.0, "none"), (1.2, "none"), (2.0, "car"), (2.1, "car"), (2.1, "none")]
+        )
+    ]
+    for row in dense:
+        encoder.write(dict(row))
+    encoder.close()
+
+    changes = list(read_signal_rows(sink.path, "ndjson"))
+    # Ticks 1 and 3 change nothing beyond the deadband; the last row closes the run.
+    assert [row["timestamp"] for row in changes] == [START, START + 2 * SECOND, START + 4 * SECOND]
+    rebuilt = list(reconstruct_dense(changes, ["Speed", "Label"], 1.0))
+    assert [row["Label"] for row in rebuilt] == [row["Label"] for row in dense]
+    # Speed stays within the deadband of the written 2.0 after tick 2.
+    assert [row["Speed"] for row in rebuilt] == [1.0, 1.0, 2.0, 2.0, 2.0]
+
+
+def test_trigger_windows_keep_pre_and_post_ticks(tmp_path):
+    sink = create_sink("ndjson", tmp_path, ["timestamp", "Score", CAPTURE_COLUMN])
+    images = []
+    capture = TriggerCapture(
+        sink, [parse_trigger("Score > 0.5")], pre_ticks=2, post_ticks=1, on_trigger=lambda event: images.append(event)
+    )
+    scores = [0.0, 0.1, 0.2, 0.3, 0.9, 0.8, 0.1, 0.0, 0.0, 0.7, 0.0]
+    for tick, score in enumerate(scores):
+        capture.write({"timestamp": START + tick * SECOND, "Score": score})
+    capture.close()
+
+    rows = list(read_signal_rows(sink.path, "ndjson"))
+    assert [((row["timestamp"] - START) // SECOND, row[CAPTURE_COLUMN]) for row in rows] == [
+        (2, 1), (3, 1), (4, 1), (5, 1),
+        (7, 2), (8, 2), (9, 2), (10, 2),
+    ]
+    assert [event["tick"] for event in capture.events] == [4, 9]
+    assert len(images) == 2
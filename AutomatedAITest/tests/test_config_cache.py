@@ -0,0 +1,48 @@
+"""Compiled snapshots of the configuration file."""
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from utils.config_cache import ConfigCache
+
+CONFIG = "test:\n  model_name: M\n"
+
+
+def _parser(directory: Path, body: str):
+    """Import a parser from its own module file, as automate_test provides ``_parse_yaml``."""
+
+    source = directory / "parser.py"
+    source.write_text(f"def parse(text):\n    {body}\n", encoding="utf-8")
+    spec = importlib.util.spec_from_file_location(f"parser_{abs(hash(body))}", source)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.parse
+
+
+def test_unchanged_file_loads_from_the_snapshot(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    parse = _parser(tmp_path, "return {'test': {'model_name': 'M'}}")
+
+    assert ConfigCache(parse).load(config).base == {"test": {"model_name": "M"}}
+    cache = ConfigCache(parse)
+    cache.load(config)
+    assert cache.stats["snapshot"] == 1
+
+
+def test_changed_parser_compiles_again_and_replaces_the_snapshot(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    ConfigCache(_parser(tmp_path, "return {'test': {'model_name': 'M'}}")).load(config)
+    (tmp_path / "__pycache__" / "config.0123456789abcdef.json").write_text("{}", encoding="utf-8")
+    unrelated = tmp_path / "__pycache__" / "config.local.0123456789abcdef.json"
+    unrelated.write_text("{}", encoding="utf-8")
+
+    cache = ConfigCache(_parser(tmp_path, "return {'test': {'model_name': 'N'}}"))
+    snapshot = cache.load(config)
+
+    assert cache.stats["compiled"] == 1
+    assert snapshot.base == {"test": {"model_name": "N"}}
+    snapshots = sorted(p.name for p in (tmp_path / "__pycache__").glob("config.*.json"))
+    assert snapshots == [f"config.{snapshot.digest}.json", unrelated.name]
@@ -0,0 +1,130 @@
+"""Whole runs of automate_test against the fake PROVEtech:TA server."""
+from __future__ import annotations
+
+import csv
+import json
+import math
+
+import pytest
+
+import automate_test
+from fake_ta_server import LABELS, FakeTaServer, SignalGenerator
+from utils.change_encoding import read_signal_rows
+
+SIGNALS = {
+    "IconDetection.Result": SignalGenerator("label", period_s=0.2),
+    "IconDetection.Score": SignalGenerator("sine"),
+    "IconDetection.Boxes": SignalGenerator("array", length=4),
+}
+
+CONFIG = """\
+grpc:
+  host: 127.0.0.1
+  port: {port}
+ai_core:
+  executable: ""
+  config_file: ""
+video:
+  device_name: "FrontCam"
+  driver_id: "cam0"
+  resolution: "640x480"
+test:
+  model_name: "M"
+  output_dir: "{output_dir}"
+  log_signals:
+{signals}
+logging:
+  level: "WARNING"
+  file: "{log_file}"
+"""
+
+
+def _run(tmp_path, server, *options, signals=tuple(SIGNALS)):
+    config = tmp_path / "config.yaml"
+    config.write_text(
+        CONFIG.format(
+            port=server.port,
+            output_dir=tmp_path / "out",
+            log_file=tmp_path / "run.log",
+            signals="\n".join(f'    - "{name}"' for name in signals),
+        ),
+        encoding="utf-8",
+    )
+    return automate_test.main(
+        ["--config", str(config), "--skip-ta-launch", "--no-ai-core-launch", "--poll-interval", "0.02", *options]
+    )
+
+
+@pytest.mark.parametrize("mode", [[], ["--async"]], ids=["sync", "async"])
+def test_live_run_writes_every_tick(tmp_path, mode):
+    with FakeTaServer(signals=SIGNALS, duration_s=0.4) as server:
+        assert _run(tmp_path, server, *mode) == 0
+
+    with (tmp_path / "out" / "signals.csv").open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert rows
+    assert list(rows[0]) == ["timestamp", *SIGNALS]
+    # Labels such as "true" and "1" stay strings in the CSV file.
+    assert {row["IconDetection.Result"] for row in rows} <= set(LABELS)
+    assert all(len(json.loads(row["IconDetection.Boxes"])) == 4 for row in rows)
+    summary = json.loads((tmp_path / "out" / "result_summary.json").read_text(encoding="utf-8"))
+    assert summary["metadata"]["sampling"]["ticks"] >= len(rows)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "npy"])
+def test_checkpointed_change_only_run_keeps_string_signals(tmp_path, output_format):
+    if output_format == "parquet":
+        pytest.importorskip("pyarrow")
+    # Most checkpoint segments start without a change of the label signal.
+    with FakeTaServer(signals=SIGNALS, duration_s=1.0) as server:
+        code = _run(
+            tmp_path,
+            server,
+            "--output-format",
+            output_format,
+            "--change-only",
+            "--checkpoint-interval",
+            "0.1",
+        )
+    assert code == 0
+
+    summary = json.loads((tmp_path / "out" / "result_summary.json").read_text(encoding="utf-8"))
+    assert summary["signals"]["checkpoint"]["segments"] > 1
+    rows = list(read_signal_rows(tmp_path / "out" / summary["signals"]["file"], output_format))
+    labels = [row["IconDetection.Result"] for row in rows if row["IconDetection.Result"] is not None]
+    assert len(set(labels)) > 2
+    assert set(labels) <= set(LABELS)
+
+
+def test_record_run_reads_the_recording_back(tmp_path):
+    with FakeTaServer(signals=SIGNALS, duration_s=0.5, record_rate_hz=100.0) as server:
+        code = _run(
+            tmp_path,
+            server,
+            "--acquisition",
+            "record",
+            "--recording-file",
+            str(tmp_path / "run.mf4"),
+            signals=["IconDetection.Result", "IconDetection.Score"],
+        )
+    assert code == 0
+
+    rows = list(read_signal_rows(tmp_path / "out" / "signals.csv", "csv"))
+    assert len(rows) == 50
+    assert [row["IconDetection.Score"] for row in rows[:3]] == pytest.approx(
+        [math.sin(2.0 * math.pi * k / 100.0) for k in range(3)]
+    )
+    # Recordings store the index of a label.
+    assert {row["IconDetection.Result"] for row in rows} == {0, 1, 2}
+
+
+class _UnreadableRecording(FakeTaServer):
+    def _Evaluation_Open(self, request, reply):
+        return reply(RetVal=False)
+
+
+def test_unusable_recording_leaves_no_signal_file(tmp_path):
+    with _UnreadableRecording(signals=SIGNALS, duration_s=0.2) as server:
+        code = _run(tmp_path, server, "--acquisition", "record", "--recording-file", str(tmp_path / "run.mf4"))
+    assert code == 1
+    assert not (tmp_path / "out" / "signals.csv").exists()
@@ -0,0 +1,26 @@
+"""Parsing and lookup of the per-RPC policies."""
+from __future__ import annotations
+
+import pytest
+
+from utils.rpc_policy import parse_rpc_policies
+
+
+def test_method_keys_override_the_default():
+    policies = parse_rpc_policies(
+        {"default": {"max_attempts": 2, "timeout_s": 1}, "methods": {"GetSignal": {"timeout_s": 0.5}}}
+    )
+    get_signal = policies.for_rpc("GetSignal[IconDetection.Result]")
+    assert (get_signal.max_attempts, get_signal.timeout_s, get_signal.idempotent) == (2, 0.5, True)
+    assert policies.for_rpc("MeasureStart").idempotent is False
+
+
+def test_default_cannot_make_every_rpc_idempotent():
+    with pytest.raises(ValueError, match="rpc.default.idempotent"):
+        parse_rpc_policies({"default": {"idempotent": True}})
+
+
+def test_single_rpc_may_be_marked_idempotent():
+    policies = parse_rpc_policies({"methods": {"LoadModel": {"idempotent": True}}})
+    assert policies.for_rpc("LoadModel").idempotent is True
+    assert policies.for_rpc("MeasureStart").idempotent is False
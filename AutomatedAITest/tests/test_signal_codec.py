@@ -0,0 +1,63 @@
+"""Wire-format decoding compared with the protobuf message classes."""
+from __future__ import annotations
+
+import numpy
+import pytest
+
+import testautomation_pb2 as ta_pb2
+from utils.signal_codec import NO_VALUE, decode_signal_reply, decode_value_array
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("RetVal_double", -1.5),
+        ("RetVal_int64", -(2**40)),
+        ("RetVal_uint64", 2**63 + 5),
+        ("RetVal_string", "car ✓"),
+    ],
+)
+def test_scalar_replies(field, value):
+    reply = ta_pb2.SystemGetSignalReply(**{field: value})
+    assert decode_signal_reply(reply.SerializeToString()) == value
+
+
+@pytest.mark.parametrize(
+    "field, values",
+    [
+        ("RetVal_doublearray", [0.25, -3.0, 1e300]),
+        ("RetVal_int64array", [-1, 0, 2**62, -(2**63)]),
+        ("RetVal_uint64array", [0, 1, 2**64 - 1]),
+    ],
+)
+def test_array_replies(field, values):
+    reply = ta_pb2.SystemGetSignalReply()
+    getattr(reply, field).arr.extend(values)
+    assert decode_signal_reply(reply.SerializeToString()).tolist() == values
+
+
+def test_reply_without_value():
+    assert decode_signal_reply(ta_pb2.SystemGetSignalReply().SerializeToString()) is NO_VALUE
+
+
+@pytest.mark.parametrize(
+    "field, values",
+    [
+        ("doublearray", [0.5, -2.0]),
+        ("int64array", [-7, 7]),
+        ("uint64array", [2**64 - 1]),
+        ("int32array", [-(2**31), 5]),
+        ("uint32array", [2**32 - 1]),
+        ("floatarray", [0.5, -0.25]),
+    ],
+)
+def test_value_arrays(field, values):
+    message = ta_pb2.ValueArray()
+    getattr(message, field).arr.extend(values)
+    assert decode_value_array(message.SerializeToString()).tolist() == values
+
+
+def test_byte_value_array():
+    decoded = decode_value_array(ta_pb2.ValueArray(uint8array=b"\x00\x7f\xff").SerializeToString())
+    assert decoded.dtype == numpy.uint8
+    assert decoded.tolist() == [0, 127, 255]
@@ -0,0 +1,82 @@
+"""Column typing of the columnar sinks."""
+from __future__ import annotations
+
+import numpy
+import pytest
+
+from utils.change_encoding import ChangeEncoder, read_signal_rows
+from utils.checkpoint import SegmentedSink
+from utils.sinks import SINK_DEPENDENCIES, create_sink, missing_dependency
+
+COLUMNS = ["timestamp", "Label", "Score", "Boxes"]
+
+
+@pytest.fixture(params=["parquet", "npy"])
+def output_format(request):
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+def _rows(path, output_format):
+    return list(read_signal_rows(path, output_format))
+
+
+def test_column_without_value_in_first_batch(tmp_path, output_format):
+    sink = create_sink(output_format, tmp_path, COLUMNS, buffer_rows=1)
+    sink.write({"timestamp": 1, "Label": None, "Score": 0.5, "Boxes": None})
+    sink.write({"timestamp": 2, "Label": "car", "Score": None, "Boxes": numpy.array([1, 2], dtype=numpy.int64)})
+    sink.close()
+
+    rows = _rows(sink.path, output_format)
+    assert [row["Label"] for row in rows] == [None, "car"]
+    assert [row["Score"] for row in rows] == [0.5, None]
+    assert rows[0]["Boxes"] is None
+    assert rows[1]["Boxes"].tolist() == [1, 2]
+
+
+def test_column_types_fixed_up_front(tmp_path, output_format):
+    types = {"Label": "string", "Score": "float", "Boxes": "int64[]"}
+    sink = create_sink(output_format, tmp_path, COLUMNS, buffer_rows=1, column_types=types)
+    sink.write({"timestamp": 1})
+    sink.write({"timestamp": 2, "Label": "car", "Boxes": numpy.array([3], dtype=numpy.int64)})
+    sink.close()
+
+    assert sink.column_types == types
+    rows = _rows(sink.path, output_format)
+    assert [row["Label"] for row in rows] == [None, "car"]
+    assert rows[1]["Boxes"].tolist() == [3]
+
+
+def test_column_never_written(tmp_path, output_format):
+    sink = create_sink(output_format, tmp_path, ["timestamp", "Label"], buffer_rows=1)
+    sink.write({"timestamp": 1})
+    sink.close()
+
+    assert _rows(sink.path, output_format) == [{"timestamp": 1, "Label": None}]
+
+
+def test_change_only_segments_keep_the_column_types(tmp_path, output_format):
+    def open_sink(basename, column_types):
+        return create_sink(output_format, tmp_path, COLUMNS[:3], basename, buffer_rows=1, column_types=column_types)
+
+    # A tiny interval closes a segment after every written row.
+    segmented = SegmentedSink(open_sink, tmp_path, COLUMNS[:3], output_format, 1e-9)
+    encoder = ChangeEncoder(segmented)
+    encoder.write({"timestamp": 1, "Label": "bus", "Score": 0.1})
+    # Only Score changes: this segment holds no Label value.
+    encoder.write({"timestamp": 2, "Label": "bus", "Score": 0.2})
+    encoder.write({"timestamp": 3, "Label": "car", "Score": 0.2})
+    segmented.complete()
+    encoder.close()
+
+    rows = _rows(segmented.path, output_format)
+    assert [row["Label"] for row in rows] == ["bus", None, "car"]
+    assert [row["Score"] for row in rows] == [0.1, 0.2, None]
+
+
+def test_missing_dependency(monkeypatch):
+    assert missing_dependency("csv") is None
+    assert missing_dependency("npy") is None
+    monkeypatch.setitem(SINK_DEPENDENCIES, "npy", "no_such_package_installed")
+    assert missing_dependency("npy") == "no_such_package_installed"
@@ -0,0 +1,319 @@
+"""Online down-sampling and run statistics of the monitored signals.
+
+Statistics of a run used to be computed by scripts that reloaded the whole
+signal file afterwards. :class:`SignalAggregator` sits in front of the signal
+sink and updates, tick by tick and in constant memory per signal:
+
+* one row per ``window_s`` window with ``min``/``max``/``mean``/``last`` of
+  every numeric signal, the number of ``active`` ticks (non-zero value or
+  non-empty array) and of ``detections`` (ticks where a signal became
+  active), written through its own sink as ``aggregates<suffix>``;
+* run totals of the same values plus streaming quantiles of every
+  floating-point signal (score signals), estimated with the P² algorithm,
+  which ``result_summary.json`` lists under ``aggregates``.
+
+The raw rows are still written to the wrapped sink unless the aggregator is
+created without one.
+"""
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from utils.metrics import QUANTILES
+from utils.sinks import RowSink, SignalSink, format_timestamp
+
+AGGREGATE_FIELDS = ("min", "max", "mean", "last", "active", "detections")
+
+# Column types of the aggregate fields; ``last`` has the type of its signal.
+_AGGREGATE_TYPES = {"min": "float", "max": "float", "mean": "float", "active": "int", "detections": "int"}
+
+
+class P2Quantile:
+    """Streaming estimate of the ``q`` quantile in constant memory.
+
+    Implements the P² algorithm of Jain and Chlamtac: five markers track the
+    minimum, the maximum, the quantile and two intermediate quantiles, and
+    their heights are adjusted with a piecewise-parabolic prediction after
+    every observation. The first five observations are exact.
+    """
+
+    __slots__ = ("q", "count", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, q: float) -> None:
+        if not 0.0 < q < 1.0:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        self.q = q
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1.0 + 2.0 * q, 1.0 + 4.0 * q, 3.0 + 2.0 * q, 5.0]
+        self._increments = [0.0, q / 2.0, q, (1.0 + q) / 2.0, 1.0]
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(index for index in range(4) if heights[index] <= value < heights[index + 1])
+        positions = self._positions
+        for index in range(cell + 1, 5):
+            positions[index] += 1.0
+        for index in range(5):
+            self._desired[index] += self._increments[index]
+        for index in (1, 2, 3):
+            offset = self._desired[index] - positions[index]
+            if (offset >= 1.0 and positions[index + 1] - positions[index] > 1.0) or (
+                offset <= -1.0 and positions[index - 1] - positions[index] < -1.0
+            ):
+                step = 1.0 if offset > 0 else -1.0
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = self._linear(index, step)
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index: int, step: float) -> float:
+        h, n = self._heights, self._positions
+        return h[index] + step / (n[index + 1] - n[index - 1]) * (
+            (n[index] - n[index - 1] + step) * (h[index + 1] - h[index]) / (n[index + 1] - n[index])
+            + (n[index + 1] - n[index] - step) * (h[index] - h[index - 1]) / (n[index] - n[index - 1])
+        )
+
+    def _linear(self, index: int, step: float) -> float:
+        h, n = self._heights, self._positions
+        neighbour = index + int(step)
+        return h[index] + step * (h[neighbour] - h[index]) / (n[neighbour] - n[index])
+
+    def value(self) -> Optional[float]:
+        """Current estimate; ``None`` before the first observation."""
+
+        if not self.count:
+            return None
+        if self.count <= 5:
+            # Nearest rank over the exact samples.
+            return self._heights[min(int(math.ceil(self.q * self.count)) - 1, self.count - 1)]
+        return self._heights[2]
+
+
+class _SignalStats:
+    """Running min/max/mean/last and activity counts of one signal."""
+
+    __slots__ = ("count", "minimum", "maximum", "total", "last", "active", "detections", "_was_active")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.total = 0.0
+        self.last: Any = None
+        self.active = 0
+        self.detections = 0
+        self._was_active = False
+
+    def reset(self) -> None:
+        # Activity carries over so that a detection spanning two windows counts once.
+        was_active = self._was_active
+        self.__init__()
+        self._was_active = was_active
+
+    def observe(self, value: Any, numeric: Optional[float]) -> None:
+        self.count += 1
+        self.last = value
+        if numeric is not None:
+            self.minimum = min(self.minimum, numeric)
+            self.maximum = max(self.maximum, numeric)
+            self.total += numeric
+            is_active = numeric != 0
+        else:
+            is_active = len(value) > 0 if hasattr(value, "__len__") else bool(value)
+        if is_active:
+            self.active += 1
+            if not self._was_active:
+                self.detections += 1
+        self._was_active = is_active
+
+    def summary(self, plain: bool = False) -> Dict[str, Any]:
+        """Aggregated values; ``plain`` turns an array ``last`` value into a list."""
+
+        numeric = self.minimum <= self.maximum
+        return {
+            "min": self.minimum if numeric else None,
+            "max": self.maximum if numeric else None,
+            "mean": self.total / self.count if numeric and self.count else None,
+            "last": self.last.tolist() if plain and hasattr(self.last, "tolist") else self.last,
+            "active": self.active,
+            "detections": self.detections,
+        }
+
+
+def _numeric(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class SignalAggregator:
+    """Aggregate the rows of a run on their way to ``sink``.
+
+    ``open_sink`` creates the sink of the window rows from its column names
+    and column types when the first window closes; ``column_types`` are the
+    column types of the signals, if known. ``sink`` receives the raw rows; without it
+    only the aggregates are kept. ``quantiles`` are estimated for every
+    signal with ``float`` values. The aggregator is a
+    :class:`~utils.sinks.RowSink` itself, so it takes the place of the sink.
+    """
+
+    def __init__(
+        self,
+        signals: Sequence[str],
+        window_s: float,
+        open_sink: Callable[[List[str], Dict[str, str]], SignalSink],
+        sink: Optional[RowSink] = None,
+        quantiles: Sequence[float] = QUANTILES,
+        column_types: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        if window_s <= 0:
+            raise ValueError(f"Aggregation window must be positive, got {window_s}")
+        self.signals = list(signals)
+        self.window_s = window_s
+        self.quantiles = tuple(quantiles)
+        for q in self.quantiles:
+            if not 0.0 < q < 1.0:
+                raise ValueError(f"Quantiles must be between 0 and 1, got {q}")
+        self.sink = sink
+        self.aggregate_sink: Optional[SignalSink] = None
+        self.ticks = 0
+        self.windows = 0
+        self._open_sink = open_sink
+        self._column_types = dict(column_types or {})
+        self._window_ns = int(window_s * 1_000_000_000)
+        self._window_start: Optional[int] = None
+        self._window_ticks = 0
+        self._first_ns: Optional[int] = None
+        self._last_ns: Optional[int] = None
+        self._window = {name: _SignalStats() for name in self.signals}
+        self._run = {name: _SignalStats() for name in self.signals}
+        self._estimators: Dict[str, List[P2Quantile]] = {}
+        self._closed = False
+
+    @property
+    def path(self) -> Optional[Path]:
+        sink = self.sink or self.aggregate_sink
+        return sink.path if sink is not None else None
+
+    @property
+    def columns(self) -> List[str]:
+        return self.sink.columns if self.sink is not None else ["timestamp", *self.signals]
+
+    @property
+    def row_count(self) -> int:
+        return self.sink.row_count if self.sink is not None else self.ticks
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, row: Dict[str, Any]) -> None:
+        timestamp = row["timestamp"]
+        if self._window_start is None:
+            self._window_start = self._first_ns = timestamp
+        elif timestamp - self._window_start >= self._window_ns:
+            self._close_window()
+            # Windows are aligned on the first tick; empty windows are skipped.
+            self._window_start += (timestamp - self._window_start) // self._window_ns * self._window_ns
+        self._last_ns = timestamp
+        self.ticks += 1
+        self._window_ticks += 1
+        for name in self.signals:
+            value = row.get(name)
+            if value is None:
+                continue
+            numeric = _numeric(value)
+            self._window[name].observe(value, numeric)
+            self._run[name].observe(value, numeric)
+            if isinstance(value, float):
+                estimators = self._estimators.get(name)
+                if estimators is None:
+                    estimators = self._estimators[name] = [P2Quantile(q) for q in self.quantiles]
+                for estimator in estimators:
+                    estimator.observe(value)
+        if self.sink is not None:
+            self.sink.write(row)
+
+    def _close_window(self) -> None:
+        if not self._window_ticks:
+            return
+        if self.aggregate_sink is None:
+            columns = ["timestamp", "ticks"]
+            columns.extend(f"{name}.{field}" for name in self.signals for field in AGGREGATE_FIELDS)
+            types = {"ticks": "int"}
+            for name in self.signals:
+                types.update((f"{name}.{field}", kind) for field, kind in _AGGREGATE_TYPES.items())
+                if name in self._column_types:
+                    types[f"{name}.last"] = self._column_types[name]
+            self.aggregate_sink = self._open_sink(columns, types)
+        aggregate: Dict[str, Any] = {"timestamp": self._window_start, "ticks": self._window_ticks}
+        for name, stats in self._window.items():
+            for field, value in stats.summary().items():
+                aggregate[f"{name}.{field}"] = value
+            stats.reset()
+        self.aggregate_sink.write(aggregate)
+        self.windows += 1
+        self._window_ticks = 0
+
+    def flush(self) -> None:
+        if self.sink is not None:
+            self.sink.flush()
+        if self.aggregate_sink is not None:
+            self.aggregate_sink.flush()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._close_window()
+        if self.sink is not None:
+            self.sink.close()
+        if self.aggregate_sink is not None:
+            self.aggregate_sink.close()
+        self._closed = True
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals per signal, with the quantile estimates of float signals."""
+
+        signals: Dict[str, Any] = {}
+        for name, stats in self._run.items():
+            entry = {"count": stats.count, **stats.summary(plain=True)}
+            estimators = self._estimators.get(name)
+            if estimators:
+                entry["quantiles"] = {
+                    f"p{round(estimator.q * 100, 1):g}": estimator.value() for estimator in estimators
+                }
+            signals[name] = entry
+        return signals
+
+    def describe(self) -> Dict[str, Any]:
+        if self.sink is not None:
+            description = self.sink.describe()
+        else:
+            description = {"file": None, "columns": self.columns, "sample_count": 0}
+        description["aggregates"] = {
+            "file": self.aggregate_sink.path.name if self.aggregate_sink is not None else None,
+            "window_s": self.window_s,
+            "windows": self.windows,
+            "ticks": self.ticks,
+            "start": format_timestamp(self._first_ns) if self._first_ns is not None else None,
+            "end": format_timestamp(self._last_ns) if self._last_ns is not None else None,
+            "signals": self.summary(),
+        }
+        return description
@@ -0,0 +1,257 @@
+"""Change-only recording of the monitored signals and its dense reconstruction.
+
+AI-Core result signals are mostly piecewise constant, yet every tick used to
+write a complete row. :class:`ChangeEncoder` wraps a signal sink and writes a
+row only when at least one signal changed; the row holds the tick timestamp
+and the changed signals, the other cells stay empty (``None``). Floating-point
+signals only count as changed once they moved more than their deadband away
+from the last written value. The first tick is written completely, and so is
+the last one when the run ends, so that the step times and the end of the run
+are exact.
+
+:func:`read_signal_rows` reads a written signal file back and
+:func:`reconstruct_dense` expands change rows into a dense series on a fixed
+time grid by holding every value until its next change.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence
+
+from utils.sinks import INT_NULL_SENTINEL, RowSink, SinkWrapper
+
+ENCODING_MODES = ("dense", "changes")
+
+
+def _is_float(value: Any) -> bool:
+    return isinstance(value, float) or getattr(getattr(value, "dtype", None), "kind", "") == "f"
+
+
+def _changed(previous: Any, current: Any, deadband: float) -> bool:
+    if previous is None:
+        return True
+    if hasattr(current, "tolist") or hasattr(previous, "tolist"):
+        if getattr(previous, "shape", None) != getattr(current, "shape", None):
+            return True
+        if deadband and _is_float(current):
+            return bool(abs(current - previous).max(initial=0.0) > deadband)
+        return getattr(previous, "tolist", lambda: previous)() != getattr(current, "tolist", lambda: current)()
+    if deadband and isinstance(current, float) and isinstance(previous, (int, float)):
+        return abs(current - previous) > deadband or math.isnan(current) != math.isnan(previous)
+    return previous != current
+
+
+class ChangeEncoder(SinkWrapper):
+    """Write only the changes of the monitored signals to ``sink``.
+
+    ``deadband`` applies to every floating-point signal (scalars and arrays,
+    element-wise) and ``deadbands`` overrides it per signal, matched
+    case-insensitively. Missing samples (``None``) do not count as a change.
+    """
+
+    def __init__(
+        self,
+        sink: RowSink,
+        deadband: float = 0.0,
+        deadbands: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        if deadband < 0 or any(value < 0 for value in (deadbands or {}).values()):
+            raise ValueError("Deadbands must not be negative")
+        super().__init__(sink)
+        self.signals = [name for name in sink.columns if name != "timestamp"]
+        overrides = {name.casefold(): float(value) for name, value in (deadbands or {}).items()}
+        unknown = sorted(set(overrides) - {name.casefold() for name in self.signals})
+        if unknown:
+            raise ValueError(f"Deadbands for signals that are not monitored: {', '.join(unknown)}")
+        self._deadbands = {name: overrides.get(name.casefold(), float(deadband)) for name in self.signals}
+        self.deadband = deadband
+        self.ticks = 0
+        self.changes = 0
+        self._written: Dict[str, Any] = {}
+        self._current: Dict[str, Any] = {}
+        self._last_timestamp: Optional[int] = None
+        self._last_written: Optional[int] = None
+
+    def write(self, row: Dict[str, Any]) -> None:
+        timestamp = row["timestamp"]
+        changed: Dict[str, Any] = {}
+        for name in self.signals:
+            value = row.get(name)
+            if value is None:
+                continue
+            self._current[name] = value
+            if _changed(self._written.get(name), value, self._deadbands[name]):
+                changed[name] = value
+        self.ticks += 1
+        self._last_timestamp = timestamp
+        if changed:
+            self._emit(timestamp, changed)
+            self.changes += len(changed)
+
+    def _emit(self, timestamp: int, values: Dict[str, Any]) -> None:
+        self._written.update(values)
+        self._last_written = timestamp
+        self.sink.write({"timestamp": timestamp, **values})
+
+    def close(self) -> None:
+        if self.sink.closed:
+            return
+        if self._last_timestamp is not None and self._last_timestamp != self._last_written:
+            # Closing row: marks the end of the run, values held since their last change.
+            self._emit(self._last_timestamp, dict(self._current))
+        super().close()
+
+    def describe(self) -> Dict[str, Any]:
+        description = super().describe()
+        description["encoding"] = {
+            "mode": "changes",
+            "deadband": self.deadband,
+            "deadbands": {name: value for name, value in self._deadbands.items() if value != self.deadband},
+            "ticks": self.ticks,
+            "changes": self.changes,
+        }
+        return description
+
+
+def _parse_timestamp(value: str) -> int:
+    moment = datetime.fromisoformat(value)
+    return int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+
+def _parse_text(value: str) -> Any:
+    if value == "":
+        return None
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return value
+    if isinstance(parsed, list):
+        import numpy
+
+        return numpy.asarray(parsed)
+    return parsed
+
+
+def read_signal_rows(path: Path, output_format: str) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a signal file written by one of the sinks.
+
+    Timestamps come back as epoch nanoseconds, empty cells (and the null
+    markers of the ``npy`` layout) as ``None`` and arrays as NumPy arrays.
+    """
+
+    if output_format == "csv":
+        with path.open(encoding="utf-8", newline="") as handle:
+            for record in csv.DictReader(handle):
+                row = {name: _parse_text(value) for name, value in record.items()}
+                row["timestamp"] = _parse_timestamp(record["timestamp"])
+                yield row
+    elif output_format == "ndjson":
+        import numpy
+
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                for name, value in row.items():
+                    if isinstance(value, list):
+                        row[name] = numpy.asarray(value)
+                row["timestamp"] = _parse_timestamp(row["timestamp"])
+                yield row
+    elif output_format == "parquet":
+        yield from _read_parquet(path)
+    elif output_format == "npy":
+        yield from _read_npy(path)
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+
+def _read_parquet(path: Path) -> Iterator[Dict[str, Any]]:
+    import numpy
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(str(path)).iter_batches():
+        columns = {}
+        for name, column in zip(batch.schema.names, batch.columns):
+            if name == "timestamp":
+                columns[name] = column.cast(pa.int64()).to_pylist()
+            else:
+                columns[name] = [
+                    numpy.asarray(value) if isinstance(value, list) else value for value in column.to_pylist()
+                ]
+        for index in range(batch.num_rows):
+            yield {name: values[index] for name, values in columns.items()}
+
+
+def _read_npy(path: Path) -> Iterator[Dict[str, Any]]:
+    import numpy
+
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    count = manifest["row_count"]
+    columns: Dict[str, Any] = {}
+    for name, entry in manifest["columns"].items():
+        if entry["kind"] == "null":
+            # Not a single value was written.
+            columns[name] = ("null", None, None)
+            continue
+        values = numpy.load(path / entry["file"], mmap_mode="r")
+        if entry["kind"] == "array":
+            offsets = numpy.load(path / entry["offsets_file"], mmap_mode="r")
+            columns[name] = ("array", values, offsets)
+        else:
+            columns[name] = (entry["kind"], values, entry.get("categories"))
+    for index in range(count):
+        row: Dict[str, Any] = {}
+        for name, (kind, values, extra) in columns.items():
+            if kind == "null":
+                row[name] = None
+                continue
+            if kind == "array":
+                start, end = int(extra[index]), int(extra[index + 1])
+                row[name] = numpy.array(values[start:end]) if end > start else None
+                continue
+            value = values[index].item()
+            if kind == "float" and math.isnan(value):
+                value = None
+            elif kind == "int" and name != "timestamp" and value == INT_NULL_SENTINEL:
+                value = None
+            elif kind == "string":
+                value = None if value < 0 else extra[value]
+            row[name] = value
+        yield row
+
+
+def reconstruct_dense(
+    rows: Iterable[Dict[str, Any]], signals: Sequence[str], interval_s: float
+) -> Iterator[Dict[str, Any]]:
+    """Expand time-ordered change rows into one row every ``interval_s`` seconds.
+
+    The grid starts at the first change row and ends at the last one; each
+    grid row holds the values of the latest change at or before its
+    timestamp. Memory stays proportional to the number of signals.
+    """
+
+    if interval_s <= 0:
+        raise ValueError(f"Reconstruction interval must be positive, got {interval_s}")
+    step = int(interval_s * 1_000_000_000)
+    held: Dict[str, Any] = {}
+    grid: Optional[int] = None
+    for row in rows:
+        timestamp = row["timestamp"]
+        if grid is None:
+            grid = timestamp
+        while grid < timestamp:
+            yield {"timestamp": grid, **{name: held.get(name) for name in signals}}
+            grid += step
+        for name in signals:
+            value = row.get(name)
+            if value is not None:
+                held[name] = value
+        if grid == timestamp:
+            yield {"timestamp": grid, **{name: held.get(name) for name in signals}}
+            grid += step
@@ -0,0 +1,113 @@
+"""gRPC channel tuning and connection layout of the PROVEtech:TA client.
+
+All RPCs used to share one channel, i.e. one HTTP/2 connection with the
+default flow-control windows and a 4 MB reply limit. Bulk transfers such as
+``Evaluation.GetSignalArray`` then queue in front of the small, latency
+sensitive ``GetSignal``/``IsRunning`` polls. :class:`ChannelSettings` tunes
+the channel arguments and splits the traffic over a pool of polling channels
+and a separate bulk channel, each with its own connection.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, List, Optional, Tuple
+
+COMPRESSION_ALGORITHMS = ("none", "gzip", "deflate")
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ChannelSettings:
+    """Options of the ``grpc.channel`` configuration section.
+
+    Message sizes are in MiB (``0`` removes the limit), ``stream_window_kb``
+    sets the HTTP/2 per-stream flow-control window and ``bdp_probe: false``
+    pins it instead of letting gRPC grow it with the measured bandwidth.
+    ``poll_channels`` connections carry the monitoring RPCs; with
+    ``bulk_channel`` the ``Evaluation`` service and other bulk transfers get a
+    connection of their own. ``options`` holds raw gRPC channel arguments.
+    """
+
+    max_receive_message_mb: Optional[float] = None
+    max_send_message_mb: Optional[float] = None
+    stream_window_kb: Optional[int] = None
+    bdp_probe: bool = True
+    compression: str = "none"
+    keepalive_time_ms: int = 10000
+    keepalive_timeout_ms: int = 5000
+    poll_channels: int = 1
+    bulk_channel: bool = True
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def channel_count(self) -> int:
+        return self.poll_channels + (1 if self.bulk_channel else 0)
+
+    def channel_options(self) -> List[Tuple[str, Any]]:
+        """Return the gRPC channel arguments shared by all channels of the pool."""
+
+        options: List[Tuple[str, Any]] = [
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+        ]
+        if self.max_receive_message_mb is not None:
+            options.append(("grpc.max_receive_message_length", _message_limit(self.max_receive_message_mb)))
+        if self.max_send_message_mb is not None:
+            options.append(("grpc.max_send_message_length", _message_limit(self.max_send_message_mb)))
+        if self.stream_window_kb is not None:
+            options.append(("grpc.http2.lookahead_bytes", self.stream_window_kb * 1024))
+        if not self.bdp_probe:
+            options.append(("grpc.http2.bdp_probe", 0))
+        if self.channel_count > 1:
+            # Channels with equal arguments would otherwise share one
+            # connection through the global subchannel pool.
+            options.append(("grpc.use_local_subchannel_pool", 1))
+        options.extend(self.options)
+        return options
+
+
+def _message_limit(size_mb: float) -> int:
+    return -1 if size_mb <= 0 else int(size_mb * _MB)
+
+
+def parse_channel_settings(section: Any) -> ChannelSettings:
+    """Build :class:`ChannelSettings` from ``grpc.channel``.
+
+    Raises ``ValueError`` for malformed sections.
+    """
+
+    section = section or {}
+    if not isinstance(section, dict):
+        raise ValueError("grpc.channel must be a mapping")
+    unknown = sorted(set(section) - {item.name for item in fields(ChannelSettings)})
+    if unknown:
+        raise ValueError(f"Unknown keys in grpc.channel: {', '.join(unknown)}")
+    defaults = ChannelSettings()
+    raw_options = section.get("options") or {}
+    if not isinstance(raw_options, dict):
+        raise ValueError("grpc.channel.options must be a mapping of gRPC channel arguments")
+
+    def optional(key: str, convert):
+        value = section.get(key)
+        return None if value is None or value == "" else convert(value)
+
+    settings = ChannelSettings(
+        max_receive_message_mb=optional("max_receive_message_mb", float),
+        max_send_message_mb=optional("max_send_message_mb", float),
+        stream_window_kb=optional("stream_window_kb", int),
+        bdp_probe=bool(section.get("bdp_probe", defaults.bdp_probe)),
+        compression=str(section.get("compression", defaults.compression)).lower(),
+        keepalive_time_ms=int(section.get("keepalive_time_ms", defaults.keepalive_time_ms)),
+        keepalive_timeout_ms=int(section.get("keepalive_timeout_ms", defaults.keepalive_timeout_ms)),
+        poll_channels=int(section.get("poll_channels", defaults.poll_channels)),
+        bulk_channel=bool(section.get("bulk_channel", defaults.bulk_channel)),
+        options=tuple((str(key), value) for key, value in raw_options.items()),
+    )
+    if settings.compression not in COMPRESSION_ALGORITHMS:
+        raise ValueError(
+            f"grpc.channel.compression must be one of {', '.join(COMPRESSION_ALGORITHMS)}"
+        )
+    if settings.poll_channels < 1:
+        raise ValueError("grpc.channel.poll_channels must be at least 1")
+    return settings
@@ -0,0 +1,327 @@
+"""Checkpointed signal segments of crash-resumable monitoring runs.
+
+A monitoring run used to stream into a single data file, which a crash left
+without its footer (``parquet``) and a restart overwrote. :class:`SegmentedSink`
+takes the place of the raw signal sink: it writes ``signals.partNNNN<suffix>``
+segments, closes the current one every ``interval_s`` seconds and records the
+closed segments, the sampler position and the monitoring attempts in
+``checkpoint.json``, which is replaced atomically.
+
+``automate_test.py --resume`` reads the checkpoint back with
+:func:`load_checkpoint` and appends further segments to it. When the run
+completes, the segments are stitched into the usual ``signals<suffix>`` file
+and removed together with the checkpoint; an interrupted run keeps both.
+``csv`` and ``ndjson`` segments are joined byte for byte, so the stitched file
+is what a run without checkpoints writes; ``parquet`` and ``npy`` segments
+are read back and rewritten with the column types of the run.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from utils.change_encoding import read_signal_rows
+from utils.sinks import SignalSink, format_timestamp
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_VERSION = 1
+
+ATTEMPT_MODES = ("start", "reattach", "continue")
+
+_COPY_BLOCK = 1 << 20
+
+
+def load_checkpoint(output_dir: Path) -> Dict[str, Any]:
+    """Read ``checkpoint.json`` of ``output_dir``; raises ``ValueError`` when missing or unusable."""
+
+    path = output_dir.expanduser().resolve() / CHECKPOINT_FILE
+    try:
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ValueError(f"No checkpoint to resume in {path.parent}") from None
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Unable to read {path}: {exc}") from None
+    if not isinstance(checkpoint, dict) or checkpoint.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} was not written by this version of the runner")
+    return checkpoint
+
+
+def monitored_seconds(checkpoint: Dict[str, Any]) -> float:
+    """Monitoring time covered by the recorded attempts of ``checkpoint``."""
+
+    return sum(
+        (attempt["last"] - attempt["first"]) / 1e9
+        for attempt in checkpoint.get("attempts", [])
+        if attempt.get("first") is not None
+    )
+
+
+def segmented_sink(sink: Any) -> Optional["SegmentedSink"]:
+    """Find the :class:`SegmentedSink` below the wrappers of ``sink``, if any."""
+
+    while sink is not None and not isinstance(sink, SegmentedSink):
+        sink = getattr(sink, "sink", None)
+    return sink
+
+
+def _last_line_end(handle: BinaryIO) -> int:
+    """Offset just after the last newline of ``handle``, 0 without any."""
+
+    end = handle.seek(0, os.SEEK_END)
+    while end > 0:
+        start = max(end - _COPY_BLOCK, 0)
+        handle.seek(start)
+        index = handle.read(end - start).rfind(b"\n")
+        if index >= 0:
+            return start + index + 1
+        end = start
+    return 0
+
+
+def _copy_bytes(source: BinaryIO, target: BinaryIO, length: int) -> int:
+    """Copy ``length`` bytes from ``source`` to ``target``; return the newlines among them."""
+
+    lines = 0
+    while length > 0:
+        block = source.read(min(length, _COPY_BLOCK))
+        if not block:
+            break
+        target.write(block)
+        lines += block.count(b"\n")
+        length -= len(block)
+    return lines
+
+
+def _remove(path: Path) -> None:
+    # The npy layout is a directory.
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+class SegmentedSink:
+    """Write the raw signal rows as checkpointed segments.
+
+    ``open_sink`` creates a sink from its basename and column types, as the
+    signal sink of a run would be created. The column types start from
+    ``column_types`` and collect those the segments took from their first
+    values, so that every segment and the stitched file share one schema. ``previous`` is the checkpoint of an interrupted run
+    to continue; its columns and format must match. Call :meth:`complete`
+    before :meth:`close` once the run finished: only then are the segments
+    stitched, otherwise they stay on disk for ``--resume``. It implements
+    :class:`~utils.sinks.RowSink`, so the other wrappers stack on top of it.
+    """
+
+    def __init__(
+        self,
+        open_sink: Callable[[str, Dict[str, str]], SignalSink],
+        output_dir: Path,
+        columns: List[str],
+        output_format: str,
+        interval_s: float,
+        previous: Optional[Dict[str, Any]] = None,
+        mode: str = "start",
+        logger: Optional[logging.Logger] = None,
+        column_types: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if interval_s <= 0:
+            raise ValueError(f"Checkpoint interval must be positive, got {interval_s}")
+        if mode not in ATTEMPT_MODES:
+            raise ValueError(f"Unknown monitoring attempt '{mode}', expected one of {', '.join(ATTEMPT_MODES)}")
+        if previous is not None:
+            if previous.get("columns") != list(columns):
+                raise ValueError("The monitored signals differ from those of the checkpointed run")
+            if previous.get("format") != output_format:
+                raise ValueError(
+                    f"The output format differs from that of the checkpointed run ({previous.get('format')})"
+                )
+        self.open_sink = open_sink
+        self.output_dir = output_dir.expanduser().resolve()
+        self.columns = list(columns)
+        self.output_format = output_format
+        self.interval_s = interval_s
+        self.logger = logger or logging.getLogger(__name__)
+        self.column_types: Dict[str, str] = {**(column_types or {}), **(previous or {}).get("column_types", {})}
+        self.segments: List[Dict[str, Any]] = list(previous["segments"]) if previous else []
+        self.attempts: List[Dict[str, Any]] = list(previous["attempts"]) if previous else []
+        self.rows = sum(segment["rows"] for segment in self.segments)
+        self.attempts.append({"mode": mode, "started": format_timestamp(time.time_ns()), "first": None, "last": None})
+        self.checkpoints = 0
+        self.closed = False
+        self.stitched: Optional[SignalSink] = None
+        self._stitched_rows = 0
+        self._attempt = self.attempts[-1]
+        self._segment: Optional[SignalSink] = None
+        self._segment_opened = 0.0
+        self._completed = False
+        self._path = self.output_dir / CHECKPOINT_FILE
+        self._save()
+
+    @property
+    def path(self) -> Path:
+        if self.stitched is not None:
+            return self.stitched.path
+        return self._segment.path if self._segment is not None else self._path
+
+    @property
+    def row_count(self) -> int:
+        return self.rows
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self._segment is None:
+            self._open_segment()
+        assert self._segment is not None
+        self._segment.write(row)
+        self.rows += 1
+        segment = self.segments[-1]
+        segment["rows"] += 1
+        if segment["first"] is None:
+            segment["first"] = row["timestamp"]
+        segment["last"] = row["timestamp"]
+        if self._attempt["first"] is None:
+            self._attempt["first"] = row["timestamp"]
+        self._attempt["last"] = row["timestamp"]
+        if time.monotonic() - self._segment_opened >= self.interval_s:
+            self._close_segment()
+
+    def _open_segment(self) -> None:
+        self._segment = self.open_sink(f"signals.part{len(self.segments) + 1:04d}", dict(self.column_types))
+        self._segment_opened = time.monotonic()
+        self.segments.append(
+            {"file": self._segment.path.name, "rows": 0, "first": None, "last": None, "closed": False}
+        )
+        self._save()
+
+    def _close_segment(self) -> None:
+        assert self._segment is not None
+        self._segment.close()
+        self.column_types.update(self._segment.column_types)
+        self._segment = None
+        self.segments[-1]["closed"] = True
+        self._save()
+
+    def _save(self) -> None:
+        checkpoint = {
+            "version": CHECKPOINT_VERSION,
+            "updated": format_timestamp(time.time_ns()),
+            "format": self.output_format,
+            "columns": self.columns,
+            "column_types": self.column_types,
+            "interval_s": self.interval_s,
+            "rows": self.rows,
+            "attempts": self.attempts,
+            "segments": self.segments,
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        temporary = self._path.with_name(self._path.name + ".tmp")
+        temporary.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+        os.replace(temporary, self._path)
+        self.checkpoints += 1
+
+    def flush(self) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+
+    def complete(self) -> None:
+        """Mark the run as finished, so that :meth:`close` stitches the segments."""
+
+        self._completed = True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._segment is not None:
+            self._close_segment()
+        self.closed = True
+        if not self._completed:
+            self.logger.warning(
+                "Run interrupted after %d rows in %d segments; checkpoint kept in %s for --resume",
+                self.rows,
+                len(self.segments),
+                self._path,
+            )
+            return
+        self._stitch()
+
+    def _stitch(self) -> None:
+        sink = self.open_sink("signals", dict(self.column_types))
+        try:
+            if sink.typed_columns:
+                for segment in self.segments:
+                    self._stitched_rows += self._copy_segment(segment, sink)
+        finally:
+            sink.close()
+        if not sink.typed_columns:
+            self._concatenate(sink)
+        for segment in self.segments:
+            _remove(self.output_dir / segment["file"])
+        self._path.unlink(missing_ok=True)
+        self.stitched = sink
+        self.logger.info("Stitched %d segments into %s", len(self.segments), sink.path)
+
+    def _copy_segment(self, segment: Dict[str, Any], sink: SignalSink) -> int:
+        path = self.output_dir / segment["file"]
+        if not segment["closed"] and not path.exists():
+            # Interrupted before its first flush.
+            return 0
+        copied = 0
+        try:
+            for row in read_signal_rows(path, self.output_format):
+                sink.write(row)
+                copied += 1
+        except Exception as exc:
+            # Only the segment open during a crash can be truncated; keep what is readable.
+            self.logger.warning(
+                "Segment %s is unreadable after %d rows: %s", segment["file"], copied, exc
+            )
+        return copied
+
+    def _concatenate(self, sink: SignalSink) -> None:
+        """Append the text segments byte for byte to the file of ``sink``, which holds the header."""
+
+        with sink.path.open("ab") as target:
+            for segment in self.segments:
+                path = self.output_dir / segment["file"]
+                if not path.exists():
+                    continue
+                with path.open("rb") as source:
+                    if self.output_format == "csv":
+                        # Every segment repeats the header.
+                        source.readline()
+                    start = source.tell()
+                    # The segment open during a crash may end in a partial row.
+                    end = source.seek(0, os.SEEK_END) if segment["closed"] else _last_line_end(source)
+                    source.seek(start)
+                    lines = _copy_bytes(source, target, end - start)
+                self._stitched_rows += segment["rows"] if segment["closed"] else lines
+            target.flush()
+            if sink.fsync:
+                os.fsync(target.fileno())
+
+    def describe(self) -> Dict[str, Any]:
+        if self.stitched is not None:
+            description = {**self.stitched.describe(), "sample_count": self._stitched_rows}
+        else:
+            description = {"file": None, "format": self.output_format, "columns": self.columns, "sample_count": self.rows}
+        description["checkpoint"] = {
+            "interval_s": self.interval_s,
+            "checkpoints": self.checkpoints,
+            "segments": len(self.segments),
+            "attempts": [
+                {
+                    "mode": attempt["mode"],
+                    "started": attempt["started"],
+                    "first": format_timestamp(attempt["first"]) if attempt["first"] is not None else None,
+                    "last": format_timestamp(attempt["last"]) if attempt["last"] is not None else None,
+                }
+                for attempt in self.attempts
+            ],
+            "monitored_s": round(monitored_seconds({"attempts": self.attempts}), 3),
+        }
+        return description
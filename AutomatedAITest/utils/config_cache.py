@@ -0,0 +1,323 @@
+"""Schema validation and compiled snapshots of the automation configuration.
+
+Loading ``config.yaml`` used to parse the file line by line on every run and
+only noticed misspelt keys when a default silently took their place. The
+configuration is now checked against :data:`CONFIG_SCHEMA` once and the
+validated result is kept as a compiled snapshot: in memory, keyed by the file
+modification time and size, and as JSON ``<stem>.<digest>.json`` in
+``cache_dir`` (by default the ``__pycache__`` folder next to the
+configuration, or ``$AUTOMATEDAITEST_CONFIG_CACHE``), where ``digest`` hashes
+the file contents together with the source of this module and of the parser.
+Sessions and matrix cases that load the same file again reuse the snapshot
+instead of parsing and validating it again; a changed schema or parser
+compiles a new snapshot and replaces the older ones of the file.
+
+A configuration file may also carry named override sets below ``overrides``;
+each one is a partial configuration merged onto the base sections.
+"""
+from __future__ import annotations
+
+import copy
+import difflib
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Overrides the directory holding compiled configuration snapshots.
+CACHE_DIR_ENV = "AUTOMATEDAITEST_CONFIG_CACHE"
+
+OVERRIDES_KEY = "overrides"
+
+# Expected kind of every key. ``mapping`` sections are checked by their own
+# parser (rpc policies, grpc.channel); an empty value stands for "unset".
+CONFIG_SCHEMA: Dict[str, Optional[Dict[str, str]]] = {
+    "grpc": {
+        "host": "str",
+        "port": "int",
+        "startup_timeout_s": "float",
+        "startup_stats_file": "str",
+        "channel": "mapping",
+    },
+    "ai_core": {
+        "executable": "str",
+        "config_file": "str",
+        "timeout_ms": "int",
+        "parallel_instances": "int",
+    },
+    "video": {
+        "device_name": "str",
+        "driver_id": "str",
+        "resolution": "str",
+    },
+    "test": {
+        "model_name": "str",
+        "ta_executable": "str",
+        "output_dir": "str",
+        "log_signals": "list",
+        "acquisition": "str",
+        "recording_file": "str",
+        "record_chunk_samples": "int",
+        "output_format": "str",
+        "buffer_rows": "int",
+        "flush_interval_s": "float",
+        "fsync": "bool",
+        "validate_signals": "bool",
+        "signal_cache": "str",
+    },
+    "logging": {
+        "level": "str",
+        "file": "str",
+        "mode": "str",
+        "format": "str",
+        "queue_size": "int",
+        "drop_level": "str",
+        "max_mb": "float",
+        "rotate_hours": "float",
+        "backup_count": "int",
+    },
+    "rpc": None,
+    "metrics": {
+        "prometheus_file": "str",
+        "listen_host": "str",
+        "listen_port": "int",
+    },
+    "capture": {
+        "triggers": "list",
+        "pre_ticks": "int",
+        "post_ticks": "int",
+        "image": "bool",
+        "image_dir": "str",
+    },
+    "aggregation": {
+        "window_s": "float",
+        "raw": "bool",
+        "quantiles": "list",
+    },
+    "encoding": {
+        "mode": "str",
+        "deadband": "float",
+        "deadbands": "mapping",
+    },
+    "checkpoint": {
+        "interval_s": "float",
+        "keep_processes": "bool",
+    },
+}
+
+
+def _unknown(key: str, known, where: str, what: str = "key") -> str:
+    message = f"unknown {what} {where}{key}"
+    suggestion = difflib.get_close_matches(key, list(known), n=1)
+    return f"{message} (did you mean {where}{suggestion[0]}?)" if suggestion else message
+
+
+def _kind_error(value: Any, kind: str) -> Optional[str]:
+    if value == "" and kind != "bool":
+        return None
+    if kind == "mapping":
+        return None if isinstance(value, dict) else "a mapping"
+    if kind == "list":
+        return None if isinstance(value, list) else "a list"
+    if isinstance(value, (dict, list)):
+        return f"a single {kind} value"
+    if kind == "bool":
+        return None if isinstance(value, bool) else "true or false"
+    if kind in ("int", "float"):
+        if isinstance(value, bool):
+            return f"a number ({kind})"
+        if kind == "int" and isinstance(value, float) and not value.is_integer():
+            # int() would silently truncate it.
+            return "a whole number (int)"
+        try:
+            (int if kind == "int" else float)(value)
+        except ValueError:
+            return f"a number ({kind})"
+    return None
+
+
+def validate_config(raw: Dict[str, Any], where: str = "") -> List[str]:
+    """Return the schema violations of ``raw``; an empty list when valid.
+
+    Missing sections are not reported, so partial override sets validate
+    like complete configurations.
+    """
+
+    errors: List[str] = []
+    for section, values in raw.items():
+        if section not in CONFIG_SCHEMA:
+            errors.append(_unknown(section, CONFIG_SCHEMA, where, "section"))
+            continue
+        schema = CONFIG_SCHEMA[section]
+        if not isinstance(values, dict):
+            errors.append(f"{where}{section} must be a mapping")
+            continue
+        if schema is None:
+            continue
+        for key, value in values.items():
+            if key not in schema:
+                errors.append(_unknown(key, schema, f"{where}{section}."))
+                continue
+            expected = _kind_error(value, schema[key])
+            if expected:
+                errors.append(f"{where}{section}.{key} must be {expected}, got {value!r}")
+    return errors
+
+
+def merge_config(base: Dict[str, Any], layer: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``base`` with ``layer`` merged in; mappings merge key by key."""
+
+    merged = copy.deepcopy(base)
+    for key, value in layer.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Validated base sections and override sets of one configuration file."""
+
+    digest: str
+    base: Dict[str, Any]
+    overrides: Dict[str, Dict[str, Any]]
+
+    def resolve(self, override: Optional[str] = None) -> Dict[str, Any]:
+        """Return a private copy of the configuration with override set ``override`` applied."""
+
+        if override is None:
+            return copy.deepcopy(self.base)
+        layer = self.overrides.get(override)
+        if layer is None:
+            available = ", ".join(sorted(self.overrides)) or "none"
+            raise ValueError(f"unknown override set '{override}' (available: {available})")
+        return merge_config(self.base, layer)
+
+
+def compile_config(raw: Dict[str, Any], digest: str = "") -> ConfigSnapshot:
+    """Validate a parsed configuration and split off its override sets.
+
+    Raises ``ValueError`` listing every schema violation.
+    """
+
+    base = dict(raw)
+    overrides = base.pop(OVERRIDES_KEY, None) or {}
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{OVERRIDES_KEY} must be a mapping of named override sets")
+    errors = validate_config(base)
+    for name, layer in overrides.items():
+        if not isinstance(layer, dict):
+            errors.append(f"{OVERRIDES_KEY}.{name} must be a mapping")
+            continue
+        errors.extend(validate_config(layer, f"{OVERRIDES_KEY}.{name}."))
+    if errors:
+        raise ValueError("; ".join(errors))
+    return ConfigSnapshot(digest=digest, base=base, overrides=overrides)
+
+
+class ConfigCache:
+    """Load configuration files as :class:`ConfigSnapshot` objects.
+
+    ``parse`` turns the file text into nested dictionaries. ``stats`` counts
+    how loads were served: ``memory`` (unchanged file already loaded by this
+    process), ``snapshot`` (compiled JSON from an earlier run) or ``compiled``.
+    """
+
+    def __init__(self, parse: Callable[[str], Dict[str, Any]], cache_dir: Optional[Path] = None) -> None:
+        self._parse = parse
+        self._cache_dir = cache_dir
+        self._code_version: Optional[bytes] = None
+        self._lock = threading.Lock()
+        self._memory: Dict[Path, Tuple[Tuple[int, int], ConfigSnapshot]] = {}
+        self.stats = {"memory": 0, "snapshot": 0, "compiled": 0}
+
+    def cache_dir(self, path: Path) -> Path:
+        if self._cache_dir is not None:
+            return self._cache_dir
+        return Path(os.environ.get(CACHE_DIR_ENV) or path.parent / "__pycache__")
+
+    def load(self, path: Path) -> ConfigSnapshot:
+        """Return the snapshot of ``path``; raises ``ValueError`` for invalid files."""
+
+        path = path.expanduser().resolve()
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._memory.get(path)
+            if entry is not None and entry[0] == key:
+                self.stats["memory"] += 1
+                return entry[1]
+
+        source = path.read_bytes()
+        digest = hashlib.sha256(source + b"\0" + self.code_version()).hexdigest()[:16]
+        cached = self.cache_dir(path) / f"{path.stem}.{digest}.json"
+        snapshot = self._read_snapshot(cached, digest)
+        if snapshot is not None:
+            origin = "snapshot"
+        else:
+            origin = "compiled"
+            snapshot = compile_config(self._parse(source.decode("utf-8")), digest)
+            if self._write_snapshot(cached, snapshot):
+                self._remove_stale_snapshots(cached, path.stem)
+        with self._lock:
+            self.stats[origin] += 1
+            self._memory[path] = (key, snapshot)
+        return snapshot
+
+    def code_version(self) -> bytes:
+        """Hash of the code that produces a snapshot: this module and the module of ``parse``."""
+
+        if self._code_version is None:
+            version = hashlib.sha256()
+            for function in (compile_config, self._parse):
+                try:
+                    version.update(Path(inspect.getsourcefile(function) or "").read_bytes())
+                except (OSError, TypeError):
+                    # Without a source file (frozen build) fall back to the parser's name.
+                    version.update(getattr(self._parse, "__qualname__", repr(self._parse)).encode())
+            self._code_version = version.hexdigest().encode()
+        return self._code_version
+
+    @staticmethod
+    def _remove_stale_snapshots(cached: Path, stem: str) -> None:
+        pattern = re.compile(re.escape(stem) + r"\.[0-9a-f]{16}\.json")
+        try:
+            candidates = list(cached.parent.iterdir())
+        except OSError:
+            return
+        for candidate in candidates:
+            if candidate != cached and pattern.fullmatch(candidate.name):
+                try:
+                    candidate.unlink()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _read_snapshot(cached: Path, digest: str) -> Optional[ConfigSnapshot]:
+        try:
+            data = json.loads(cached.read_text(encoding="utf-8"))
+            return ConfigSnapshot(digest=digest, base=data["base"], overrides=data["overrides"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _write_snapshot(cached: Path, snapshot: ConfigSnapshot) -> bool:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            temporary = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            temporary.write_text(
+                json.dumps({"base": snapshot.base, "overrides": snapshot.overrides}),
+                encoding="utf-8",
+            )
+            os.replace(temporary, cached)
+        except OSError:
+            # A read-only configuration folder still works, it just compiles every run.
+            return False
+        return True
@@ -0,0 +1,34 @@
+"""Deferred imports of heavy dependencies.
+
+``grpc``, ``numpy`` and protobuf together take a few hundred milliseconds to
+import. Invocations that only print ``--help``, validate a configuration or
+fail early never need them, so modules bind them with :func:`lazy_import` and
+the import runs on the first attribute access instead.
+"""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return module ``name``, executing it only when an attribute is used.
+
+    Already imported modules are returned as they are. Parent packages of a
+    dotted ``name`` are imported eagerly, so keep those light. Raises
+    ``ModuleNotFoundError`` right away when the module is not installed.
+    """
+
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
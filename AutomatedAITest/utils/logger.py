@@ -1,26 +1,239 @@
-"""Logging utilities for the AutomatedAITest package."""
+"""Logging utilities for the AutomatedAITest package.
+
+In the default ``sync`` mode the handlers write on the thread that logs. The
+``async`` mode hands records to a bounded queue drained by a
+:class:`logging.handlers.QueueListener` thread, so that verbose logging does
+not put disk and console writes on the sampling thread. When the queue fills
+up, low-priority records (``TRACE`` by default) are dropped and counted while
+the other records wait for room for a bounded time.
+
+With the ``json`` format the log file holds one JSON object per record. Next
+to the message, records carry the run and case ids of a :class:`LogContext`,
+the current tick index and the ``rpc``/``latency_ms``/``trace`` fields passed
+in ``extra``, so ``analyze_log.py`` can rebuild a latency timeline offline.
+"""
 from __future__ import annotations
 
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
 from logging import Logger
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 _LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+TRACE = 5
+# Custom trace level below DEBUG for verbose gRPC and per-tick tracing.
+logging.addLevelName(TRACE, "TRACE")
+
+LOG_MODES = ("sync", "async")
+LOG_FORMATS = ("text", "json")
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BACKUP_COUNT = 5
+# Records above the drop level wait this long for room in a full queue.
+_BLOCK_TIMEOUT_S = 1.0
+# Low-priority records are dropped once the queue is this full, which keeps
+# room for warnings and errors.
+_DROP_WATERMARK = 0.75
+
 
 def _resolve_level(level_name: str) -> int:
     """Resolve a logging level from a string representation."""
     normalized = level_name.upper()
     if normalized == "TRACE":
-        # Custom trace level below DEBUG for verbose gRPC tracing if required.
-        logging.addLevelName(5, "TRACE")
-        return 5
+        return TRACE
     return getattr(logging, normalized, logging.INFO)
 
 
-def setup_logging(level: str, log_file: Path, logger_name: str = "AutomatedAITest") -> Logger:
+# Optional record attributes written by the JSON formatter, in this order.
+STRUCTURED_FIELDS = ("run_id", "case_id", "tick", "rpc", "latency_ms", "tick_start", "trace")
+
+
+class LogContext(logging.Filter):
+    """Stamp the run id, case id and tick index onto every record of a logger.
+
+    The run id defaults to a random 12 digit hex string; ``case_id`` and
+    ``tick`` are updated by the workflow while it runs.
+    """
+
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        super().__init__()
+        self.run_id = run_id or os.urandom(6).hex()
+        self.case_id: Optional[str] = None
+        self.tick: Optional[int] = None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = self.run_id
+        if self.case_id is not None:
+            record.case_id = self.case_id
+        if self.tick is not None and not hasattr(record, "tick"):
+            record.tick = self.tick
+        return True
+
+
+def log_context(logger: Logger) -> LogContext:
+    """Return the :class:`LogContext` of ``logger``, installing one if needed."""
+
+    for existing in logger.filters:
+        if isinstance(existing, LogContext):
+            return existing
+    context = LogContext()
+    logger.addFilter(context)
+    return context
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        for name in STRUCTURED_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        entry["msg"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+def read_json_log(path: Path) -> List[Dict[str, Any]]:
+    """Return the records of a ``json`` log file, skipping lines that are not JSON."""
+
+    records = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    return records
+
+
+class RotatingLogFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotate the log file by size and/or age.
+
+    Backups are numbered ``<file>.1`` to ``<file>.<backup_count>`` whichever
+    limit triggered the rotation.
+    """
+
+    def __init__(self, filename: Path, max_bytes: int = 0, interval_s: float = 0.0, backup_count: int = DEFAULT_BACKUP_COUNT) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.interval_s = interval_s
+        self._rollover_at = time.time() + interval_s if interval_s > 0 else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802 - logging API
+        if self._rollover_at is not None and time.time() >= self._rollover_at:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:  # noqa: N802 - logging API
+        super().doRollover()
+        if self._rollover_at is not None:
+            self._rollover_at = time.time() + self.interval_s
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The sentinel must not be lost to a full queue.
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogHandler(logging.handlers.QueueHandler):
+    """Queue records for a listener thread that runs ``handlers``.
+
+    Records at or below ``drop_level`` are dropped, and counted, once the
+    queue is three quarters full; other records wait up to one second for
+    room and are only dropped when the listener does not catch up.
+    """
+
+    def __init__(self, handlers, queue_size: int = DEFAULT_QUEUE_SIZE, drop_level: int = TRACE) -> None:
+        if queue_size < 1:
+            raise ValueError(f"Log queue size must be positive, got {queue_size}")
+        super().__init__(queue.Queue(queue_size))
+        self.drop_level = drop_level
+        self.queued = 0
+        self.dropped: Dict[str, int] = {}
+        self.max_depth = 0
+        self._high_water = max(1, int(queue_size * _DROP_WATERMARK))
+        self._counter_lock = threading.Lock()
+        self._listener = _Listener(self.queue, *handlers)
+        self._listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so the record needs no pickling:
+        # only merge the arguments and leave the formatting to the listener.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        depth = self.queue.qsize()
+        try:
+            if record.levelno <= self.drop_level:
+                if depth >= self._high_water:
+                    raise queue.Full
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=_BLOCK_TIMEOUT_S)
+        except queue.Full:
+            with self._counter_lock:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+            return
+        with self._counter_lock:
+            self.queued += 1
+            self.max_depth = max(self.max_depth, depth + 1)
+
+    def statistics(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            return {
+                "mode": "async",
+                "queued": self.queued,
+                "dropped": dict(self.dropped),
+                "max_queue_depth": self.max_depth,
+            }
+
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            if self.dropped:
+                summary = ", ".join(f"{count} {name}" for name, count in sorted(self.dropped.items()))
+                record = logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0,
+                    "Dropped log records under load: %s", (summary,), None,
+                )
+                self.queue.put(record)
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        super().close()
+
+
+def setup_logging(
+    level: str,
+    log_file: Path,
+    logger_name: str = "AutomatedAITest",
+    mode: str = "sync",
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    drop_level: str = "TRACE",
+    max_bytes: int = 0,
+    rotate_interval_s: float = 0.0,
+    backup_count: int = DEFAULT_BACKUP_COUNT,
+    log_format: str = "text",
+    run_id: Optional[str] = None,
+) -> Logger:
     """Configure application wide logging.
 
     Parameters
@@ -32,6 +245,18 @@ def setup_logging(level: str, log_file: Path, logger_name: str = "AutomatedAITes
         required.
     logger_name:
         Name of the logger instance to create or retrieve.
+    mode:
+        ``sync`` writes on the logging thread, ``async`` through a bounded
+        queue of ``queue_size`` records whose ``drop_level`` records are
+        dropped under load (see :class:`AsyncLogHandler`).
+    max_bytes, rotate_interval_s, backup_count:
+        Rotate the log file once it exceeds ``max_bytes`` or is older than
+        ``rotate_interval_s``; ``0`` disables the respective limit.
+    log_format:
+        ``text`` or ``json`` (JSON lines) for the log file; the console
+        always receives text.
+    run_id:
+        Run id of the :class:`LogContext`, random by default.
 
     Returns
     -------
@@ -39,9 +264,16 @@ def setup_logging(level: str, log_file: Path, logger_name: str = "AutomatedAITes
         Configured :class:`logging.Logger` instance with both console and file
         handlers installed.
     """
+    if mode not in LOG_MODES:
+        raise ValueError(f"Unknown logging mode '{mode}', expected one of {', '.join(LOG_MODES)}")
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', expected one of {', '.join(LOG_FORMATS)}")
     resolved_level = _resolve_level(level)
     logger = logging.getLogger(logger_name)
     logger.setLevel(resolved_level)
+    context = log_context(logger)
+    if run_id:
+        context.run_id = run_id
 
     # Prevent duplicate handlers when running multiple instances or tests.
     if logger.handlers:
@@ -52,15 +284,28 @@ def setup_logging(level: str, log_file: Path, logger_name: str = "AutomatedAITes
 
     formatter = logging.Formatter(_LOG_FORMAT)
 
-    file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
+    if max_bytes > 0 or rotate_interval_s > 0:
+        file_handler: logging.Handler = RotatingLogFileHandler(
+            log_file_path, max_bytes, rotate_interval_s, backup_count
+        )
+    else:
+        file_handler = logging.FileHandler(log_file_path, encoding="utf-8")
     file_handler.setLevel(resolved_level)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(JsonLineFormatter() if log_format == "json" else formatter)
 
     console_handler = logging.StreamHandler()
     console_handler.setLevel(resolved_level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+
+    if mode == "async":
+        queue_handler = AsyncLogHandler(
+            (file_handler, console_handler), queue_size, _resolve_level(drop_level)
+        )
+        queue_handler.setLevel(resolved_level)
+        logger.addHandler(queue_handler)
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
 
     logger.debug("Logging initialised at level %s -> %s", level, resolved_level)
     return logger
@@ -75,3 +320,21 @@ def update_log_level(logger: Logger, level: Optional[str]) -> None:
     for handler in logger.handlers:
         handler.setLevel(resolved_level)
     logger.debug("Logger level updated dynamically to %s", level)
+
+
+def logging_statistics(logger: Logger) -> Optional[Dict[str, Any]]:
+    """Queue and drop counters of an ``async`` logger; ``None`` in ``sync`` mode."""
+
+    for handler in logger.handlers:
+        if isinstance(handler, AsyncLogHandler):
+            return handler.statistics()
+    return None
+
+
+def shutdown_logging(logger: Logger) -> None:
+    """Flush the queued records of an ``async`` logger and stop its listener."""
+
+    for handler in list(logger.handlers):
+        if isinstance(handler, AsyncLogHandler):
+            logger.removeHandler(handler)
+            handler.close()
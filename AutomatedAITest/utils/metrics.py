@@ -0,0 +1,306 @@
+"""Per-RPC instrumentation of the PROVEtech:TA client.
+
+:class:`RpcMetrics` counts calls, errors, retries and payload bytes per RPC,
+keeps latency histograms per RPC and per monitoring tick phase, and renders
+them as a JSON summary or in the Prometheus/OpenMetrics text formats. RPCs are
+keyed by the names used in the automation logs without their per-signal
+suffix, so ``GetSignal[IconDetection.Result]`` is accounted as ``GetSignal``.
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRIC_PREFIX = "automatedaitest"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in seconds.
+
+    Buckets grow by a factor of 2**(1/8) from 10 µs, so quantile estimates are
+    within about 5 % of the exact value while memory stays bounded by the
+    number of distinct buckets hit.
+    """
+
+    _MIN_S = 1e-5
+    _LOG_RATIO = math.log(2.0) / 8.0
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def observe(self, value_s: float) -> None:
+        value_s = max(value_s, 0.0)
+        index = 0 if value_s <= self._MIN_S else math.ceil(math.log(value_s / self._MIN_S) / self._LOG_RATIO)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value_s
+        self.min = min(self.min, value_s)
+        self.max = max(self.max, value_s)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0..1); 0.0 when empty."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                # Geometric middle of the bucket, clamped to the observed range.
+                estimate = self._MIN_S * math.exp((index - 0.5) * self._LOG_RATIO)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        summary: Dict[str, Any] = {"count": self.count}
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}"] = round(self.quantile(q) * 1000.0, 3)
+        summary["mean"] = round(self.sum / self.count * 1000.0, 3)
+        summary["max"] = round(self.max * 1000.0, 3)
+        return summary
+
+
+class _RpcStats:
+    __slots__ = ("calls", "errors", "retries", "latency", "request_bytes", "response_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.latency = LatencyHistogram()
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+def _rpc_key(name: str) -> str:
+    return name.split("[", 1)[0]
+
+
+def payload_size(message: Any) -> int:
+    """Serialized size of a protobuf ``message``; 0 for already decoded replies."""
+
+    byte_size = getattr(message, "ByteSize", None)
+    return byte_size() if byte_size is not None else 0
+
+
+class RpcMetrics:
+    """Thread-safe collector for RPC and monitoring tick measurements."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rpcs: Dict[str, _RpcStats] = {}
+        self._phases: Dict[str, LatencyHistogram] = {}
+
+    def _stats(self, name: str) -> _RpcStats:
+        key = _rpc_key(name)
+        stats = self._rpcs.get(key)
+        if stats is None:
+            stats = self._rpcs[key] = _RpcStats()
+        return stats
+
+    def observe(self, name: str, latency_s: float, request_bytes: int = 0, response_bytes: int = 0) -> None:
+        """Record a completed call of RPC ``name``."""
+
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.latency.observe(latency_s)
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def add_response_bytes(self, name: str, size: int) -> None:
+        """Account reply bytes of RPCs whose replies are decoded from raw bytes."""
+
+        with self._lock:
+            self._stats(name).response_bytes += size
+
+    def error(self, name: str, status: str) -> None:
+        with self._lock:
+            errors = self._stats(name).errors
+            errors[status] = errors.get(status, 0) + 1
+
+    def retry(self, name: str) -> None:
+        with self._lock:
+            self._stats(name).retries += 1
+
+    def phase(self, name: str, duration_s: float) -> None:
+        """Record the duration of one phase of a monitoring tick."""
+
+        with self._lock:
+            histogram = self._phases.get(name)
+            if histogram is None:
+                histogram = self._phases[name] = LatencyHistogram()
+            histogram.observe(duration_s)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the measurements as a JSON-serialisable dictionary."""
+
+        with self._lock:
+            rpcs = {}
+            for name, stats in sorted(self._rpcs.items()):
+                rpcs[name] = {
+                    "calls": stats.calls,
+                    "errors": dict(stats.errors),
+                    "retries": stats.retries,
+                    "latency_ms": stats.latency.summary_ms(),
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                }
+            phases = {name: histogram.summary_ms() for name, histogram in sorted(self._phases.items())}
+        return {"rpc": rpcs, "tick_ms": phases}
+
+    def render(self, labels: Optional[Dict[str, str]] = None, openmetrics: bool = False) -> str:
+        """Render the metrics in the Prometheus text or OpenMetrics format."""
+
+        constant = dict(labels or {})
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, Dict[str, str], float]]) -> None:
+            samples = list(samples)
+            if not samples:
+                return
+            metric = f"{METRIC_PREFIX}_{name}"
+            # OpenMetrics names counter families without the _total suffix.
+            family_name = metric[: -len("_total")] if openmetrics and kind == "counter" else metric
+            lines.append(f"# HELP {family_name} {help_text}")
+            lines.append(f"# TYPE {family_name} {kind}")
+            for suffix, sample_labels, value in samples:
+                lines.append(f"{metric}{suffix}{_format_labels({**sample_labels, **constant})} {_format_value(value)}")
+
+        with self._lock:
+            rpcs = sorted(self._rpcs.items())
+            phases = sorted(self._phases.items())
+            family(
+                "rpc_calls_total", "counter", "Completed RPC calls.",
+                (("", {"method": name}, stats.calls) for name, stats in rpcs),
+            )
+            family(
+                "rpc_errors_total", "counter", "Failed RPC calls by gRPC status.",
+                (
+                    ("", {"method": name, "code": code}, count)
+                    for name, stats in rpcs
+                    for code, count in sorted(stats.errors.items())
+                ),
+            )
+            family(
+                "rpc_retries_total", "counter", "RPC attempts repeated after a retryable failure.",
+                (("", {"method": name}, stats.retries) for name, stats in rpcs),
+            )
+            family(
+                "rpc_request_bytes_total", "counter", "Serialized request payload bytes.",
+                (("", {"method": name}, stats.request_bytes) for name, stats in rpcs),
+            )
+            family(
+                "rpc_response_bytes_total", "counter", "Serialized response payload bytes.",
+                (("", {"method": name}, stats.response_bytes) for name, stats in rpcs),
+            )
+            family(
+                "rpc_latency_seconds", "summary", "RPC latency.",
+                _summary_samples("method", rpcs, lambda stats: stats.latency),
+            )
+            family(
+                "tick_phase_seconds", "summary", "Duration of the monitoring tick phases.",
+                _summary_samples("phase", phases, lambda histogram: histogram),
+            )
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path, labels: Optional[Dict[str, str]] = None) -> Path:
+        """Atomically write the Prometheus text format to ``path``.
+
+        The file can be picked up by the node_exporter textfile collector.
+        """
+
+        path = path.expanduser().resolve()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(self.render(labels), encoding="utf-8")
+        os.replace(temporary, path)
+        return path
+
+
+def _summary_samples(label: str, items, histogram_of) -> List[Tuple[str, Dict[str, str], float]]:
+    samples: List[Tuple[str, Dict[str, str], float]] = []
+    for name, item in items:
+        histogram = histogram_of(item)
+        if not histogram.count:
+            continue
+        for q in QUANTILES:
+            samples.append(("", {label: name, "quantile": str(q)}, histogram.quantile(q)))
+        samples.append(("_sum", {label: name}, histogram.sum))
+        samples.append(("_count", {label: name}, histogram.count))
+    return samples
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), chr(92) + "n")}"'
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(round(value, 9))
+
+
+class MetricsServer:
+    """Serve ``render(openmetrics)`` on ``http://host:port/metrics`` from a daemon thread."""
+
+    def __init__(self, host: str, port: int, render: Callable[[bool], str]) -> None:
+        # http.server pulls in the email package; only pay for it when serving.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = render(openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> "MetricsServer":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,214 @@
+"""Lazy loading of protobuf messages and gRPC stubs from a ``.proto`` file.
+
+The PROVEtech:TA API file defines more than a thousand RPCs. Generating and
+importing Python code for all of them would slow down every run, so the
+``.proto`` file is compiled once into a serialized ``FileDescriptorSet`` that
+is cached next to the Python bytecode. Runs load the cached descriptors into a
+private pool and build message classes and service stubs on first access
+only.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from utils.lazy_import import lazy_import
+
+descriptor_pb2 = lazy_import("google.protobuf.descriptor_pb2")
+descriptor_pool = lazy_import("google.protobuf.descriptor_pool")
+message_factory = lazy_import("google.protobuf.message_factory")
+
+# Overrides the directory holding compiled descriptor sets.
+CACHE_DIR_ENV = "AUTOMATEDAITEST_PROTO_CACHE"
+
+
+class ProtoCompileError(RuntimeError):
+    """Raised when the ``.proto`` file cannot be compiled."""
+
+
+def _message_class(descriptor) -> type:
+    if hasattr(message_factory, "GetMessageClass"):
+        return message_factory.GetMessageClass(descriptor)
+    return message_factory.MessageFactory(descriptor.file.pool).GetPrototype(descriptor)  # pragma: no cover
+
+
+def _stub_method(channel, method) -> Callable[..., Any]:
+    request = _message_class(method.input_type)
+    response = _message_class(method.output_type)
+    if method.client_streaming:
+        factory = channel.stream_stream if method.server_streaming else channel.stream_unary
+    else:
+        factory = channel.unary_stream if method.server_streaming else channel.unary_unary
+    return factory(
+        f"/{method.containing_service.full_name}/{method.name}",
+        request_serializer=request.SerializeToString,
+        response_deserializer=response.FromString,
+    )
+
+
+class ProtoLoader:
+    """Expose the messages and services of ``proto_path`` on demand.
+
+    The descriptor set is cached as ``<stem>.<digest>.desc`` in
+    ``cache_dir`` (by default the ``__pycache__`` folder next to the
+    ``.proto`` file, or ``$AUTOMATEDAITEST_PROTO_CACHE``), where ``digest``
+    hashes the ``.proto`` contents so that edits trigger a recompilation.
+    """
+
+    def __init__(self, proto_path: Path, cache_dir: Optional[Path] = None) -> None:
+        self.proto_path = proto_path.resolve()
+        if cache_dir is None:
+            cache_dir = Path(os.environ.get(CACHE_DIR_ENV) or self.proto_path.parent / "__pycache__")
+        self.cache_dir = cache_dir
+        self._lock = threading.RLock()
+        self._pool: Optional[descriptor_pool.DescriptorPool] = None
+        self._package = ""
+        self._messages: Dict[str, type] = {}
+        self._stubs: Dict[str, type] = {}
+
+    @property
+    def pool(self) -> descriptor_pool.DescriptorPool:
+        """Descriptor pool holding the compiled file, loaded on first use."""
+
+        with self._lock:
+            if self._pool is None:
+                descriptor_set = descriptor_pb2.FileDescriptorSet.FromString(
+                    self.descriptor_set()
+                )
+                pool = descriptor_pool.DescriptorPool()
+                for file_proto in descriptor_set.file:
+                    pool.Add(file_proto)
+                self._package = descriptor_set.file[-1].package
+                self._pool = pool
+            return self._pool
+
+    def _full_name(self, name: str) -> str:
+        if self._pool is None:
+            self.pool  # loading the file sets the package name
+        return f"{self._package}.{name}" if self._package else name
+
+    def descriptor_set(self) -> bytes:
+        """Return the serialized descriptor set, compiling it when not cached."""
+
+        source = self.proto_path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()[:16]
+        cached = self.cache_dir / f"{self.proto_path.stem}.{digest}.desc"
+        try:
+            return cached.read_bytes()
+        except OSError:
+            pass
+        data = self._compile()
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temporary = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, cached)
+        except OSError:
+            # A read-only installation still works, it just compiles every run.
+            pass
+        return data
+
+    def _compile(self) -> bytes:
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "descriptor_set.desc"
+            arguments = [
+                f"-I{self.proto_path.parent}",
+                "--include_imports",
+                f"--descriptor_set_out={output}",
+                str(self.proto_path),
+            ]
+            try:
+                from grpc_tools import protoc
+            except ImportError:
+                executable = shutil.which("protoc")
+                if executable is None:
+                    raise ProtoCompileError(
+                        f"Compiling {self.proto_path.name} requires grpcio-tools or protoc on PATH"
+                    ) from None
+                completed = subprocess.run(
+                    [executable, *arguments], capture_output=True, text=True, check=False
+                )
+                status, details = completed.returncode, completed.stderr.strip()
+            else:
+                status, details = protoc.main(["protoc", *arguments]), ""
+            if status != 0 or not output.exists():
+                raise ProtoCompileError(
+                    f"Compiling {self.proto_path.name} failed with status {status}: {details}"
+                )
+            return output.read_bytes()
+
+    def message_class(self, name: str) -> type:
+        """Return the message class ``name`` (without package), building it once.
+
+        Raises ``KeyError`` when the file defines no such message.
+        """
+
+        with self._lock:
+            cls = self._messages.get(name)
+            if cls is None:
+                cls = _message_class(self.pool.FindMessageTypeByName(self._full_name(name)))
+                self._messages[name] = cls
+            return cls
+
+    def enum_type(self, name: str) -> Any:
+        """Return an ``EnumTypeWrapper`` for the top-level enum ``name``."""
+
+        from google.protobuf.internal.enum_type_wrapper import EnumTypeWrapper
+
+        return EnumTypeWrapper(self.pool.FindEnumTypeByName(self._full_name(name)))
+
+    def service_descriptor(self, service_name: str) -> Any:
+        """Return the descriptor of ``service_name`` (without package).
+
+        Raises ``KeyError`` when the file defines no such service.
+        """
+
+        return self.pool.FindServiceByName(self._full_name(service_name))
+
+    def stub_class(self, service_name: str) -> type:
+        """Return a client stub class for ``service_name``, building it once.
+
+        Stub instances expose every RPC of the service as an attribute; the
+        multicallable of an RPC (unary or streaming, as declared in the file)
+        and its message classes are created when the attribute is first used.
+        Raises ``KeyError`` when the file defines no such service.
+        """
+
+        with self._lock:
+            stub = self._stubs.get(service_name)
+            if stub is None:
+                service = self.service_descriptor(service_name)
+                stub = type(
+                    f"{service_name}Stub",
+                    (_LazyStub,),
+                    {
+                        "__doc__": f"Client stub for the {service_name} service.",
+                        "_methods": dict(service.methods_by_name),
+                    },
+                )
+                self._stubs[service_name] = stub
+            return stub
+
+
+class _LazyStub:
+    _methods: Dict[str, Any] = {}
+
+    def __init__(self, channel) -> None:
+        self._channel = channel
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = self._methods.get(name)
+        if method is None:
+            raise AttributeError(f"{type(self).__name__} has no RPC {name!r}")
+        multicallable = _stub_method(self._channel, method)
+        setattr(self, name, multicallable)
+        return multicallable
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._methods))
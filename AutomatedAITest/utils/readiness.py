@@ -0,0 +1,173 @@
+"""Readiness probing for freshly launched gRPC servers.
+
+Instead of sleeping for a fixed delay after launching PROVEtech:TA, the probe
+polls the TCP port with exponential backoff and, once the port accepts
+connections, issues a cheap RPC until the server answers. The child process is
+checked before every attempt so that an early exit aborts the wait at once.
+Observed start-up latencies are accumulated per endpoint in a histogram file.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+DEFAULT_STARTUP_TIMEOUT_S = 60.0
+
+# Upper bounds in seconds of the start-up latency histogram buckets; the
+# last bucket collects everything above the largest bound.
+LATENCY_BUCKETS_S = (0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 55.0)
+
+
+class ProcessExitedError(RuntimeError):
+    """Raised when the monitored process exits before the server is ready."""
+
+    def __init__(self, returncode: int) -> None:
+        super().__init__(f"process exited with code {returncode}")
+        self.returncode = returncode
+
+
+class ReadinessProbe:
+    """Wait until a gRPC server accepts connections and answers an RPC.
+
+    ``started_at`` is the monotonic instant the server process was launched;
+    the reported latencies are measured from there. Both stages retry with a
+    delay growing from ``initial_delay_s`` by ``backoff`` up to
+    ``max_delay_s``. Probe callables signal "not ready yet" by raising
+    ``ConnectionError``, ``TimeoutError`` or ``OSError``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout_s: float = DEFAULT_STARTUP_TIMEOUT_S,
+        process: Optional[subprocess.Popen] = None,
+        started_at: Optional[float] = None,
+        initial_delay_s: float = 0.05,
+        max_delay_s: float = 1.0,
+        backoff: float = 2.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.process = process
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.deadline = self.started_at + timeout_s
+        self.initial_delay_s = initial_delay_s
+        self.max_delay_s = max_delay_s
+        self.backoff = backoff
+        self.attempts = 0
+        self._port_open_at: Optional[float] = None
+
+    def wait(self, rpc_probe: Callable[[float], Any]) -> Dict[str, Any]:
+        """Block until ``rpc_probe(timeout_s)`` succeeds and return the timings."""
+
+        for delay in self._delays():
+            timeout_s = self._attempt_timeout()
+            try:
+                if self._port_open_at is None:
+                    with socket.create_connection((self.host, self.port), timeout=timeout_s):
+                        self._port_open_at = time.monotonic()
+                rpc_probe(timeout_s)
+                return self._statistics()
+            except (ConnectionError, TimeoutError, OSError):
+                time.sleep(min(delay, self._remaining()))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def wait_async(self, rpc_probe: Callable[[float], Awaitable[Any]]) -> Dict[str, Any]:
+        """asyncio variant of :meth:`wait` for ``grpc.aio`` channels."""
+
+        import asyncio
+
+        for delay in self._delays():
+            timeout_s = self._attempt_timeout()
+            try:
+                if self._port_open_at is None:
+                    _, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), timeout=timeout_s
+                    )
+                    writer.close()
+                    self._port_open_at = time.monotonic()
+                await rpc_probe(timeout_s)
+                return self._statistics()
+            except (ConnectionError, TimeoutError, OSError, asyncio.TimeoutError):
+                await asyncio.sleep(min(delay, self._remaining()))
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _delays(self) -> Iterator[float]:
+        """Yield the backoff delay of each attempt until the deadline passes."""
+
+        delay = self.initial_delay_s
+        while True:
+            if self.process is not None and self.process.poll() is not None:
+                raise ProcessExitedError(self.process.returncode)
+            if self._remaining() <= 0:
+                stage = "port" if self._port_open_at is None else "RPC probe"
+                raise TimeoutError(
+                    f"{self.host}:{self.port} not ready after "
+                    f"{time.monotonic() - self.started_at:.1f}s (waiting for {stage})"
+                )
+            self.attempts += 1
+            yield delay
+            delay = min(delay * self.backoff, self.max_delay_s)
+
+    def _remaining(self) -> float:
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def _attempt_timeout(self) -> float:
+        return max(min(self._remaining(), self.max_delay_s), 0.01)
+
+    def _statistics(self) -> Dict[str, Any]:
+        ready_at = time.monotonic()
+        port_open_at = self._port_open_at or ready_at
+        return {
+            "port_open_s": round(port_open_at - self.started_at, 3),
+            "ready_s": round(ready_at - self.started_at, 3),
+            "attempts": self.attempts,
+        }
+
+
+class StartupLatencyHistogram:
+    """Accumulate start-up latencies per endpoint in a JSON file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path.expanduser().resolve()
+
+    def record(self, endpoint: str, latency_s: float) -> Dict[str, Any]:
+        """Add ``latency_s`` to the histogram of ``endpoint`` and return it."""
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        entry = data.get(endpoint)
+        if not isinstance(entry, dict) or entry.get("buckets_s") != list(LATENCY_BUCKETS_S):
+            entry = {
+                "buckets_s": list(LATENCY_BUCKETS_S),
+                "counts": [0] * (len(LATENCY_BUCKETS_S) + 1),
+                "count": 0,
+                "sum_s": 0.0,
+                "min_s": None,
+                "max_s": None,
+            }
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS_S) if latency_s <= bound),
+            len(LATENCY_BUCKETS_S),
+        )
+        entry["counts"][index] += 1
+        entry["count"] += 1
+        entry["sum_s"] = round(entry["sum_s"] + latency_s, 3)
+        entry["min_s"] = latency_s if entry["min_s"] is None else min(entry["min_s"], latency_s)
+        entry["max_s"] = latency_s if entry["max_s"] is None else max(entry["max_s"], latency_s)
+        entry["last_s"] = latency_s
+        data[endpoint] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temporary, self.path)
+        return entry
@@ -0,0 +1,260 @@
+"""Per-RPC retry, deadline and hedging policies plus a polling circuit breaker.
+
+Policies are looked up by the RPC names used in the automation logs, such as
+``GetSignal``, ``MeasureIsRunning`` or ``LoadModel``; a per-signal suffix like
+``GetSignal[IconDetection.Result]`` is ignored. Only idempotent RPCs are ever
+retried or hedged, so a failed ``MeasureStart`` is never sent twice unless
+``rpc.methods.MeasureStart`` explicitly marks it ``idempotent``; the shared
+``rpc.default`` cannot.
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# gRPC status codes that are retried unless a policy says otherwise.
+DEFAULT_RETRY_CODES = ("UNAVAILABLE", "RESOURCE_EXHAUSTED", "ABORTED")
+
+# Read-only RPCs of the workflow; these may be retried and hedged by default.
+IDEMPOTENT_RPCS = frozenset(
+    {
+        "GetSignal",
+        "GetSignalInfo",
+        "GetValidSignalList",
+        "GetVersion",
+        "GetResult",
+        "MeasureIsRunning",
+        "EvaluationGetSampleCount",
+        "EvaluationGetSamplingRate",
+        "EvaluationGetStartTime",
+        "EvaluationGetSignalArray",
+    }
+)
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class RpcPolicy:
+    """How one RPC is called.
+
+    ``timeout_s`` is the deadline of a single attempt (``None`` keeps the
+    global RPC timeout). Failed attempts with a status in ``retry_codes`` are
+    repeated up to ``max_attempts`` times in total after a jittered
+    exponential backoff. ``hedge_after_s`` sends a second, identical request
+    when the first one has not answered after that delay and uses whichever
+    reply arrives first.
+    """
+
+    idempotent: bool = False
+    timeout_s: Optional[float] = None
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    initial_backoff_s: float = 0.1
+    max_backoff_s: float = 2.0
+    backoff_multiplier: float = 2.0
+    retry_codes: Tuple[str, ...] = DEFAULT_RETRY_CODES
+    hedge_after_s: Optional[float] = None
+
+    @property
+    def attempts(self) -> int:
+        """Number of attempts actually allowed for this RPC."""
+
+        return max(self.max_attempts, 1) if self.idempotent else 1
+
+    @property
+    def hedging(self) -> bool:
+        return self.idempotent and bool(self.hedge_after_s)
+
+    @property
+    def is_plain(self) -> bool:
+        """True when calls need neither retries nor hedging."""
+
+        return self.attempts == 1 and not self.hedging
+
+    def should_retry(self, status_name: str, attempt: int) -> bool:
+        """Return whether attempt number ``attempt`` failing with ``status_name`` is retried."""
+
+        return attempt < self.attempts and status_name in self.retry_codes
+
+    def backoff_delays(self) -> Iterator[float]:
+        """Yield the delays before each retry ("full jitter" backoff)."""
+
+        ceiling = self.initial_backoff_s
+        while True:
+            yield random.uniform(0.0, ceiling)
+            ceiling = min(ceiling * self.backoff_multiplier, self.max_backoff_s)
+
+
+_POLICY_KEYS = {item.name for item in fields(RpcPolicy)}
+
+
+def _policy_overrides(section: Any, where: str) -> Dict[str, Any]:
+    if not isinstance(section, dict):
+        raise ValueError(f"{where} must be a mapping")
+    unknown = sorted(set(section) - _POLICY_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown keys in {where}: {', '.join(unknown)}")
+    overrides: Dict[str, Any] = {}
+    for key, value in section.items():
+        if key == "retry_codes":
+            if not isinstance(value, list):
+                raise ValueError(f"{where}.retry_codes must be a list of gRPC status names")
+            overrides[key] = tuple(str(code).upper() for code in value)
+        elif key == "idempotent":
+            overrides[key] = bool(value)
+        elif key == "max_attempts":
+            overrides[key] = int(value)
+        elif value == "" or value is None:
+            overrides[key] = None
+        else:
+            overrides[key] = float(value)
+    return overrides
+
+
+@dataclass
+class RpcPolicies:
+    """Policy lookup by RPC name with a shared default."""
+
+    default: Dict[str, Any] = field(default_factory=dict)
+    methods: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    _cache: Dict[str, RpcPolicy] = field(default_factory=dict, repr=False)
+
+    def for_rpc(self, name: str) -> RpcPolicy:
+        """Return the policy of ``name`` (``Method`` or ``Method[detail]``)."""
+
+        base = name.split("[", 1)[0]
+        policy = self._cache.get(base)
+        if policy is None:
+            # Method keys take precedence over the shared default.
+            policy = replace(
+                RpcPolicy(idempotent=base in IDEMPOTENT_RPCS),
+                **{**self.default, **self.methods.get(base, {})},
+            )
+            self._cache[base] = policy
+        return policy
+
+
+def parse_rpc_policies(section: Any) -> RpcPolicies:
+    """Build :class:`RpcPolicies` from the ``rpc`` configuration section.
+
+    Raises ``ValueError`` for malformed sections.
+    """
+
+    section = section or {}
+    if not isinstance(section, dict):
+        raise ValueError("rpc must be a mapping")
+    unknown = sorted(set(section) - {"default", "methods", "circuit_breaker"})
+    if unknown:
+        raise ValueError(f"Unknown keys in rpc: {', '.join(unknown)}")
+    methods = section.get("methods") or {}
+    if not isinstance(methods, dict):
+        raise ValueError("rpc.methods must be a mapping")
+    default = _policy_overrides(section.get("default") or {}, "rpc.default")
+    if "idempotent" in default:
+        raise ValueError("rpc.default.idempotent is not supported; mark single RPCs under rpc.methods")
+    policies = RpcPolicies(
+        default=default,
+        methods={
+            str(name): _policy_overrides(overrides or {}, f"rpc.methods.{name}")
+            for name, overrides in methods.items()
+        },
+    )
+    # Resolve every policy now, so that a bad combination fails at load time.
+    for name in (*IDEMPOTENT_RPCS, *policies.methods):
+        policies.for_rpc(name)
+    return policies
+
+
+class CircuitBreaker:
+    """Pause polling after repeated failures instead of aborting the run.
+
+    After ``failure_threshold`` consecutive failed ticks the circuit opens and
+    polling pauses for ``reset_timeout_s``; the next tick is a trial that
+    closes the circuit on success or re-opens it on failure. Once failures
+    have lasted ``max_open_s`` without a single success, :meth:`record_failure`
+    returns ``False`` and the caller should give up.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float, max_open_s: float) -> None:
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout_s = reset_timeout_s
+        self.max_open_s = max_open_s
+        self.consecutive_failures = 0
+        self.failed_ticks = 0
+        self.trips = 0
+        self.paused_s = 0.0
+        self._failing_since: Optional[float] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.consecutive_failures >= self.failure_threshold
+
+    def record_success(self) -> bool:
+        """Register a successful tick; return True when it closed the circuit."""
+
+        was_open = self.is_open
+        self.consecutive_failures = 0
+        self._failing_since = None
+        return was_open
+
+    def record_failure(self) -> bool:
+        """Register a failed tick; return False once the failures lasted too long."""
+
+        now = time.monotonic()
+        if self._failing_since is None:
+            self._failing_since = now
+        self.consecutive_failures += 1
+        self.failed_ticks += 1
+        if self.consecutive_failures == self.failure_threshold:
+            self.trips += 1
+        return now - self._failing_since < self.max_open_s
+
+    def pause_s(self) -> float:
+        """Delay before the next tick: ``reset_timeout_s`` while open, else 0."""
+
+        if not self.is_open:
+            return 0.0
+        self.paused_s += self.reset_timeout_s
+        return self.reset_timeout_s
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            "failed_ticks": self.failed_ticks,
+            "trips": self.trips,
+            "paused_s": round(self.paused_s, 3),
+        }
+
+
+@dataclass(frozen=True)
+class CircuitBreakerSettings:
+    """Parameters of the :class:`CircuitBreaker` created for each polling loop."""
+
+    failure_threshold: int = 5
+    reset_timeout_s: float = 5.0
+    max_open_s: float = 120.0
+
+    def create(self) -> CircuitBreaker:
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout_s, self.max_open_s)
+
+
+def parse_circuit_breaker(section: Any) -> Optional[CircuitBreakerSettings]:
+    """Read ``rpc.circuit_breaker``; ``None`` when the breaker is disabled.
+
+    Raises ``ValueError`` for malformed sections.
+    """
+
+    if not section:
+        return None
+    if not isinstance(section, dict):
+        raise ValueError("rpc.circuit_breaker must be a mapping")
+    unknown = sorted(set(section) - {item.name for item in fields(CircuitBreakerSettings)})
+    if unknown:
+        raise ValueError(f"Unknown keys in rpc.circuit_breaker: {', '.join(unknown)}")
+    settings = CircuitBreakerSettings(
+        failure_threshold=int(section.get("failure_threshold", 5)),
+        reset_timeout_s=float(section.get("reset_timeout_s", 5.0)),
+        max_open_s=float(section.get("max_open_s", 120.0)),
+    )
+    return settings if settings.failure_threshold > 0 else None
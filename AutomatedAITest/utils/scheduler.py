@@ -0,0 +1,126 @@
+"""Tick scheduling for the AutomatedAITest signal monitoring loop."""
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Callable, Dict, Optional
+
+SCHEDULE_MODES = ("interval", "fixed-rate")
+OVERRUN_POLICIES = ("skip", "coalesce")
+
+
+class TickScheduler:
+    """Compute the pause between monitoring ticks and record timing statistics.
+
+    In ``interval`` mode the scheduler reproduces the historic behaviour and
+    waits ``interval`` seconds after each tick finished, so the effective period
+    is the interval plus the time spent in RPCs. In ``fixed-rate`` mode ticks
+    target absolute instants ``origin + k * interval`` on a monotonic clock.
+    A tick that overruns one or more slots either drops them and resumes on the
+    next future slot (``skip``) or runs a single catch-up tick immediately
+    (``coalesce``); in both cases the schedule never drifts.
+
+    The scheduler does not sleep itself so that it can drive both the blocking
+    and the asyncio controllers.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        mode: str = "interval",
+        overrun_policy: str = "skip",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"Tick interval must be positive, got {interval}")
+        if mode not in SCHEDULE_MODES:
+            raise ValueError(f"Unknown schedule mode: {mode}")
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        self.interval = interval
+        self.mode = mode
+        self.overrun_policy = overrun_policy
+        self._clock = clock
+        self._origin: Optional[float] = None
+        self._target = 0.0
+        self._tick_start = 0.0
+        self.ticks = 0
+        self.overruns = 0
+        self.missed_ticks = 0
+        # Welford accumulators for the tick start lateness in seconds.
+        self._jitter_mean = 0.0
+        self._jitter_m2 = 0.0
+        self._jitter_max = 0.0
+
+    def start(self) -> float:
+        """Anchor the schedule at the current instant and return it."""
+
+        self._origin = self._clock()
+        self._target = self._origin
+        return self._origin
+
+    def elapsed(self) -> float:
+        """Seconds elapsed since :meth:`start`."""
+
+        assert self._origin is not None, "TickScheduler.start() was not called"
+        return self._clock() - self._origin
+
+    def tick_started(self) -> float:
+        """Record the beginning of a tick and return its monotonic start time."""
+
+        now = self._clock()
+        if self._origin is None:
+            self._origin = now
+            self._target = now
+        lateness = max(now - self._target, 0.0)
+        self.ticks += 1
+        delta = lateness - self._jitter_mean
+        self._jitter_mean += delta / self.ticks
+        self._jitter_m2 += delta * (lateness - self._jitter_mean)
+        self._jitter_max = max(self._jitter_max, lateness)
+        self._tick_start = now
+        return now
+
+    def next_delay(self) -> float:
+        """Return how long to wait before the next tick should start."""
+
+        now = self._clock()
+        if now - self._tick_start > self.interval:
+            self.overruns += 1
+        if self.mode == "interval":
+            self._target = now + self.interval
+            return self.interval
+
+        next_target = self._target + self.interval
+        if now <= next_target:
+            self._target = next_target
+            return next_target - now
+        passed = math.floor((now - self._target) / self.interval)
+        if self.overrun_policy == "skip":
+            self.missed_ticks += passed
+            self._target += (passed + 1) * self.interval
+            return self._target - now
+        # Coalesce: the passed slots collapse into one immediate tick.
+        self.missed_ticks += passed - 1
+        self._target += passed * self.interval
+        return 0.0
+
+    def statistics(self) -> Dict[str, Any]:
+        """Summarise the schedule adherence of the run."""
+
+        elapsed = self.elapsed() if self._origin is not None else 0.0
+        variance = self._jitter_m2 / (self.ticks - 1) if self.ticks > 1 else 0.0
+        return {
+            "mode": self.mode,
+            "interval_s": self.interval,
+            "overrun_policy": self.overrun_policy,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "missed_ticks": self.missed_ticks,
+            "jitter_ms": {
+                "mean": round(self._jitter_mean * 1000.0, 3),
+                "max": round(self._jitter_max * 1000.0, 3),
+                "stdev": round(math.sqrt(variance) * 1000.0, 3),
+            },
+            "achieved_rate_hz": round(self.ticks / elapsed, 3) if elapsed > 0 else None,
+        }
@@ -0,0 +1,63 @@
+"""Persistent cache of validated signal metadata.
+
+Entries are keyed by the detection model and the PROVEtech:TA version, so a
+cached validation stays valid until either of them changes. The cache is a
+small JSON document that is replaced atomically on every update.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+
+class SignalCache:
+    """Map ``(model, TA version)`` keys to metadata of validated signals.
+
+    Each signal entry is keyed by the name configured in ``test.log_signals``
+    and records the canonical ``name`` reported by PROVEtech:TA, the
+    ``handle`` returned by ``System.GetSignalInfo`` and the value ``type``
+    (the populated ``SystemGetSignalReply.RetVal`` member).
+    """
+
+    def __init__(self, path: Path, logger: Optional[logging.Logger] = None) -> None:
+        self.path = path.expanduser().resolve()
+        self.logger = logger or logging.getLogger(__name__)
+        self._entries: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+
+    @staticmethod
+    def key(model_name: str, ta_version: str) -> str:
+        return f"{model_name}@{ta_version}"
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Ignoring unreadable signal cache %s: %s", self.path, exc)
+            return {}
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def lookup(self, key: str, signals: Sequence[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Return the cached metadata when every signal of ``signals`` is known."""
+
+        entry = self._entries.get(key, {})
+        if not signals or any(name not in entry for name in signals):
+            return None
+        return {name: entry[name] for name in signals}
+
+    def store(self, key: str, signals: Dict[str, Dict[str, Any]]) -> None:
+        """Merge ``signals`` into the entry for ``key`` and persist the cache."""
+
+        self._entries.setdefault(key, {}).update(signals)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(
+            json.dumps({"entries": self._entries}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temporary, self.path)
@@ -0,0 +1,204 @@
+"""Direct wire-format decoding of ``SystemGetSignalReply`` and ``ValueArray`` messages.
+
+``GetSignal`` is the hottest RPC of the monitoring loop. Decoding its reply
+through the generated message class and converting repeated fields to NumPy
+creates one Python object per array element. This module parses the reply
+bytes directly instead: packed ``double`` arrays become zero-copy
+:func:`numpy.frombuffer` views on the received buffer and varint encoded
+integer arrays are decoded with vectorised NumPy operations. The
+``ValueArray`` chunks of recorded measurements are decoded the same way.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, Tuple
+
+from utils.lazy_import import lazy_import
+
+# Only array replies need NumPy.
+np = lazy_import("numpy")
+
+# Returned when the reply carries no member of the ``RetVal`` oneof.
+NO_VALUE = object()
+
+# Field numbers of the ``SystemGetSignalReply.RetVal`` oneof.
+_FIELD_DOUBLE = 31
+_FIELD_DOUBLE_ARRAY = 32
+_FIELD_INT64 = 33
+_FIELD_INT64_ARRAY = 34
+_FIELD_UINT64 = 35
+_FIELD_UINT64_ARRAY = 36
+_FIELD_STRING = 40
+
+# Element encoding of the packed arrays: fixed width floats, zigzag (``sint``)
+# or plain (``uint``) varints.
+_ARRAY_KINDS = {
+    _FIELD_DOUBLE_ARRAY: "<f8",
+    _FIELD_INT64_ARRAY: "sint",
+    _FIELD_UINT64_ARRAY: "uint",
+}
+
+# Fields of the ``ValueArray.arr`` oneof; ``uint8array`` (6) is a plain bytes field.
+_VALUE_ARRAY_KINDS = {1: "<f8", 2: "sint", 3: "uint", 4: "sint", 5: "uint", 7: "<f4"}
+_VALUE_ARRAY_BYTES = 6
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _decode_varint_array(data: bytes, start: int, end: int) -> np.ndarray:
+    """Decode a packed run of unsigned varints into a ``uint64`` array."""
+
+    raw = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+    if raw.size == 0:
+        return np.empty(0, dtype=np.uint64)
+    last_bytes = np.flatnonzero(raw < 0x80)
+    first_bytes = np.empty_like(last_bytes)
+    first_bytes[0] = 0
+    first_bytes[1:] = last_bytes[:-1] + 1
+    lengths = last_bytes - first_bytes + 1
+    values = (raw[first_bytes] & 0x7F).astype(np.uint64)
+    # Iterate over the byte position inside the varints (at most ten) rather
+    # than over the elements.
+    for position in range(1, int(lengths.max())):
+        selected = np.flatnonzero(lengths > position)
+        values[selected] |= (raw[first_bytes[selected] + position] & 0x7F).astype(
+            np.uint64
+        ) << np.uint64(7 * position)
+    return values
+
+
+def _decode_array(data: bytes, start: int, end: int, kind: str) -> np.ndarray:
+    """Decode the ``arr`` field of a ``DoubleArray``/``FloatArray``/integer array submessage."""
+
+    fixed = kind in ("<f8", "<f4")
+    width = 8 if kind == "<f8" else 4
+    offset = start
+    parts = []
+    while offset < end:
+        key, offset = _read_varint(data, offset)
+        number, wire_type = key >> 3, key & 0x7
+        if number != 1:
+            offset = _skip_field(data, offset, wire_type)
+            continue
+        if wire_type == _WIRE_LENGTH_DELIMITED:
+            length, offset = _read_varint(data, offset)
+            if fixed:
+                parts.append(np.frombuffer(data, dtype=kind, count=length // width, offset=offset))
+            else:
+                parts.append(_decode_varint_array(data, offset, offset + length))
+            offset += length
+        elif wire_type == _WIRE_FIXED64:
+            parts.append(np.frombuffer(data, dtype="<f8", count=1, offset=offset))
+            offset += 8
+        elif wire_type == _WIRE_FIXED32:
+            parts.append(np.frombuffer(data, dtype="<f4", count=1, offset=offset))
+            offset += 4
+        else:
+            value, offset = _read_varint(data, offset)
+            parts.append(np.array([value], dtype=np.uint64))
+
+    if fixed:
+        if not parts:
+            return np.empty(0, dtype=kind)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+    values = np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64)
+    if kind == "sint":
+        # sint32/sint64 elements are zigzag encoded.
+        return (values >> np.uint64(1)).astype(np.int64) ^ -(values & np.uint64(1)).astype(np.int64)
+    return values
+
+
+def _skip_field(data: bytes, offset: int, wire_type: int) -> int:
+    if wire_type == _WIRE_VARINT:
+        return _read_varint(data, offset)[1]
+    if wire_type == _WIRE_FIXED64:
+        return offset + 8
+    if wire_type == _WIRE_LENGTH_DELIMITED:
+        length, offset = _read_varint(data, offset)
+        return offset + length
+    if wire_type == _WIRE_FIXED32:
+        return offset + 4
+    raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+
+
+def decode_signal_reply(data: bytes) -> Any:
+    """Decode serialized ``SystemGetSignalReply`` bytes into a Python value.
+
+    Scalars are returned as ``float``/``int``/``str`` and arrays as read-only
+    NumPy arrays (``float64``, ``int64`` or ``uint64``). :data:`NO_VALUE` is
+    returned when the reply does not set ``RetVal``.
+    """
+
+    value: Any = NO_VALUE
+    offset = 0
+    end = len(data)
+    while offset < end:
+        key, offset = _read_varint(data, offset)
+        number, wire_type = key >> 3, key & 0x7
+        if number == _FIELD_DOUBLE and wire_type == _WIRE_FIXED64:
+            value = _DOUBLE.unpack_from(data, offset)[0]
+            offset += 8
+        elif number in (_FIELD_INT64, _FIELD_UINT64) and wire_type == _WIRE_VARINT:
+            raw, offset = _read_varint(data, offset)
+            value = _zigzag(raw) if number == _FIELD_INT64 else raw
+        elif number == _FIELD_STRING and wire_type == _WIRE_LENGTH_DELIMITED:
+            length, offset = _read_varint(data, offset)
+            value = bytes(data[offset:offset + length]).decode("utf-8")
+            offset += length
+        elif (
+            number in (_FIELD_DOUBLE_ARRAY, _FIELD_INT64_ARRAY, _FIELD_UINT64_ARRAY)
+            and wire_type == _WIRE_LENGTH_DELIMITED
+        ):
+            length, offset = _read_varint(data, offset)
+            value = _decode_array(data, offset, offset + length, _ARRAY_KINDS[number])
+            offset += length
+        else:
+            offset = _skip_field(data, offset, wire_type)
+    return value
+
+
+def decode_value_array(data: bytes) -> np.ndarray:
+    """Decode serialized ``ValueArray`` bytes into a read-only NumPy array.
+
+    Returns an empty ``float64`` array when no member of ``arr`` is set.
+    """
+
+    value = np.empty(0, dtype=np.float64)
+    offset = 0
+    end = len(data)
+    while offset < end:
+        key, offset = _read_varint(data, offset)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type != _WIRE_LENGTH_DELIMITED or (
+            number != _VALUE_ARRAY_BYTES and number not in _VALUE_ARRAY_KINDS
+        ):
+            offset = _skip_field(data, offset, wire_type)
+            continue
+        length, offset = _read_varint(data, offset)
+        if number == _VALUE_ARRAY_BYTES:
+            value = np.frombuffer(data, dtype=np.uint8, count=length, offset=offset)
+        else:
+            value = _decode_array(data, offset, offset + length, _VALUE_ARRAY_KINDS[number])
+        offset += length
+    return value
@@ -0,0 +1,592 @@
+"""Append-only sinks that stream monitored signal rows to disk.
+
+Rows are dictionaries holding a ``timestamp`` in integer nanoseconds since the
+Unix epoch (UTC) plus one entry per monitored signal. Text sinks render the
+timestamp as ISO 8601; columnar sinks keep every value in its native type.
+Array signals arrive as one-dimensional NumPy arrays; text sinks write them as
+JSON lists and columnar sinks store them as ragged list columns.
+"""
+from __future__ import annotations
+
+import csv
+import importlib.util
+import json
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Sequence
+
+DEFAULT_BUFFER_ROWS = 1000
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+
+# Sentinel stored for missing samples in integer columns of the NumPy layout.
+INT_NULL_SENTINEL = -(2**63)
+
+# Column type of each ``SystemGetSignalReply.RetVal`` member. Scalar columns
+# are "bool", "int", "float" or "string"; array columns are "<dtype>[]".
+SIGNAL_COLUMN_TYPES = {
+    "double": "float",
+    "int64": "int",
+    "uint64": "int",
+    "string": "string",
+    "doublearray": "float64[]",
+    "int64array": "int64[]",
+    "uint64array": "uint64[]",
+}
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Render an epoch nanosecond timestamp as ISO 8601 in UTC."""
+
+    seconds, nanoseconds = divmod(int(timestamp_ns), 1_000_000_000)
+    moment = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    return moment.replace(microsecond=nanoseconds // 1000).isoformat()
+
+
+class RowSink(Protocol):
+    """Interface of everything the controller streams rows into.
+
+    Implemented by :class:`SignalSink` and by the wrappers placed in front of
+    it (trigger capture, aggregation, change encoding, checkpointed segments).
+    """
+
+    @property
+    def path(self) -> Optional[Path]: ...
+
+    @property
+    def columns(self) -> List[str]: ...
+
+    @property
+    def row_count(self) -> int: ...
+
+    @property
+    def closed(self) -> bool: ...
+
+    def write(self, row: Dict[str, Any]) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    def describe(self) -> Dict[str, Any]: ...
+
+
+class SinkWrapper:
+    """Base of the wrappers that hand the rows on to another sink.
+
+    Every member delegates to ``sink``; subclasses override what they change.
+    """
+
+    def __init__(self, sink: RowSink) -> None:
+        self.sink = sink
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self.sink.path
+
+    @property
+    def columns(self) -> List[str]:
+        return self.sink.columns
+
+    @property
+    def row_count(self) -> int:
+        return self.sink.row_count
+
+    @property
+    def closed(self) -> bool:
+        return self.sink.closed
+
+    def write(self, row: Dict[str, Any]) -> None:
+        self.sink.write(row)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.sink.close()
+
+    def describe(self) -> Dict[str, Any]:
+        return self.sink.describe()
+
+
+class SignalSink:
+    """Base class for row sinks with bounded buffering and periodic flushing.
+
+    Rows are buffered in memory until either ``buffer_rows`` rows are pending
+    or ``flush_interval_s`` seconds passed since the last flush. Each flush
+    hands the pending rows to :meth:`_write_rows` and then calls
+    :meth:`_sync`, which for file based sinks flushes the file object and,
+    when ``fsync`` is enabled, forces the data to stable storage so that a
+    crash loses at most one flush interval of samples.
+
+    ``column_types`` fixes the type of columns up front (see
+    :data:`SIGNAL_COLUMN_TYPES`); the columnar sinks take the type of the
+    other columns from their first value and keep it in :attr:`column_types`.
+    """
+
+    format_name = ""
+    suffix = ""
+    # Whether the layout stores one type per column (see ``column_types``).
+    typed_columns = False
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[str],
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+        fsync: bool = True,
+        column_types: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.path = path
+        self.columns = list(columns)
+        self.column_types = {
+            name: kind for name, kind in (column_types or {}).items() if name in self.columns
+        }
+        self.buffer_rows = max(int(buffer_rows), 1)
+        self.flush_interval_s = flush_interval_s
+        self.fsync = fsync
+        self.row_count = 0
+        self.closed = False
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self._open()
+
+    def _open(self):
+        return self.path.open("w", encoding="utf-8", newline="")
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Queue a row and flush when the buffer or the flush interval is due."""
+
+        self._pending.append(row)
+        self.row_count += 1
+        if (
+            len(self._pending) >= self.buffer_rows
+            or time.monotonic() - self._last_flush >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows and push them to disk."""
+
+        if self._pending:
+            self._write_rows(self._pending)
+            self._pending = []
+        self._sync()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.flush()
+        self._close()
+        self.closed = True
+
+    def describe(self) -> Dict[str, Any]:
+        """Reference to the data file for ``result_summary.json``."""
+
+        return {
+            "file": self.path.name,
+            "format": self.format_name,
+            "columns": self.columns,
+            "sample_count": self.row_count,
+        }
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def _sync(self) -> None:
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+
+    def _close(self) -> None:
+        self._handle.close()
+
+
+class CsvSink(SignalSink):
+    """Stream rows into a CSV file with a fixed header."""
+
+    format_name = "csv"
+    suffix = ".csv"
+
+    def __init__(self, path: Path, columns: Sequence[str], **kwargs: Any) -> None:
+        super().__init__(path, columns, **kwargs)
+        self._writer = csv.DictWriter(self._handle, fieldnames=self.columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._writer.writerows(
+            {
+                **{
+                    name: json.dumps(value.tolist()) if hasattr(value, "tolist") else value
+                    for name, value in row.items()
+                },
+                "timestamp": format_timestamp(row["timestamp"]),
+            }
+            for row in rows
+        )
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class NdjsonSink(SignalSink):
+    """Stream rows as newline-delimited JSON objects."""
+
+    format_name = "ndjson"
+    suffix = ".ndjson"
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._handle.write(
+            "".join(
+                json.dumps(
+                    {**row, "timestamp": format_timestamp(row["timestamp"])},
+                    separators=(",", ":"),
+                    default=_json_default,
+                )
+                + "\n"
+                for row in rows
+            )
+        )
+
+
+def _column_type(values: Sequence[Any]) -> Optional[str]:
+    """Type a column from its first non-missing value; ``None`` when all are missing."""
+
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return "bool"
+        if isinstance(value, int):
+            return "int"
+        if isinstance(value, float):
+            return "float"
+        if getattr(value, "ndim", 0) == 1:
+            return f"{value.dtype.name}[]"
+        return "string"
+    return None
+
+
+def _array_dtype(column_type: str) -> Optional[str]:
+    """Element dtype of an array column type, ``None`` for scalar columns."""
+
+    return column_type[:-2] if column_type.endswith("[]") else None
+
+
+class ParquetSink(SignalSink):
+    """Write rows to a Parquet file through pyarrow.
+
+    The timestamp is stored as ``timestamp[ns, UTC]`` (int64 epoch nanoseconds),
+    doubles as ``float64``, integers as ``int64``, strings as dictionary
+    encoded (categorical) columns and array signals as ``list<...>`` columns of
+    their element type, built from one concatenated buffer and an offsets
+    vector. The schema is fixed when the file is created: columns missing from
+    ``column_types`` are typed by their first value, and rows are held back
+    until every column had one (columns without any value are stored as
+    ``null``). Every flush appends one row group. Parquet files are only
+    readable once closed, so ``fsync`` has no crash-safety effect here.
+    """
+
+    format_name = "parquet"
+    suffix = ".parquet"
+    typed_columns = True
+
+    def __init__(self, path: Path, columns: Sequence[str], **kwargs: Any) -> None:
+        import numpy
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._np = numpy
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+        self._schema = None
+        self._held: List[Dict[str, Any]] = []
+        super().__init__(path, columns, **kwargs)
+
+    def _open(self):
+        return None
+
+    def _arrow_type(self, column_type: Optional[str]):
+        pa = self._pa
+        if column_type is None:
+            return pa.null()
+        dtype = _array_dtype(column_type)
+        if dtype is not None:
+            return pa.list_(pa.from_numpy_dtype(self._np.dtype(dtype)))
+        return {
+            "bool": pa.bool_(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "string": pa.dictionary(pa.int32(), pa.string()),
+        }[column_type]
+
+    def _list_array(self, values: List[Any], list_type):
+        """Build a list column without creating a Python object per element."""
+
+        pa = self._pa
+        np = self._np
+        parts = [value for value in values if value is not None]
+        lengths = [0 if value is None else len(value) for value in values]
+        offsets = np.zeros(len(values) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = np.concatenate(parts) if parts else np.empty(0)
+        return pa.ListArray.from_arrays(
+            pa.array(offsets),
+            pa.array(flat, type=list_type.value_type),
+            type=list_type,
+            mask=pa.array([value is None for value in values]),
+        )
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._held.extend(rows)
+            untyped = [name for name in self.columns if name != "timestamp" and name not in self.column_types]
+            for name in untyped:
+                column_type = _column_type([row.get(name) for row in rows])
+                if column_type is not None:
+                    self.column_types[name] = column_type
+            if any(name not in self.column_types for name in untyped):
+                return
+            rows, self._held = self._held, []
+            self._open_writer()
+        self._write_batch(rows)
+
+    def _open_writer(self) -> None:
+        pa = self._pa
+        fields = [pa.field("timestamp", pa.timestamp("ns", tz="UTC"))]
+        fields.extend(
+            pa.field(name, self._arrow_type(self.column_types.get(name)))
+            for name in self.columns
+            if name != "timestamp"
+        )
+        self._schema = pa.schema(fields)
+        self._writer = self._pq.ParquetWriter(str(self.path), self._schema)
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        pa = self._pa
+        columns = {name: [row.get(name) for row in rows] for name in self.columns}
+        arrays = [
+            self._list_array(columns[field.name], field.type)
+            if pa.types.is_list(field.type)
+            else pa.array(columns[field.name], type=field.type)
+            for field in self._schema
+        ]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+    def _sync(self) -> None:
+        pass
+
+    def _close(self) -> None:
+        if self._held:
+            rows, self._held = self._held, []
+            self._open_writer()
+            self._write_batch(rows)
+        if self._writer is not None:
+            self._writer.close()
+
+
+class NumpySink(SignalSink):
+    """Write one memory-mappable ``.npy`` file per column into a directory.
+
+    Each column file is appended in place and its header is rewritten with the
+    current length on every flush, so ``numpy.load(path, mmap_mode="r")``
+    works on completed and interrupted runs alike. Timestamps are ``int64``
+    epoch nanoseconds, doubles ``float64`` (missing samples as NaN), integers
+    ``int64`` (missing samples as :data:`INT_NULL_SENTINEL`) and strings are
+    stored as ``int32`` category codes with the categories listed in
+    ``manifest.json``. Array signals use a ragged layout: the elements of all
+    rows are concatenated in ``<column>.npy`` and ``<column>.offsets.npy``
+    holds ``row_count + 1`` ``int64`` offsets, so row ``i`` is
+    ``values[offsets[i]:offsets[i + 1]]`` (missing samples are empty).
+    A column missing from ``column_types`` gets its file with its first value,
+    the rows before it are written as missing; the manifest lists a column
+    without any value with the kind ``null`` and no file.
+    """
+
+    format_name = "npy"
+    suffix = "_npy"
+    typed_columns = True
+
+    # Fixed header size so the shape can be rewritten without moving data.
+    _HEADER_SIZE = 128
+
+    def __init__(self, path: Path, columns: Sequence[str], **kwargs: Any) -> None:
+        import numpy
+
+        self._np = numpy
+        self._files: Dict[str, Any] = {}
+        self._lengths: Dict[str, int] = {}
+        self._dtypes: Dict[str, Any] = {}
+        self._kinds: Dict[str, str] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+        # Rows written before the first value of a column without a type.
+        self._missing: Dict[str, int] = {}
+        super().__init__(path, columns, **kwargs)
+
+    def _open(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        return None
+
+    def _header(self, dtype, count: int) -> bytes:
+        descr = self._np.lib.format.dtype_to_descr(dtype)
+        header = repr({"descr": descr, "fortran_order": False, "shape": (count,)})
+        header = header.ljust(self._HEADER_SIZE - 11) + "\n"
+        return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+    @staticmethod
+    def _column_file(name: str, part: str = "") -> str:
+        return name.replace("/", "_").replace("\\", "_") + part + ".npy"
+
+    def _create_file(self, file_name: str, dtype) -> None:
+        handle = (self.path / file_name).open("w+b")
+        handle.write(self._header(dtype, 0))
+        self._files[file_name] = handle
+        self._lengths[file_name] = 0
+        self._dtypes[file_name] = dtype
+
+    def _append(self, file_name: str, values) -> None:
+        handle = self._files[file_name]
+        handle.seek(0, os.SEEK_END)
+        handle.write(self._np.ascontiguousarray(values, dtype=self._dtypes[file_name]).tobytes())
+        self._lengths[file_name] += len(values)
+
+    def _create_column(self, name: str, column_type: str) -> None:
+        np = self._np
+        dtype = _array_dtype(column_type)
+        if dtype is not None:
+            self._kinds[name] = "array"
+            self._create_file(self._column_file(name), np.dtype(dtype).newbyteorder("<"))
+            offsets_file = self._column_file(name, ".offsets")
+            self._create_file(offsets_file, np.dtype("<i8"))
+            self._append(offsets_file, [0])
+            return
+        self._kinds[name] = column_type
+        dtype = {"bool": "|b1", "int": "<i8", "float": "<f8", "string": "<i4"}[column_type]
+        self._create_file(self._column_file(name), np.dtype(dtype))
+
+    def _encode(self, name: str, values: List[Any]):
+        kind = self._kinds[name]
+        if kind == "string":
+            categories = self._categories.setdefault(name, {})
+            return [
+                -1 if value is None else categories.setdefault(str(value), len(categories))
+                for value in values
+            ]
+        if kind == "float":
+            return [self._np.nan if value is None else value for value in values]
+        if kind == "int":
+            return [INT_NULL_SENTINEL if value is None else value for value in values]
+        return values
+
+    def _append_arrays(self, name: str, values: List[Any]) -> None:
+        np = self._np
+        values_file = self._column_file(name)
+        parts = [value for value in values if value is not None]
+        lengths = np.fromiter(
+            (0 if value is None else len(value) for value in values),
+            dtype=np.int64,
+            count=len(values),
+        )
+        offsets = self._lengths[values_file] + np.cumsum(lengths)
+        if parts:
+            self._append(values_file, np.concatenate(parts))
+        self._append(self._column_file(name, ".offsets"), offsets)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for name in self.columns:
+            values = [row.get(name) for row in rows]
+            if name not in self._kinds:
+                if name == "timestamp":
+                    self._create_column(name, "int")
+                else:
+                    column_type = self.column_types.get(name) or _column_type(values)
+                    if column_type is None:
+                        self._missing[name] = self._missing.get(name, 0) + len(values)
+                        continue
+                    self.column_types[name] = column_type
+                    self._create_column(name, column_type)
+                values = [None] * self._missing.pop(name, 0) + values
+            if self._kinds[name] == "array":
+                self._append_arrays(name, values)
+            else:
+                self._append(self._column_file(name), self._encode(name, values))
+
+    def _sync(self) -> None:
+        for file_name, handle in self._files.items():
+            handle.seek(0)
+            handle.write(self._header(self._dtypes[file_name], self._lengths[file_name]))
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        self._write_manifest(self.row_count - len(self._pending))
+
+    def _write_manifest(self, count: int) -> None:
+        columns: Dict[str, Dict[str, Any]] = {}
+        for name, kind in self._kinds.items():
+            file_name = self._column_file(name)
+            entry: Dict[str, Any] = {
+                "file": file_name,
+                "kind": kind,
+                "dtype": self._dtypes[file_name].str,
+            }
+            if kind == "string":
+                entry["categories"] = list(self._categories.get(name, {}))
+            elif kind == "int" and name != "timestamp":
+                entry["null_sentinel"] = INT_NULL_SENTINEL
+            elif kind == "array":
+                entry["offsets_file"] = self._column_file(name, ".offsets")
+            columns[name] = entry
+        for name in self._missing:
+            columns[name] = {"file": None, "kind": "null"}
+        manifest = {"row_count": count, "timestamp_unit": "ns", "columns": columns}
+        (self.path / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    def _close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+
+
+SINK_TYPES = {sink.format_name: sink for sink in (CsvSink, NdjsonSink, ParquetSink, NumpySink)}
+
+# Optional packages required by the columnar formats.
+SINK_DEPENDENCIES: Dict[str, Optional[str]] = {
+    "csv": None,
+    "ndjson": None,
+    "parquet": "pyarrow",
+    "npy": "numpy",
+}
+
+
+def missing_dependency(output_format: str) -> Optional[str]:
+    """Optional package required by ``output_format`` that is not installed, if any."""
+
+    package = SINK_DEPENDENCIES.get(output_format)
+    if package is None or importlib.util.find_spec(package) is not None:
+        return None
+    return package
+
+
+def create_sink(
+    output_format: str,
+    output_dir: Path,
+    columns: Sequence[str],
+    basename: str = "signals",
+    **kwargs: Any,
+) -> SignalSink:
+    """Create the sink for ``output_format`` writing ``<basename><suffix>``."""
+
+    try:
+        sink_type = SINK_TYPES[output_format]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported output format: {output_format}") from exc
+    output_dir = output_dir.expanduser().resolve()
+    return sink_type(output_dir / f"{basename}{sink_type.suffix}", columns, **kwargs)
@@ -0,0 +1,257 @@
+"""Detection of the end of a measurement apart from the sample ticks.
+
+Historically every monitoring tick sent ``Measure.IsRunning`` next to the
+``GetSignal`` requests, so the run state cost one RPC per tick and the stop
+was only noticed at the next tick. A stop detector checks the state on its own,
+slower schedule and wakes the sampler as soon as the measurement stopped. It
+can additionally listen to a PROVEtech:TA event stream: every event triggers
+an immediate check, so the stop is noticed without waiting for the next
+scheduled check.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional
+
+# tick: IsRunning in every tick (historic behaviour); poll: separate IsRunning
+# schedule; event: separate schedule plus checks triggered by server events.
+STOP_DETECTION_MODES = ("tick", "poll", "event")
+DEFAULT_STOP_CHECK_INTERVAL_S = 1.0
+
+
+class EventSubscription:
+    """Iterate a bidirectional PROVEtech:TA event stream.
+
+    Event RPCs such as ``MsgQueue.EventMessage`` stream ``…Params`` messages
+    to the client and expect one ``…Result`` message in return for each of
+    them; ``ack`` is sent after every received event. ``open_stream`` is
+    called with the request iterator and returns the response stream.
+    """
+
+    def __init__(self, open_stream: Callable[[Iterator[Any]], Any], ack: Any) -> None:
+        self._acks: "queue.Queue[Any]" = queue.Queue()
+        self._ack = ack
+        self._stream = open_stream(iter(self._acks.get, None))
+
+    def __iter__(self) -> Iterator[Any]:
+        for event in self._stream:
+            self._acks.put(self._ack)
+            yield event
+
+    def cancel(self) -> None:
+        self._acks.put(None)
+        self._stream.cancel()
+
+
+class _StopDetectorBase:
+    def __init__(self, interval_s: float, mode: str, logger: Optional[logging.Logger]) -> None:
+        if interval_s <= 0:
+            raise ValueError(f"Stop check interval must be positive, got {interval_s}")
+        self.interval_s = interval_s
+        self.mode = mode
+        self.logger = logger or logging.getLogger(__name__)
+        self.checks = 0
+        self.events = 0
+        self.event_stream = "off" if mode == "poll" else "pending"
+        self._started_at = time.monotonic()
+        self._stopped_at: Optional[float] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def stopped(self) -> bool:
+        """True once a check reported that the measurement is not running."""
+
+        return self._stopped_at is not None
+
+    def raise_error(self) -> None:
+        """Re-raise, once, the exception of the last failed check."""
+
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _event_stream_failed(self, exc: BaseException) -> None:
+        self.event_stream = "unavailable"
+        # gRPC errors carry their message in details().
+        details = getattr(exc, "details", None)
+        self.logger.info(
+            "Event stream unavailable (%s), checking the measurement state every %.1fs",
+            details() if callable(details) else exc,
+            self.interval_s,
+        )
+
+    def statistics(self) -> Dict[str, Any]:
+        statistics: Dict[str, Any] = {
+            "mode": self.mode,
+            "interval_s": self.interval_s,
+            "checks": self.checks,
+        }
+        if self.mode == "event":
+            statistics["event_stream"] = self.event_stream
+            statistics["events"] = self.events
+        if self._stopped_at is not None:
+            statistics["stopped_after_s"] = round(self._stopped_at - self._started_at, 3)
+        return statistics
+
+
+class StopDetector(_StopDetectorBase):
+    """Check ``is_running`` every ``interval_s`` seconds in a daemon thread.
+
+    ``event_source`` (``event`` mode) returns an iterable of server events,
+    typically an :class:`EventSubscription`; each event triggers an immediate
+    check. When the stream fails, the detector keeps polling. Exceptions of
+    ``is_running`` are kept and re-raised in the sampler by
+    :meth:`raise_error` at its next tick, and polling continues in case the
+    failure was transient.
+    """
+
+    def __init__(
+        self,
+        is_running: Callable[[], bool],
+        interval_s: float = DEFAULT_STOP_CHECK_INTERVAL_S,
+        event_source: Optional[Callable[[], Iterable[Any]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        super().__init__(interval_s, "event" if event_source is not None else "poll", logger)
+        self._is_running = is_running
+        self._event_source = event_source
+        self._events: Optional[Iterable[Any]] = None
+        self._check_now = threading.Event()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._threads = [threading.Thread(target=self._poll, name="stop-detector", daemon=True)]
+        if event_source is not None:
+            self._threads.append(
+                threading.Thread(target=self._listen, name="stop-detector-events", daemon=True)
+            )
+
+    def start(self) -> "StopDetector":
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def wait(self, timeout_s: float) -> None:
+        """Sleep up to ``timeout_s``; return as soon as the measurement stopped."""
+
+        if self._wake.wait(max(timeout_s, 0.0)):
+            self._wake.clear()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._check_now.set()
+        cancel = getattr(self._events, "cancel", None)
+        if cancel is not None:
+            cancel()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def _poll(self) -> None:
+        while not self._closed.is_set():
+            try:
+                running = self._is_running()
+            except Exception as exc:
+                self._error = exc
+            else:
+                self.checks += 1
+                if not running:
+                    self._stopped_at = time.monotonic()
+                    self._wake.set()
+                    return
+            self._check_now.wait(self.interval_s)
+            self._check_now.clear()
+
+    def _listen(self) -> None:
+        assert self._event_source is not None
+        try:
+            self._events = self._event_source()
+            if self._closed.is_set():
+                getattr(self._events, "cancel", lambda: None)()
+                return
+            self.event_stream = "active"
+            for _ in self._events:
+                self.events += 1
+                self._check_now.set()
+        except Exception as exc:
+            if not self._closed.is_set():
+                self._event_stream_failed(exc)
+
+
+class AsyncStopDetector(_StopDetectorBase):
+    """asyncio counterpart of :class:`StopDetector` running as tasks.
+
+    ``is_running`` is a coroutine function and ``event_source`` returns an
+    asynchronous iterator of events that acknowledges them itself.
+    """
+
+    def __init__(
+        self,
+        is_running: Callable[[], Awaitable[bool]],
+        interval_s: float = DEFAULT_STOP_CHECK_INTERVAL_S,
+        event_source: Optional[Callable[[], AsyncIterator[Any]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        super().__init__(interval_s, "event" if event_source is not None else "poll", logger)
+        self._is_running = is_running
+        self._event_source = event_source
+        self._tasks: list = []
+
+    def start(self) -> "AsyncStopDetector":
+        import asyncio
+
+        self._check_now = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._poll())]
+        if self._event_source is not None:
+            self._tasks.append(asyncio.ensure_future(self._listen()))
+        return self
+
+    async def wait(self, timeout_s: float) -> None:
+        """Sleep up to ``timeout_s``; return as soon as the measurement stopped."""
+
+        import asyncio
+
+        try:
+            await asyncio.wait_for(self._wake.wait(), max(timeout_s, 0.0))
+        except asyncio.TimeoutError:
+            return
+        self._wake.clear()
+
+    async def close(self) -> None:
+        import asyncio
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _poll(self) -> None:
+        import asyncio
+
+        while True:
+            try:
+                running = await self._is_running()
+            except Exception as exc:
+                self._error = exc
+            else:
+                self.checks += 1
+                if not running:
+                    self._stopped_at = time.monotonic()
+                    self._wake.set()
+                    return
+            try:
+                await asyncio.wait_for(self._check_now.wait(), self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._check_now.clear()
+
+    async def _listen(self) -> None:
+        assert self._event_source is not None
+        try:
+            self.event_stream = "active"
+            async for _ in self._event_source():
+                self.events += 1
+                self._check_now.set()
+        except Exception as exc:
+            self._event_stream_failed(exc)
@@ -0,0 +1,211 @@
+"""Trigger capture: keep only the ticks around detection events.
+
+On multi-hour soak runs only the seconds around a change of an AI-Core result
+matter, yet every polled tick used to be written. :class:`TriggerCapture`
+wraps a :class:`~utils.sinks.SignalSink` and holds the last ``pre_ticks``
+rows in a preallocated ring buffer. When a trigger fires, the buffered rows,
+the trigger row and the next ``post_ticks`` rows are written to the sink with
+their capture window number in the :data:`CAPTURE_COLUMN`; all other rows are
+dropped. A trigger firing inside an open window extends it.
+
+Trigger expressions name a monitored signal and a condition::
+
+    IconDetection.Result rises        # level goes from 0/empty to non-zero/non-empty
+    IconDetection.Result falls        # and back
+    IconDetection.Result changes      # any change of the value
+    IconDetection.Score > 0.8         # threshold crossing: >, >=, <, <= or ==
+"""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils.sinks import RowSink, SinkWrapper, format_timestamp
+
+CAPTURE_COLUMN = "capture"
+
+EDGE_CONDITIONS = ("rises", "falls", "changes")
+THRESHOLD_OPERATORS = {
+    ">": lambda value, limit: value > limit,
+    ">=": lambda value, limit: value >= limit,
+    "<": lambda value, limit: value < limit,
+    "<=": lambda value, limit: value <= limit,
+    "==": lambda value, limit: value == limit,
+}
+
+_EXPRESSION_PATTERN = re.compile(
+    r"^\s*(?P<signal>\S+)\s+(?:(?P<edge>rises|falls|changes)|(?P<operator>>=|<=|==|>|<)\s*(?P<limit>\S+))\s*$"
+)
+
+
+def _level(value: Any) -> Optional[bool]:
+    if value is None:
+        return None
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return len(value) > 0
+    return bool(value)
+
+
+def _same(previous: Any, current: Any) -> bool:
+    if hasattr(current, "tolist") or hasattr(previous, "tolist"):
+        return getattr(previous, "tolist", lambda: previous)() == getattr(current, "tolist", lambda: current)()
+    return previous == current
+
+
+@dataclass(frozen=True)
+class Trigger:
+    """A parsed trigger expression; see the module documentation."""
+
+    text: str
+    signal: str
+    condition: str
+    limit: Optional[float] = None
+
+    def fired(self, previous: Any, current: Any) -> bool:
+        """True when the step from ``previous`` to ``current`` meets the condition.
+
+        Missing samples (``None``) never fire; the first sample of a run has
+        no step and does not fire either.
+        """
+
+        if previous is None or current is None:
+            return False
+        if self.condition == "changes":
+            return not _same(previous, current)
+        if self.condition in ("rises", "falls"):
+            before, after = _level(previous), _level(current)
+            return before != after and after == (self.condition == "rises")
+        compare = THRESHOLD_OPERATORS[self.condition]
+        try:
+            return not compare(float(previous), self.limit) and compare(float(current), self.limit)
+        except (TypeError, ValueError):
+            return False
+
+
+def parse_trigger(text: str) -> Trigger:
+    """Parse a trigger expression; raises ``ValueError`` when malformed."""
+
+    match = _EXPRESSION_PATTERN.match(str(text))
+    if match is None:
+        raise ValueError(
+            f"Invalid trigger '{text}', expected '<signal> rises|falls|changes' or '<signal> >|>=|<|<=|== <number>'"
+        )
+    if match["edge"]:
+        return Trigger(text=str(text).strip(), signal=match["signal"], condition=match["edge"])
+    try:
+        limit = float(match["limit"])
+    except ValueError:
+        raise ValueError(f"Invalid trigger '{text}': threshold must be a number") from None
+    return Trigger(text=str(text).strip(), signal=match["signal"], condition=match["operator"], limit=limit)
+
+
+class TriggerCapture(SinkWrapper):
+    """Write only the rows around trigger events to ``sink``.
+
+    Behaves like the wrapped sink towards the controller. ``on_trigger`` is
+    called with the event record of every fired trigger and may return a
+    reference, such as the path of a captured image, which is stored in the
+    event as ``image``. Trigger signals are matched case-insensitively against
+    the sink columns; unknown signals raise ``ValueError``.
+    """
+
+    def __init__(
+        self,
+        sink: RowSink,
+        triggers: Sequence[Trigger],
+        pre_ticks: int,
+        post_ticks: int,
+        on_trigger: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if pre_ticks < 0 or post_ticks < 0:
+            raise ValueError("Capture pre_ticks and post_ticks must not be negative")
+        columns = {name.casefold(): name for name in sink.columns}
+        unknown = [trigger.signal for trigger in triggers if trigger.signal.casefold() not in columns]
+        if unknown:
+            raise ValueError(f"Trigger signals are not monitored: {', '.join(unknown)}")
+        super().__init__(sink)
+        self.triggers = [(trigger, columns[trigger.signal.casefold()]) for trigger in triggers]
+        self.pre_ticks = pre_ticks
+        self.post_ticks = post_ticks
+        self.on_trigger = on_trigger
+        self.logger = logger or logging.getLogger(__name__)
+        self.ticks = 0
+        self.windows = 0
+        self.events: List[Dict[str, Any]] = []
+        self._ring: List[Optional[Dict[str, Any]]] = [None] * pre_ticks
+        self._ring_next = 0
+        self._ring_count = 0
+        self._post_remaining = 0
+        self._window_open = False
+        self._previous: Dict[str, Any] = {}
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Evaluate the triggers on ``row`` and keep, write or drop it."""
+
+        fired = [trigger for trigger, column in self.triggers if trigger.fired(self._previous.get(column), row.get(column))]
+        for _, column in self.triggers:
+            self._previous[column] = row.get(column)
+        if fired:
+            if not self._window_open:
+                self.windows += 1
+                self._window_open = True
+                self._write_ring()
+            self._post_remaining = self.post_ticks
+            self._emit(row)
+            for trigger in fired:
+                self._record_event(trigger, row)
+        elif self._window_open:
+            self._emit(row)
+            self._post_remaining -= 1
+        elif self.pre_ticks:
+            self._ring[self._ring_next] = row
+            self._ring_next = (self._ring_next + 1) % self.pre_ticks
+            self._ring_count = min(self._ring_count + 1, self.pre_ticks)
+        if self._window_open and self._post_remaining <= 0:
+            self._window_open = False
+        self.ticks += 1
+
+    def _write_ring(self) -> None:
+        start = (self._ring_next - self._ring_count) % self.pre_ticks if self.pre_ticks else 0
+        for offset in range(self._ring_count):
+            index = (start + offset) % self.pre_ticks
+            self._emit(self._ring[index])  # type: ignore[arg-type]
+            self._ring[index] = None
+        self._ring_count = 0
+
+    def _emit(self, row: Dict[str, Any]) -> None:
+        row[CAPTURE_COLUMN] = self.windows
+        self.sink.write(row)
+
+    def _record_event(self, trigger: Trigger, row: Dict[str, Any]) -> None:
+        event: Dict[str, Any] = {
+            "window": self.windows,
+            "trigger": trigger.text,
+            "tick": self.ticks,
+            "timestamp": format_timestamp(row["timestamp"]),
+        }
+        self.logger.info("Trigger '%s' fired at tick %d (capture window %d)", trigger.text, self.ticks, self.windows)
+        if self.on_trigger is not None:
+            try:
+                reference = self.on_trigger(event)
+            except Exception as exc:
+                self.logger.warning("Trigger action for '%s' failed: %s", trigger.text, exc)
+            else:
+                if reference is not None:
+                    event["image"] = reference
+        self.events.append(event)
+
+    def describe(self) -> Dict[str, Any]:
+        description = super().describe()
+        description["capture"] = {
+            "triggers": [trigger.text for trigger, _ in self.triggers],
+            "pre_ticks": self.pre_ticks,
+            "post_ticks": self.post_ticks,
+            "ticks": self.ticks,
+            "windows": self.windows,
+            "events": self.events,
+        }
+        return description